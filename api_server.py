@@ -0,0 +1,494 @@
+import argparse
+import asyncio
+import email.parser
+import email.policy
+import json
+import re
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from typing import Dict, Iterable, Optional, Tuple
+
+import tracing
+from audio_store import AudioStore
+from autocomplete import Autocomplete
+from myth_database import MythDatabase
+from search_engine import SearchEngine
+from text_processor import TextProcessor
+from voice_processor import MicroBatcher, TranscriptionError, VoiceProcessor
+from myth_record import MythRecord, load_texts
+
+FACET_PARAMS = ('language', 'region', 'place')
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class Request:
+    def __init__(self, method: str, target: str, version: str, headers: Dict[str, str], body: bytes):
+        parsed = urllib.parse.urlsplit(target)
+        self.method = method
+        self.path = parsed.path
+        self.query = {key: values[0] for key, values in urllib.parse.parse_qs(parsed.query).items()}
+        self.version = version
+        self.headers = headers
+        self.body = body
+
+    @property
+    def keep_alive(self) -> bool:
+        connection = self.headers.get('connection', '').lower()
+        if self.version == 'HTTP/1.0':
+            return connection == 'keep-alive'
+        return connection != 'close'
+
+    def json(self) -> Dict:
+        try:
+            data = json.loads(self.body or b'{}')
+        except ValueError:
+            raise HTTPError(400, "Request body is not valid JSON")
+        if not isinstance(data, dict):
+            raise HTTPError(400, "Request body must be a JSON object")
+        return data
+
+    def int_param(self, name: str, default: int, minimum: int = 0, maximum: Optional[int] = None) -> int:
+        try:
+            value = int(self.query.get(name, default))
+        except ValueError:
+            raise HTTPError(400, f"Query parameter '{name}' must be an integer")
+        if value < minimum:
+            raise HTTPError(400, f"Query parameter '{name}' must be at least {minimum}")
+        return min(value, maximum) if maximum is not None else value
+
+    def facets(self) -> Dict[str, Optional[str]]:
+        return {name: self.query.get(name) for name in FACET_PARAMS}
+
+
+def parse_multipart(content_type: str, body: bytes) -> Dict[str, Tuple[Optional[str], bytes]]:
+    """
+    Parse a multipart/form-data body.
+
+    Args:
+        content_type (str): The request's Content-Type header, including the boundary.
+        body (bytes): The raw request body.
+
+    Returns:
+        Dict[str, Tuple[Optional[str], bytes]]: Field name to (filename, content) pairs.
+    """
+    if not content_type.startswith('multipart/form-data'):
+        raise HTTPError(415, "Expected multipart/form-data")
+    message = email.parser.BytesParser(policy=email.policy.HTTP).parsebytes(
+        b'Content-Type: ' + content_type.encode('latin-1') + b'\r\n\r\n' + body
+    )
+    if not message.is_multipart():
+        raise HTTPError(400, "Malformed multipart body")
+    fields = {}
+    for part in message.iter_parts():
+        name = part.get_param('name', header='content-disposition')
+        if name:
+            fields[name] = (part.get_filename(), part.get_payload(decode=True) or b'')
+    return fields
+
+
+class MythAPIServer:
+    def __init__(self, db: Optional[MythDatabase] = None, search_engine: Optional[SearchEngine] = None,
+                 text_processor: Optional[TextProcessor] = None, voice_processor=None,
+                 audio_store: Optional[AudioStore] = None, autocomplete: Optional[Autocomplete] = None,
+                 max_concurrent_inference: int = 1, max_pending_inference: int = 8,
+                 transcription_batch_size: int = 8, transcription_batch_wait_ms: float = 10.0,
+                 io_workers: int = 16, max_body_bytes: int = 100 * 1024 * 1024):
+        """
+        Initialize the headless HTTP API over search, myth CRUD and transcription.
+
+        Args:
+            db (Optional[MythDatabase]): Database to serve. Default opens 'data/myths.db'.
+            search_engine (Optional[SearchEngine]): Search engine sharing `db`. Default creates one.
+            text_processor (Optional[TextProcessor]): Used to translate/summarize ingested text.
+            voice_processor: Transcriber; created on first transcription request when omitted.
+            audio_store (Optional[AudioStore]): Keeps ingested recordings for segment playback. Default uses 'data/audio'.
+            autocomplete (Optional[Autocomplete]): Prefix index for /suggest. Default opens the snapshot for `db`.
+            max_concurrent_inference (int): Transcriptions running at once. Default is 1.
+            max_pending_inference (int): Transcriptions queued or running before new ones get 503. Default is 8.
+            transcription_batch_size (int): Uploads arriving together are transcribed as one Whisper
+                batch of up to this many clips; 1 transcribes each on its own. Default is 8.
+            transcription_batch_wait_ms (float): How long a batch waits for more uploads. Default is 10 ms.
+            io_workers (int): Threads for blocking database and search calls. Default is 16.
+            max_body_bytes (int): Largest accepted request body. Default is 100 MB.
+        """
+        self.text_processor = text_processor or TextProcessor()
+        self.db = db or MythDatabase()
+        self.search_engine = search_engine or SearchEngine(db=self.db, text_processor=self.text_processor)
+        self._voice_processor = voice_processor
+        self.audio_store = audio_store or AudioStore()
+        self.autocomplete = autocomplete or Autocomplete.open(self.db)
+        self.max_pending_inference = max_pending_inference
+        self.max_body_bytes = max_body_bytes
+        self._io_executor = ThreadPoolExecutor(io_workers, thread_name_prefix='api-io')
+        self._inference_executor = ThreadPoolExecutor(max_concurrent_inference, thread_name_prefix='api-inference')
+        self._inference_slots = None
+        self._max_concurrent_inference = max_concurrent_inference
+        self._pending_inference = 0
+        self.transcription_batch_size = transcription_batch_size
+        self.transcription_batch_wait_ms = transcription_batch_wait_ms
+        self._transcription_batcher = None
+        self.routes = [
+            ('GET', re.compile(r'^/health$'), self.handle_health),
+            ('GET', re.compile(r'^/metrics$'), self.handle_metrics),
+            ('GET', re.compile(r'^/search$'), self.handle_search),
+            ('GET', re.compile(r'^/suggest$'), self.handle_suggest),
+            ('GET', re.compile(r'^/facets$'), self.handle_facets),
+            ('GET', re.compile(r'^/myths$'), self.handle_list_myths),
+            ('POST', re.compile(r'^/myths$'), self.handle_create_myth),
+            ('GET', re.compile(r'^/myths/(\d+)$'), self.handle_get_myth),
+            ('PUT', re.compile(r'^/myths/(\d+)$'), self.handle_update_myth),
+            ('DELETE', re.compile(r'^/myths/(\d+)$'), self.handle_delete_myth),
+            ('GET', re.compile(r'^/myths/(\d+)/related$'), self.handle_related_myths),
+            ('POST', re.compile(r'^/transcribe$'), self.handle_transcribe),
+        ]
+
+    @property
+    def voice_processor(self):
+        if self._voice_processor is None:
+            self._voice_processor = VoiceProcessor()
+        return self._voice_processor
+
+    @property
+    def transcription_batcher(self) -> Optional[MicroBatcher]:
+        if self._transcription_batcher is None and self.transcription_batch_size > 1:
+            self._transcription_batcher = MicroBatcher(self.voice_processor, self.transcription_batch_size,
+                                                       self.transcription_batch_wait_ms)
+        return self._transcription_batcher
+
+    async def _run_io(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._io_executor, fn, *args)
+
+    async def _run_inference(self, fn, *args, batched: bool = False):
+        # Reject instead of queueing without bound when clients outpace the models
+        if self._pending_inference >= self.max_pending_inference:
+            raise HTTPError(503, "Transcription queue is full, retry later")
+        self._pending_inference += 1
+        try:
+            if batched:
+                # fn queues into a MicroBatcher, whose own thread runs the model; wait on the returned future
+                return await asyncio.wrap_future(fn(*args))
+            async with self._inference_slots:
+                return await asyncio.get_running_loop().run_in_executor(self._inference_executor, fn, *args)
+        finally:
+            self._pending_inference -= 1
+
+    # --- HTTP plumbing ---
+
+    async def _read_request(self, reader: asyncio.StreamReader) -> Optional[Request]:
+        try:
+            head = await reader.readuntil(b'\r\n\r\n')
+        except asyncio.IncompleteReadError:
+            return None
+        except asyncio.LimitOverrunError:
+            raise HTTPError(431, "Request headers too large")
+        lines = head.decode('latin-1').split('\r\n')
+        try:
+            method, target, version = lines[0].split(' ', 2)
+        except ValueError:
+            raise HTTPError(400, "Malformed request line")
+        headers = {}
+        for line in lines[1:]:
+            if ':' in line:
+                key, value = line.split(':', 1)
+                headers[key.strip().lower()] = value.strip()
+        if 'chunked' in headers.get('transfer-encoding', '').lower():
+            raise HTTPError(411, "Chunked request bodies are not supported; send Content-Length")
+        try:
+            length = int(headers.get('content-length', 0) or 0)
+        except ValueError:
+            raise HTTPError(400, "Malformed Content-Length header")
+        if length < 0:
+            raise HTTPError(400, "Malformed Content-Length header")
+        if length > self.max_body_bytes:
+            raise HTTPError(413, "Request body too large")
+        body = await reader.readexactly(length) if length else b''
+        return Request(method.upper(), target, version, headers, body)
+
+    @staticmethod
+    def _head(status: int, headers: Dict[str, str]) -> bytes:
+        lines = [f"HTTP/1.1 {status} {HTTPStatus(status).phrase}"]
+        lines.extend(f"{key}: {value}" for key, value in headers.items())
+        return ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1')
+
+    async def _send_json(self, writer: asyncio.StreamWriter, status: int, payload, keep_alive: bool):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        writer.write(self._head(status, {
+            'Content-Type': 'application/json; charset=utf-8',
+            'Content-Length': str(len(body)),
+            'Connection': 'keep-alive' if keep_alive else 'close',
+        }) + body)
+        await writer.drain()
+
+    @staticmethod
+    def _json_default(value):
+        # MythRecords serialize as plain objects; load their texts first (load_texts) to keep this off the database
+        return value.to_dict() if isinstance(value, MythRecord) else str(value)
+
+    async def _send_stream(self, writer: asyncio.StreamWriter, items: Iterable[Dict], keep_alive: bool):
+        # Chunked JSON array: each item is serialized and flushed as it is produced
+        writer.write(self._head(200, {
+            'Content-Type': 'application/json; charset=utf-8',
+            'Transfer-Encoding': 'chunked',
+            'Connection': 'keep-alive' if keep_alive else 'close',
+        }))
+        separator = b'['
+        for item in items:
+            chunk = separator + json.dumps(item, ensure_ascii=False, default=self._json_default).encode('utf-8')
+            writer.write(f"{len(chunk):X}\r\n".encode('ascii') + chunk + b'\r\n')
+            await writer.drain()
+            separator = b','
+        tail = b'[]' if separator == b'[' else b']'
+        writer.write(f"{len(tail):X}\r\n".encode('ascii') + tail + b'\r\n0\r\n\r\n')
+        await writer.drain()
+
+    async def _send_text(self, writer: asyncio.StreamWriter, status: int, text: str, content_type: str,
+                         keep_alive: bool):
+        body = text.encode('utf-8')
+        writer.write(self._head(status, {
+            'Content-Type': content_type,
+            'Content-Length': str(len(body)),
+            'Connection': 'keep-alive' if keep_alive else 'close',
+        }) + body)
+        await writer.drain()
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    request = await self._read_request(reader)
+                except HTTPError as e:
+                    await self._send_json(writer, e.status, {'error': e.message}, keep_alive=False)
+                    break
+                if request is None:
+                    break
+                try:
+                    await self.dispatch(request, writer)
+                except HTTPError as e:
+                    await self._send_json(writer, e.status, {'error': e.message}, request.keep_alive)
+                except Exception as e:
+                    await self._send_json(writer, 500, {'error': str(e)}, keep_alive=False)
+                    break
+                if not request.keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def dispatch(self, request: Request, writer: asyncio.StreamWriter):
+        path_matched = False
+        for method, pattern, handler in self.routes:
+            match = pattern.match(request.path)
+            if not match:
+                continue
+            path_matched = True
+            if method == request.method:
+                with tracing.span('http_' + handler.__name__[len('handle_'):]):
+                    return await handler(request, writer, *match.groups())
+        if path_matched:
+            raise HTTPError(405, f"Method {request.method} not allowed on {request.path}")
+        raise HTTPError(404, f"No route for {request.path}")
+
+    # --- Handlers ---
+
+    async def handle_health(self, request: Request, writer):
+        await self._send_json(writer, 200, {
+            'status': 'ok',
+            'pending_transcriptions': self._pending_inference,
+        }, request.keep_alive)
+
+    async def handle_metrics(self, request: Request, writer):
+        # Prometheus text by default; ?format=json for the summarized view
+        if request.query.get('format') == 'json':
+            await self._send_json(writer, 200, tracing.REGISTRY.to_json(), request.keep_alive)
+        else:
+            await self._send_text(writer, 200, tracing.REGISTRY.to_prometheus(),
+                                  'text/plain; version=0.0.4; charset=utf-8', request.keep_alive)
+
+    async def handle_search(self, request: Request, writer):
+        query = request.query.get('q', '')
+        facets = request.facets()
+        if not query.strip() and not any(facets.values()):
+            raise HTTPError(400, "Provide 'q' and/or a facet filter (language, region, place)")
+        limit = request.int_param('limit', 50, minimum=1, maximum=500)
+        fuzzy = request.query.get('fuzzy', 'true').lower() != 'false'
+        collapse = request.query.get('collapse', 'false').lower() in ('1', 'true', 'yes')
+        autocorrect = request.query.get('autocorrect', 'false').lower() in ('1', 'true', 'yes')
+        results = await self._run_io(lambda: self.search_engine.search(
+            query, fuzzy=fuzzy, collapse_duplicates=collapse, autocorrect=autocorrect, **facets))
+        # Full texts of the returned page only, one query per database
+        await self._run_io(load_texts, results[:limit])
+        await self._send_stream(writer, results[:limit], request.keep_alive)
+
+    async def handle_suggest(self, request: Request, writer):
+        # In-memory and microsecond-fast: answered on the event loop without a worker thread
+        limit = request.int_param('limit', 8, minimum=1, maximum=50)
+        if self.autocomplete.check_due():
+            # At most once per check interval: a version lookup (and a rebuild after outside writes)
+            await self._run_io(self.autocomplete.refresh, self.db)
+        suggestions = self.autocomplete.suggest(request.query.get('q', ''), limit)
+        await self._send_json(writer, 200, suggestions, request.keep_alive)
+
+    async def handle_facets(self, request: Request, writer):
+        counts = await self._run_io(self.db.get_facet_counts)
+        await self._send_json(writer, 200, counts, request.keep_alive)
+
+    async def handle_list_myths(self, request: Request, writer):
+        limit = request.int_param('limit', 50, minimum=1, maximum=500)
+        offset = request.int_param('offset', 0)
+        myths = await self._run_io(lambda: self.db.get_myths_page(limit, offset, **request.facets()))
+        await self._send_stream(writer, myths, request.keep_alive)
+
+    async def handle_get_myth(self, request: Request, writer, myth_id: str):
+        myth = await self._run_io(self.db.get_myth, int(myth_id))
+        if myth is None:
+            raise HTTPError(404, f"Myth {myth_id} not found")
+        await self._send_json(writer, 200, myth, request.keep_alive)
+
+    async def handle_related_myths(self, request: Request, writer, myth_id: str):
+        related = await self._run_io(self.db.get_related_myths, int(myth_id))
+        await self._send_json(writer, 200, related, request.keep_alive)
+
+    def _insert_myth(self, myth_data: Dict) -> int:
+        myth_id = self.db.insert_myth(myth_data)
+        self.autocomplete.add_myth(myth_data, self.db.get_cache_version('facets'))
+        self.autocomplete.save_later()
+        return myth_id
+
+    def _update_myth(self, myth_id: int, updates: Dict) -> bool:
+        old = self.db.get_myth(myth_id)
+        if old is None or not self.db.update_myth(myth_id, updates):
+            return False
+        self.autocomplete.update_myth(old, self.db.get_myth(myth_id) or old, self.db.get_cache_version('facets'))
+        self.autocomplete.save_later()
+        return True
+
+    def _delete_myth(self, myth_id: int) -> bool:
+        old = self.db.get_myth(myth_id)
+        if old is None or not self.db.delete_myth(myth_id):
+            return False
+        self.autocomplete.remove_myth(old, self.db.get_cache_version('facets'))
+        self.autocomplete.save_later()
+        return True
+
+    def _complete_myth(self, data: Dict) -> Dict:
+        try:
+            return self.text_processor.complete_myths([data])[0]
+        except ValueError as e:
+            raise HTTPError(400, str(e))
+
+    async def handle_create_myth(self, request: Request, writer):
+        myth_data = await self._run_io(self._complete_myth, request.json())
+        myth_id = await self._run_io(self._insert_myth, myth_data)
+        await self._send_json(writer, 201, {'id': myth_id}, request.keep_alive)
+
+    async def handle_update_myth(self, request: Request, writer, myth_id: str):
+        updated = await self._run_io(self._update_myth, int(myth_id), request.json())
+        if not updated:
+            raise HTTPError(404, f"Myth {myth_id} not found")
+        await self._send_json(writer, 200, {'id': int(myth_id), 'updated': True}, request.keep_alive)
+
+    async def handle_delete_myth(self, request: Request, writer, myth_id: str):
+        deleted = await self._run_io(self._delete_myth, int(myth_id))
+        if not deleted:
+            raise HTTPError(404, f"Myth {myth_id} not found")
+        await self._send_json(writer, 200, {'id': int(myth_id), 'deleted': True}, request.keep_alive)
+
+    @staticmethod
+    def _parse_upload(request: Request) -> Tuple[Optional[str], bytes, Dict[str, str]]:
+        fields = parse_multipart(request.headers.get('content-type', ''), request.body)
+        if 'audio' not in fields or not fields['audio'][1]:
+            raise HTTPError(400, "Multipart field 'audio' with the recording is required")
+        filename, audio_data = fields['audio']
+        try:
+            form = {name: value.decode('utf-8') for name, (_, value) in fields.items() if name != 'audio'}
+        except UnicodeDecodeError:
+            raise HTTPError(400, "Form fields must be UTF-8 text")
+        return filename, audio_data, form
+
+    async def handle_transcribe(self, request: Request, writer):
+        # Parsing a body of up to max_body_bytes would stall every other connection on the event loop
+        filename, audio_data, form = await self._run_io(self._parse_upload, request)
+
+        # A 'language' field, or a region with a known main language, skips language detection
+        language = VoiceProcessor.language_hint(form.get('language'), form.get('region'))
+        try:
+            batcher = self.transcription_batcher
+            if batcher is not None:
+                transcription = await self._run_inference(batcher.submit, audio_data, filename or 'upload.wav',
+                                                          language, batched=True)
+            else:
+                transcription = await self._run_inference(
+                    self.voice_processor.transcribe, audio_data, filename or 'upload.wav', language)
+        except TranscriptionError as e:
+            raise HTTPError(422, f"{e.message}. {e.hint}" if e.hint else e.message)
+
+        response = {'text': transcription['text'], 'language': transcription['language'],
+                    'segments': transcription['segments']}
+        if form.get('ingest', '').lower() in ('1', 'true', 'yes'):
+            audio_path = await self._run_io(self.audio_store.save, audio_data, filename or 'upload.wav')
+            myth_data = await self._run_io(self._complete_myth, {
+                'original_text': transcription['text'],
+                'language': transcription['language'],
+                'place': form.get('place', ''),
+                'region': form.get('region', ''),
+                'audio_path': audio_path,
+                'segments': transcription['segments'],
+            })
+            response['id'] = await self._run_io(self._insert_myth, myth_data)
+        await self._send_json(writer, 200, response, request.keep_alive)
+
+    async def serve(self, host: str = '127.0.0.1', port: int = 8080):
+        """
+        Serve until cancelled.
+        """
+        self._inference_slots = asyncio.Semaphore(self._max_concurrent_inference)
+        server = await asyncio.start_server(self.handle_connection, host, port, limit=64 * 1024, backlog=1024)
+        print(f"Voice-to-Myth API listening on http://{host}:{port}")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.autocomplete.flush()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless HTTP API for the Voice-to-Myth database")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--db', default='data/myths.db', help="SQLite database path")
+    parser.add_argument('--shards', help="Serve a sharded database from this directory instead of --db")
+    parser.add_argument('--inference-workers', type=int, default=1, help="Concurrent transcriptions")
+    parser.add_argument('--max-pending', type=int, default=8, help="Queued transcriptions before 503")
+    parser.add_argument('--transcription-batch', type=int, default=8,
+                        help="Uploads transcribed together in one Whisper batch (1 disables batching)")
+    parser.add_argument('--tracing', action='store_true', help="Record per-stage timings for /metrics")
+    args = parser.parse_args()
+    if args.tracing:
+        tracing.enable()
+    if args.shards:
+        from sharded_database import ShardedMythDatabase, ShardedSearchEngine
+        db = ShardedMythDatabase(args.shards)
+        text_processor = TextProcessor()
+        search_engine = ShardedSearchEngine(db, text_processor)
+    else:
+        db, text_processor, search_engine = MythDatabase(args.db), None, None
+    server = MythAPIServer(db=db, search_engine=search_engine, text_processor=text_processor,
+                           max_concurrent_inference=args.inference_workers,
+                           max_pending_inference=args.max_pending,
+                           transcription_batch_size=args.transcription_batch)
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
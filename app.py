@@ -1,23 +1,25 @@
+import startup
+startup.install_import_timer_from_env()  # Must run before the imports it measures
 import streamlit as st
 import os
 import shutil
+import importlib.util
 from voice_processor import VoiceProcessor
+from streamlit_voice import StreamlitVoiceProcessor
 from text_processor import TextProcessor
 from myth_database import MythDatabase
 from search_engine import SearchEngine
-from datetime import datetime
-from PIL import Image
+from image_store import ImageStore
+from audio_store import AudioStore
+from autocomplete import Autocomplete
 import tempfile
+import html
 import io
 import subprocess
+import tracing
 
-# Audio processing fallback imports
-try:
-    from pydub import AudioSegment
-    PYDUB_AVAILABLE = True
-except ImportError:
-    PYDUB_AVAILABLE = False
-    st.warning("⚠️ pydub is not available. Some audio formats may not be supported.")
+# Audio processing fallback: only probe for pydub here, it is imported on first conversion
+PYDUB_AVAILABLE = importlib.util.find_spec("pydub") is not None
 
 # Page configuration
 st.set_page_config(
@@ -55,21 +57,53 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+LANGUAGE_NAMES = {
+    'hi': 'Hindi', 'ta': 'Tamil', 'te': 'Telugu', 'bn': 'Bengali', 'mr': 'Marathi',
+    'gu': 'Gujarati', 'kn': 'Kannada', 'ml': 'Malayalam', 'pa': 'Punjabi', 'or': 'Odia', 'en': 'English'
+}
+
 # Initialize components
 @st.cache_resource
 def init_components():
     try:
         os.makedirs("data/images", exist_ok=True)
+        # Construction is cheap; models load lazily or in the warmup threads below
+        text_processor = TextProcessor()
+        # Index backfills and the autocomplete build run as warmup tasks, not before first paint
+        if os.environ.get('MYTH_SHARD_DIR'):
+            from sharded_database import ShardedMythDatabase, ShardedSearchEngine
+            db = ShardedMythDatabase(os.environ['MYTH_SHARD_DIR'], backfill=False)
+            search_engine = ShardedSearchEngine(db, text_processor)
+        else:
+            db = MythDatabase(backfill=False)
+            search_engine = SearchEngine(db=db, text_processor=text_processor)
         return {
-            'voice_processor': VoiceProcessor(),
-            'text_processor': TextProcessor(),
-            'db': MythDatabase(),
-            'search_engine': SearchEngine()
+            'voice_processor': StreamlitVoiceProcessor(VoiceProcessor()),
+            'text_processor': text_processor,
+            'db': db,
+            'image_store': ImageStore(),
+            'audio_store': AudioStore(),
+            'autocomplete': Autocomplete(),
+            'search_engine': search_engine
         }
     except Exception as e:
         st.error(f"Error initializing components: {e}")
         return None
 
+@st.cache_resource
+def start_warmup(_components):
+    """Load models and prime search indexes in background threads after the first paint"""
+    warmup = startup.Warmup()
+    warmup.add('whisper', _components['voice_processor'].load_model)
+    warmup.add('indexes', _components['db'].backfill_indexes)
+    warmup.add('autocomplete', lambda: _components['autocomplete'].sync(_components['db']), after=['indexes'])
+    warmup.add('search', lambda: (_components['db'].get_facet_counts(),
+                                  _components['search_engine'].search("myth")), after=['indexes'])
+    translator = _components['text_processor'].translator
+    if translator is not None:
+        warmup.add('translation', translator.warmup)
+    return warmup.start()
+
 def check_ffmpeg():
     """Check if ffmpeg is available"""
     try:
@@ -80,11 +114,13 @@ def check_ffmpeg():
     except Exception:
         return False, None
 
+@tracing.traced()
 def convert_audio_to_wav(input_path, output_path):
     """Convert audio to WAV format using ffmpeg"""
     try:
         if PYDUB_AVAILABLE:
             # Use pydub if available
+            from pydub import AudioSegment
             audio = AudioSegment.from_file(input_path)
             audio.export(output_path, format='wav')
             return True
@@ -102,6 +138,90 @@ def convert_audio_to_wav(input_path, output_path):
         st.error(f"Error converting audio: {e}")
         return False
 
+def paginate(total, key, default_page_size=10):
+    """Render page controls and return (offset, limit) for the visible page"""
+    col_size, col_page, col_info = st.columns([1, 1, 2])
+    with col_size:
+        page_size = st.selectbox("Per page:", [10, 20, 50], key=f"{key}_page_size",
+                                 index=[10, 20, 50].index(default_page_size))
+    page_count = max(1, (total + page_size - 1) // page_size)
+    with col_page:
+        page = st.number_input("Page:", min_value=1, max_value=page_count, step=1, key=f"{key}_page")
+    with col_info:
+        st.caption(f"Page {page} of {page_count}")
+    return (page - 1) * page_size, page_size
+
+def highlight_passage(passage):
+    """Wrap a search passage's stored match offsets in <mark> tags"""
+    text = passage['text']
+    parts = []
+    position = 0
+    for start, end in passage['highlights']:
+        if start < position:
+            continue
+        parts.append(html.escape(text[position:start]))
+        parts.append(f"<mark>{html.escape(text[start:end])}</mark>")
+        position = end
+    parts.append(html.escape(text[position:]))
+    return ''.join(parts).strip()
+
+def render_myth_card(myth, title, key_prefix, image_caption, show_origin=False):
+    """Render one myth summary; full text and image load only once the story is opened"""
+    with st.expander(title):
+        col1, col2 = st.columns([2, 1])
+        story_key = f"show_full_story_{key_prefix}_{myth['id']}"
+        with col1:
+            if show_origin:
+                st.write(f"**📍 Location:** {myth.get('place', 'N/A')} ({myth.get('region', 'N/A')})")
+                st.write(f"**🌐 Language:** {myth.get('language', 'N/A')}")
+            st.write(f"**📄 Summary:** {myth.get('summary', 'N/A')}")
+            if myth.get('duplicates'):
+                st.caption(f"🔁 Also recorded {len(myth['duplicates'])} more time(s): "
+                           + ", ".join(f"#{myth_id}" for myth_id in myth['duplicates'][:10]))
+            passage = myth.get('passage')
+            if passage:
+                st.markdown(f"**🔎 Best match:** …{highlight_passage(passage)}…", unsafe_allow_html=True)
+                segment = passage.get('segment')
+                if segment and myth.get('audio_path') and os.path.exists(myth['audio_path']):
+                    # Only the compressed chunks around the match are read from the stored recording
+                    if st.button(f"▶️ Play match ({segment['start_ms'] / 1000:.1f}s)", key=f"play_{key_prefix}_{myth['id']}"):
+                        st.audio(components['audio_store'].read_range(
+                            myth['audio_path'], segment['start_ms'], segment['end_ms']), format='audio/wav')
+            keywords = myth.get('keywords', [])
+            if isinstance(keywords, list):
+                keywords_str = ', '.join(keywords)
+            else:
+                keywords_str = str(keywords)
+            st.write(f"**🏷️ Keywords:** {keywords_str}")
+            
+            if st.button("📖 Show Full Story", key=f"{story_key}_button"):
+                st.session_state[story_key] = not st.session_state.get(story_key, False)
+            
+            story_open = st.session_state.get(story_key, False)
+            if story_open:
+                full_myth = components['db'].get_myth(myth['id']) or myth
+                st.write("**Original Text:**")
+                st.write(full_myth.get('original_text', 'N/A'))
+                st.write("**English Translation:**")
+                st.write(full_myth.get('english_text', 'N/A'))
+                # Neighbours come precomputed from the related-myths graph
+                related = components['db'].get_related_myths(myth['id'])
+                if related:
+                    st.write("**🔗 Related Myths:**")
+                    for other in related:
+                        location = other.get('place') or other.get('region') or 'Unknown Location'
+                        st.write(f"- **#{other['id']} {location}** ({other['similarity']:.0%} similar): "
+                                 f"{(other.get('summary') or '')[:160]}")
+        with col2:
+            image_path = myth.get('image_path', '')
+            if story_open and image_path:
+                try:
+                    thumbnail = components['image_store'].load_thumbnail(image_path)
+                    if thumbnail:
+                        st.image(thumbnail, caption=image_caption, use_column_width=True)
+                except Exception as e:
+                    st.warning(f"Could not load image: {e}")
+
 # Initialize components
 with st.spinner("🚀 Starting Voice-to-Myth App..."):
     components = init_components()
@@ -109,6 +229,8 @@ with st.spinner("🚀 Starting Voice-to-Myth App..."):
 if not components:
     st.stop()
 
+warmup = start_warmup(components)
+
 # App header
 st.markdown("""
 <div class="main-header">
@@ -164,22 +286,27 @@ with tab1:
         
         if audio_file is not None:
             st.audio(audio_file)
+            # A chosen language is passed straight to Whisper; otherwise it is detected from the first 30 seconds
+            audio_language = st.selectbox("Spoken language:", [None] + list(LANGUAGE_NAMES), key="audio_language",
+                                          format_func=lambda x: "Detect automatically" if x is None else LANGUAGE_NAMES[x])
             if st.button("📁 Process Audio", type="primary"):
                 with st.spinner("Processing audio..."):
                     temp_file_path = None
                     wav_path = None
                     try:
                         # Read audio file as bytes
-                        audio_data = audio_file.read()
+                        with tracing.span('upload_decode'):
+                            audio_data = audio_file.read()
                         if not audio_data:
                             st.error("❌ Uploaded audio file is empty")
                             st.stop()
                         
                         # Save uploaded audio to a temporary file
                         file_extension = audio_file.name.split('.')[-1].lower()
-                        with tempfile.NamedTemporaryFile(delete=False, suffix=f".{file_extension}") as temp_file:
-                            temp_file.write(audio_data)
-                            temp_file_path = temp_file.name
+                        with tracing.span('upload_temp_write'):
+                            with tempfile.NamedTemporaryFile(delete=False, suffix=f".{file_extension}") as temp_file:
+                                temp_file.write(audio_data)
+                                temp_file_path = temp_file.name
                         
                         # Verify temporary file exists
                         if not os.path.exists(temp_file_path):
@@ -228,9 +355,15 @@ with tab1:
                         st.info(f"📊 Processing WAV data ({len(wav_data)} bytes)")
                         
                         # Process the audio data
-                        transcription = components['voice_processor'].transcribe_audio(wav_data, audio_file.name)
+                        transcription = components['voice_processor'].transcribe_audio(wav_data, audio_file.name,
+                                                                                       audio_language)
                         
                         if transcription:
+                            try:
+                                # Keep the recording so search hits can play the moment they matched
+                                transcription['audio_path'] = components['audio_store'].save(wav_data, 'audio.wav')
+                            except Exception as e:
+                                st.warning(f"⚠️ Could not store the recording: {str(e)}")
                             st.session_state.transcription = transcription
                             st.session_state.audio_processed = True
                             st.success("✅ Audio processed successfully!")
@@ -278,7 +411,9 @@ with tab1:
             # Display transcription
             st.write("**📝 Original Text:**")
             st.text_area("", transcription['text'], height=100, disabled=True, key="transcription_text")
-            st.write(f"**🌐 Language:** {transcription['language']}")
+            language_note = {'detected': " (detected)", 'cache': " (detected earlier)"}.get(
+                transcription.get('language_source'), "")
+            st.write(f"**🌐 Language:** {LANGUAGE_NAMES.get(transcription['language'], transcription['language'])}{language_note}")
             
             # Process text
             with st.spinner("🔄 Processing text..."):
@@ -313,15 +448,29 @@ with tab1:
             # Image upload
             uploaded_image = st.file_uploader("📸 Upload image (optional):", type=['png', 'jpg', 'jpeg'])
             
+            # Communities record the same legend many times; point at stored retellings before saving another.
+            # Looked up once per transcription, not on every widget rerun
+            duplicates_key = (transcription['text'], english_text)
+            if st.session_state.get('duplicates_key') != duplicates_key:
+                try:
+                    st.session_state.duplicates = components['db'].find_near_duplicates(
+                        {'original_text': transcription['text'], 'english_text': english_text})
+                except Exception:
+                    st.session_state.duplicates = []
+                st.session_state.duplicates_key = duplicates_key
+            duplicates = st.session_state.duplicates
+            if duplicates:
+                st.warning("⚠️ This looks like a retelling of stored myth(s): " + ", ".join(
+                    f"#{d['id']} ({d['similarity']:.0%} similar)" for d in duplicates[:5]))
+            
             # Save to database
             if st.button("💾 Save Myth", type="primary"):
                 with st.spinner("Saving myth..."):
                     try:
                         image_path = ""
                         if uploaded_image:
-                            image_path = f"data/images/{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uploaded_image.name}"
-                            with open(image_path, "wb") as f:
-                                f.write(uploaded_image.read())
+                            # Content-addressed storage deduplicates re-uploads and builds the thumbnail once
+                            image_path = components['image_store'].save(uploaded_image.getvalue(), uploaded_image.name)
                         
                         myth_data = {
                             'original_text': transcription['text'],
@@ -331,10 +480,15 @@ with tab1:
                             'language': transcription['language'],
                             'place': place,
                             'region': region,
-                            'image_path': image_path
+                            'image_path': image_path,
+                            'audio_path': transcription.get('audio_path', ''),
+                            'segments': transcription.get('segments')
                         }
                         
                         myth_id = components['db'].insert_myth(myth_data)
+                        components['autocomplete'].add_myth(
+                            myth_data, components['db'].get_cache_version('facets'))
+                        components['autocomplete'].save_later()
                         st.markdown(f"""
                         <div class="success-box">
                             <h4>✅ Myth Saved Successfully!</h4>
@@ -344,6 +498,8 @@ with tab1:
                         """, unsafe_allow_html=True)
                         st.session_state.audio_processed = False
                         st.session_state.transcription = None
+                        st.session_state.search_key = None  # Cached search results are now stale
+                        st.session_state.duplicates_key = None
                         st.rerun()
                     except Exception as e:
                         st.error(f"Error saving myth: {e}")
@@ -353,53 +509,79 @@ with tab1:
 # Tab 2: Search Myths
 with tab2:
     st.header("🔍 Search Your Myth Collection")
+    if not warmup.is_ready('indexes'):
+        st.caption("⏳ Search indexes are still catching up; older myths may be missing from results for a moment.")
     
     col1, col2 = st.columns([3, 1])
     with col1:
-        search_query = st.text_input("🔎 Search myths:", placeholder="e.g., Ram, Krishna, Ganga")
+        search_query = st.text_input("🔎 Search myths:", placeholder="e.g., Ram, Krishna, Ganga", key="search_query")
+        # Suggestions come from the in-memory prefix index, not from running a search; it is
+        # rebuilt when the database was changed elsewhere (e.g. a CLI import)
+        if search_query and warmup.is_ready('autocomplete') and components['autocomplete'].check_due():
+            components['autocomplete'].refresh(components['db'])
+        suggestions = [s for s in components['autocomplete'].suggest(search_query, limit=6)
+                       if s['text'].lower() != search_query.strip().lower()] if search_query else []
+        if suggestions:
+            suggestion_cols = st.columns(len(suggestions))
+            kind_icons = {'keyword': '🏷️', 'place': '📍', 'region': '🗺️'}
+            for suggestion_col, suggestion in zip(suggestion_cols, suggestions):
+                with suggestion_col:
+                    st.button(f"{kind_icons[suggestion['kind']]} {suggestion['text']}",
+                              key=f"suggest_{suggestion['kind']}_{suggestion['text']}",
+                              on_click=lambda text=suggestion['text']: st.session_state.update(search_query=text))
     with col2:
         search_button = st.button("🔍 Search", type="primary")
+    collapse_duplicates = st.checkbox("Group retellings of the same myth", value=True, key="collapse_duplicates")
     
-    if search_query and (search_button or search_query):
+    # Facet filters with live counts from the database's cached aggregate
+    try:
+        facet_counts = components['db'].get_facet_counts()
+    except Exception:
+        facet_counts = {'language': {}, 'region': {}, 'place': {}}
+    filter_cols = st.columns(3)
+    facet_labels = {'language': "🌐 Language", 'region': "🗺️ Region", 'place': "📍 Place"}
+    selected_facets = {}
+    for filter_col, (facet, label) in zip(filter_cols, facet_labels.items()):
+        counts = {value: count for value, count in facet_counts.get(facet, {}).items() if value}
+        with filter_col:
+            choice = st.selectbox(
+                label, [None] + list(counts), key=f"facet_{facet}",
+                format_func=lambda v, f=facet, c=counts: "All" if v is None
+                else f"{LANGUAGE_NAMES.get(v, v) if f == 'language' else v} ({c[v]})"
+            )
+        selected_facets[facet] = choice
+    has_filters = any(value is not None for value in selected_facets.values())
+    
+    if search_query or has_filters:
         with st.spinner("🔍 Searching..."):
-            try:
-                results = components['search_engine'].search(search_query)
-            except Exception as e:
-                st.error(f"Search error: {e}")
-                results = []
+            # Reuse the last result list while only the page or an opened story changes
+            # Misspelled words are corrected before retrieval unless the user asked for the exact query
+            autocorrect = st.session_state.get('exact_query') != search_query
+            search_key = (search_query, tuple(selected_facets.items()), collapse_duplicates, autocorrect)
+            if st.session_state.get('search_key') == search_key:
+                results = st.session_state.search_results
+            else:
+                try:
+                    results = components['search_engine'].search(search_query, collapse_duplicates=collapse_duplicates,
+                                                                 autocorrect=autocorrect, **selected_facets)
+                except Exception as e:
+                    st.error(f"Search error: {e}")
+                    results = []
+                st.session_state.search_key = search_key
+                st.session_state.search_results = results
+                st.session_state.search_page = 1
         
         if results:
+            corrected_query = results[0].get('corrected_query')
+            if corrected_query:
+                st.info(f"✏️ Showing results for **{corrected_query}**")
+                st.button(f"Search instead for \"{search_query}\"", key="search_exact",
+                          on_click=lambda query=search_query: st.session_state.update(exact_query=query))
             st.success(f"📚 Found {len(results)} myth(s)!")
-            for i, myth in enumerate(results):
-                with st.expander(f"📖 Myth {i+1}: {myth.get('place', 'Unknown Location')}"):
-                    col1, col2 = st.columns([2, 1])
-                    with col1:
-                        st.write(f"**📍 Location:** {myth.get('place', 'N/A')} ({myth.get('region', 'N/A')})")
-                        st.write(f"**🌐 Language:** {myth.get('language', 'N/A')}")
-                        st.write(f"**📄 Summary:** {myth.get('summary', 'N/A')}")
-                        keywords = myth.get('keywords', [])
-                        if isinstance(keywords, list):
-                            keywords_str = ', '.join(keywords)
-                        else:
-                            keywords_str = str(keywords)
-                        st.write(f"**🏷️ Keywords:** {keywords_str}")
-                        
-                        if st.button(f"📖 Show Full Story #{i+1}", key=f"show_full_story_search_{i}"):
-                            st.session_state[f"show_full_story_search_{i}"] = not st.session_state.get(f"show_full_story_search_{i}", False)
-                        
-                        if st.session_state.get(f"show_full_story_search_{i}", False):
-                            st.write("**Original Text:**")
-                            st.write(myth.get('original_text', 'N/A'))
-                            st.write("**English Translation:**")
-                            st.write(myth.get('english_text', 'N/A'))
-                    with col2:
-                        image_path = myth.get('image_path', '')
-                        if image_path and os.path.exists(image_path):
-                            try:
-                                image = Image.open(image_path)
-                                st.image(image, caption="Associated Image", use_column_width=True)
-                            except Exception as e:
-                                st.warning(f"Could not load image: {e}")
+            offset, limit = paginate(len(results), "search")
+            for i, myth in enumerate(results[offset:offset + limit], start=offset):
+                render_myth_card(myth, f"📖 Myth {i+1}: {myth.get('place', 'Unknown Location')}",
+                                 "search", "Associated Image", show_origin=True)
         else:
             st.info("😔 No myths found. Try different keywords!")
 
@@ -408,41 +590,19 @@ with tab3:
     st.header("📚 Your Myth Collection")
     
     try:
-        all_myths = components['db'].get_all_myths()
+        # Only the visible page is fetched; the total comes from the facet aggregate
+        total_myths = components['db'].count_myths()
+        offset, limit = paginate(total_myths, "all")
+        page_myths = components['db'].get_myths_page(limit, offset)
     except Exception as e:
         st.error(f"Error loading myths: {e}")
-        all_myths = []
+        total_myths, page_myths = 0, []
     
-    if all_myths:
-        st.success(f"📊 Total myths: {len(all_myths)}")
-        for i, myth in enumerate(all_myths):
-            with st.expander(f"📖 {myth.get('place', 'Unknown')} ({myth.get('language', 'N/A')}) #{i+1}"):
-                col1, col2 = st.columns([2, 1])
-                with col1:
-                    st.write(f"**📄 Summary:** {myth.get('summary', 'N/A')}")
-                    keywords = myth.get('keywords', [])
-                    if isinstance(keywords, list):
-                        keywords_str = ', '.join(keywords)
-                    else:
-                        keywords_str = str(keywords)
-                    st.write(f"**🏷️ Keywords:** {keywords_str}")
-                    
-                    if st.button(f"📖 Show Full Story #{i+1}", key=f"show_full_story_all_{i}"):
-                        st.session_state[f"show_full_story_all_{i}"] = not st.session_state.get(f"show_full_story_all_{i}", False)
-                    
-                    if st.session_state.get(f"show_full_story_all_{i}", False):
-                        st.write("**Original Text:**")
-                        st.write(myth.get('original_text', 'N/A'))
-                        st.write("**English Translation:**")
-                        st.write(myth.get('english_text', 'N/A'))
-                with col2:
-                    image_path = myth.get('image_path', '')
-                    if image_path and os.path.exists(image_path):
-                        try:
-                            image = Image.open(image_path)
-                            st.image(image, caption="Story Image", use_column_width=True)
-                        except Exception as e:
-                            st.warning(f"Could not load image: {e}")
+    if page_myths:
+        st.success(f"📊 Total myths: {total_myths}")
+        for i, myth in enumerate(page_myths, start=offset):
+            render_myth_card(myth, f"📖 {myth.get('place', 'Unknown')} ({myth.get('language', 'N/A')}) #{i+1}",
+                             "all", "Story Image")
     else:
         st.info("📭 No myths yet. Add some in the 'Add New Myth' tab!")
 
@@ -453,18 +613,16 @@ with st.sidebar:
     
     st.markdown("### 📊 Stats")
     try:
-        total_myths = len(components['db'].get_all_myths())
+        facet_counts = components['db'].get_facet_counts()
+        total_myths = sum(facet_counts['language'].values())
     except:
+        facet_counts = {'language': {}}
         total_myths = 0
     st.metric("Total Myths", total_myths)
     
     st.markdown("### 🌟 Languages")
-    languages = {
-        'hi': 'Hindi', 'ta': 'Tamil', 'te': 'Telugu', 'bn': 'Bengali', 'mr': 'Marathi',
-        'gu': 'Gujarati', 'kn': 'Kannada', 'ml': 'Malayalam', 'pa': 'Punjabi', 'or': 'Odia', 'en': 'English'
-    }
-    for code, name in languages.items():
-        st.write(f"• {name} ({code})")
+    for code, name in LANGUAGE_NAMES.items():
+        st.write(f"• {name} ({code}): {facet_counts['language'].get(code, 0)}")
     
     st.markdown("### 🔧 System Requirements")
     st.write("**For full audio support:**")
@@ -476,6 +634,28 @@ with st.sidebar:
         st.warning("⚠️ Limited audio support")
     if not ffmpeg_available:
         st.warning("⚠️ FFmpeg not found")
+    
+    st.markdown("### 🚀 Warmup")
+    status_icons = {'running': '⏳', 'ready': '✅', 'pending': '⏸️'}
+    for task, info in warmup.status().items():
+        icon = status_icons.get(info['status'], '❌')
+        took = f" ({info['seconds']:.1f}s)" if info['seconds'] is not None else ""
+        st.write(f"{icon} {task}: {info['status']}{took}")
+    
+    import_timer = startup.get_import_timer()
+    if import_timer:
+        with st.expander("⏱️ Startup import report"):
+            for record in import_timer.report(max_depth=2):
+                st.text(f"{'  ' * record['depth']}{record['module']}: "
+                        f"{record['cumulative_ms']:.0f} ms (self {record['self_ms']:.0f} ms)")
+    
+    if tracing.is_enabled():
+        with st.expander("📈 Stage timings"):
+            stages = tracing.REGISTRY.to_json()
+            if stages:
+                st.table([{'stage': stage, **stats} for stage, stats in stages.items()])
+            else:
+                st.write("No stages recorded yet.")
 
 # [2025-09-17] Step 1: created app.py streamlit layout
 
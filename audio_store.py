@@ -0,0 +1,184 @@
+import hashlib
+import io
+import json
+import os
+import struct
+import subprocess
+import tempfile
+import wave
+import zlib
+from functools import lru_cache
+from typing import Dict, Tuple
+
+FOOTER = struct.Struct('<Q4s')
+MAGIC = b'MPZ1'
+SAMPLE_RATE = 16000
+
+
+def _encode_chunk(pcm: bytes) -> bytes:
+    # First-order delta plus byte shuffling (all low bytes, then all high bytes) makes
+    # 16-bit speech far more compressible than raw samples
+    import numpy as np
+    samples = np.frombuffer(pcm, dtype='<i2')
+    deltas = np.diff(samples, prepend=np.int16(0)).astype('<i2')
+    shuffled = deltas.view(np.uint8).reshape(-1, 2).T.tobytes()
+    return zlib.compress(shuffled, 6)
+
+
+def _decode_chunk(data: bytes) -> bytes:
+    import numpy as np
+    shuffled = np.frombuffer(zlib.decompress(data), dtype=np.uint8)
+    deltas = shuffled.reshape(2, -1).T.copy().view('<i2').ravel()
+    # int16 cumsum wraps exactly like the int16 subtraction in _encode_chunk
+    return np.cumsum(deltas, dtype='<i2').tobytes()
+
+
+def _wav_bytes(pcm: bytes, sample_rate: int) -> bytes:
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(pcm)
+    return buffer.getvalue()
+
+
+def decode_to_pcm(audio_data: bytes, filename: str = 'audio.wav') -> Tuple[bytes, int]:
+    """
+    Return (16-bit mono PCM, sample rate). 16-bit mono WAV is read directly; anything else
+    is converted to 16 kHz mono with ffmpeg.
+    """
+    try:
+        with wave.open(io.BytesIO(audio_data), 'rb') as wav:
+            if wav.getnchannels() == 1 and wav.getsampwidth() == 2:
+                return wav.readframes(wav.getnframes()), wav.getframerate()
+    except (wave.Error, EOFError):
+        pass
+    with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(filename)[1]) as tmp_file:
+        tmp_file.write(audio_data)
+        input_path = tmp_file.name
+    try:
+        result = subprocess.run(
+            ['ffmpeg', '-nostdin', '-i', input_path, '-f', 's16le', '-acodec', 'pcm_s16le',
+             '-ac', '1', '-ar', str(SAMPLE_RATE), '-'],
+            capture_output=True
+        )
+    finally:
+        os.unlink(input_path)
+    if result.returncode != 0:
+        raise ValueError(f"Could not decode audio: {result.stderr.decode('utf-8', 'replace')[-200:]}")
+    return result.stdout, SAMPLE_RATE
+
+
+@lru_cache(maxsize=64)
+def _read_index(path: str, mtime: float) -> Dict:
+    with open(path, 'rb') as f:
+        f.seek(-FOOTER.size, os.SEEK_END)
+        index_offset, magic = FOOTER.unpack(f.read(FOOTER.size))
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a compressed audio file")
+        f.seek(index_offset)
+        return json.loads(f.read(os.path.getsize(path) - FOOTER.size - index_offset))
+
+
+class AudioStore:
+    def __init__(self, root: str = "data/audio", chunk_ms: int = 5000):
+        """
+        Initialize content-addressed storage for source recordings.
+
+        Recordings are kept as 16-bit mono PCM in independently compressed chunks, followed by an
+        index of chunk offsets, so any time range is served by reading and decompressing only the
+        chunks it overlaps.
+
+        Args:
+            root (str): Directory for stored recordings. Default is 'data/audio'.
+            chunk_ms (int): Chunk length in milliseconds; the unit of random access. Default is 5000.
+        """
+        self.root = root
+        self.chunk_ms = chunk_ms
+        os.makedirs(root, exist_ok=True)
+
+    def save(self, audio_data: bytes, filename: str = 'audio.wav') -> str:
+        """
+        Store a recording under its content hash. Saving the same recording again reuses the file.
+
+        Args:
+            audio_data (bytes): Encoded audio as uploaded (WAV, or any format ffmpeg can read).
+            filename (str): Original file name (used for format detection). Default is 'audio.wav'.
+
+        Returns:
+            str: Path of the stored recording, suitable for the myth's 'audio_path'.
+        """
+        path = os.path.join(self.root, hashlib.sha256(audio_data).hexdigest() + '.mpz')
+        if os.path.exists(path):
+            return path
+        pcm, sample_rate = decode_to_pcm(audio_data, filename)
+        chunk_bytes = sample_rate * self.chunk_ms // 1000 * 2
+        chunks = []
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            for start in range(0, len(pcm), chunk_bytes):
+                encoded = _encode_chunk(pcm[start:start + chunk_bytes])
+                chunks.append((f.tell(), len(encoded)))
+                f.write(encoded)
+            index_offset = f.tell()
+            f.write(json.dumps({
+                'sample_rate': sample_rate,
+                'chunk_frames': chunk_bytes // 2,
+                'frames': len(pcm) // 2,
+                'chunks': chunks,
+            }).encode('utf-8'))
+            f.write(FOOTER.pack(index_offset, MAGIC))
+        os.replace(tmp_path, path)
+        return path
+
+    def info(self, path: str) -> Dict:
+        """
+        Return the recording's 'sample_rate', 'frames' and 'duration_ms'.
+        """
+        index = _read_index(path, os.path.getmtime(path))
+        return {
+            'sample_rate': index['sample_rate'],
+            'frames': index['frames'],
+            'duration_ms': index['frames'] * 1000 // index['sample_rate'],
+        }
+
+    def read_range(self, path: str, start_ms: int, end_ms: int) -> bytes:
+        """
+        Return one time range of a stored recording as WAV bytes, ready for playback.
+
+        Only the compressed chunks overlapping the range are read (one contiguous read).
+
+        Args:
+            path (str): Stored recording path.
+            start_ms (int): Range start in milliseconds.
+            end_ms (int): Range end in milliseconds (clamped to the recording length).
+
+        Returns:
+            bytes: A WAV file containing just that range.
+        """
+        index = _read_index(path, os.path.getmtime(path))
+        rate, chunk_frames, chunks = index['sample_rate'], index['chunk_frames'], index['chunks']
+        start_frame = max(0, start_ms * rate // 1000)
+        end_frame = min(index['frames'], end_ms * rate // 1000)
+        if end_frame <= start_frame:
+            return _wav_bytes(b'', rate)
+        first, last = start_frame // chunk_frames, (end_frame - 1) // chunk_frames
+        with open(path, 'rb') as f:
+            f.seek(chunks[first][0])
+            data = f.read(chunks[last][0] + chunks[last][1] - chunks[first][0])
+        base = chunks[first][0]
+        pcm = b''.join(_decode_chunk(data[offset - base:offset - base + length])
+                       for offset, length in chunks[first:last + 1])
+        skip = (start_frame - first * chunk_frames) * 2
+        return _wav_bytes(pcm[skip:skip + (end_frame - start_frame) * 2], rate)
+
+
+if __name__ == "__main__":
+    # Example usage: python audio_store.py <audio file> <start_ms> <end_ms>
+    import sys
+    store = AudioStore()
+    with open(sys.argv[1], 'rb') as f:
+        stored = store.save(f.read(), sys.argv[1])
+    clip = store.read_range(stored, int(sys.argv[2]), int(sys.argv[3]))
+    print(f"Stored {stored} ({os.path.getsize(stored)} bytes, {store.info(stored)}); clip {len(clip)} bytes")
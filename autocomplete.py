@@ -0,0 +1,353 @@
+import atexit
+import bisect
+import heapq
+import json
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+from tokenizer import normalize
+
+KINDS = ('keyword', 'place', 'region')
+# Prefixes up to this many characters match too many terms to rank per keystroke; their top
+# terms are kept precomputed instead
+SHORT_PREFIX_CHARS = 3
+SHORT_PREFIX_TOP = 24
+# Bumps of the database's 'facets' version per write: an insert or delete changes the facet
+# aggregate once, an update twice (old values out, new values in)
+VERSION_BUMPS = {'insert': 1, 'delete': 1, 'update': 2}
+
+
+class Autocomplete:
+    def __init__(self, snapshot_path: str = "data/autocomplete.json", cache_size: int = 4096,
+                 check_interval: float = 1.0):
+        """
+        Initialize the search-as-you-type index over keywords, places and regions.
+
+        Terms are held in a sorted array of normalized keys; a prefix selects a contiguous
+        range found with bisect, and the best-weighted terms of that range are returned. Top
+        suggestions per prefix are cached until the next update, so repeated keystrokes are
+        dictionary lookups.
+
+        The index records the database's 'facets' version counter (bumped by every insert, update
+        and delete) it reflects. Writes made through this index advance it; any other change to
+        the database (another process, or writes it wasn't told about) makes refresh() and sync()
+        rebuild it.
+
+        Args:
+            snapshot_path (str): JSON snapshot written by save() and read by load(). Default is 'data/autocomplete.json'.
+            cache_size (int): Prefixes whose suggestions are cached. Default is 4096.
+            check_interval (float): Seconds between version checks (see check_due()). Default is 1.0.
+        """
+        self.snapshot_path = snapshot_path
+        self.cache_size = cache_size
+        self.check_interval = check_interval
+        self.version: Optional[int] = None  # Database 'facets' version the terms reflect; None if unknown
+        self._checked_at = float('-inf')
+        self._save_timer: Optional[threading.Timer] = None
+        self._atexit_registered = False
+        self._terms: Dict[Tuple[str, str], Dict] = {}  # (kind, normalized) -> {'text', 'kind', 'weight'}
+        self._index: Tuple[List[str], List[Dict]] = ([], [])  # sorted keys and their entries, swapped as one
+        self._short: Dict[str, List[Dict]] = {}  # short prefix -> best entries, highest weight first
+        self._cache: Dict[Tuple[str, int, Optional[Tuple[str, ...]]], List[Dict]] = {}
+        self._lock = threading.Lock()
+
+    def _add_term(self, kind: str, text: str, weight: int) -> Optional[Tuple[str, Dict, bool]]:
+        # Returns (normalized, entry, is_new)
+        text = (text or '').strip()
+        if not text:
+            return None
+        normalized = normalize(text)
+        entry = self._terms.get((kind, normalized))
+        if entry is not None:
+            entry['weight'] += weight
+            return normalized, entry, False
+        entry = self._terms[(kind, normalized)] = {'text': text, 'kind': kind, 'weight': weight}
+        return normalized, entry, True
+
+    @staticmethod
+    def _keys_of(normalized: str) -> List[str]:
+        # Multi-word values ("Uttar Pradesh") can also be reached from their later words
+        words = normalized.split()
+        return [normalized] + [' '.join(words[i:]) for i in range(1, len(words))]
+
+    @staticmethod
+    def _rank(entry: Dict):
+        return (-entry['weight'], entry['text'])
+
+    def _short_prefixes(self, normalized: str) -> set:
+        return {key[:length] for key in self._keys_of(normalized) for length in range(1, SHORT_PREFIX_CHARS + 1)}
+
+    def _offer_short(self, normalized: str, entry: Dict):
+        # Called after entry's weight grew or it was added. suggest() reads the lists without the
+        # lock, so each is replaced by a new one rather than sorted in place
+        for prefix in self._short_prefixes(normalized):
+            top = self._short.get(prefix, [])
+            others = [other for other in top if other is not entry]
+            if len(others) == len(top) and len(top) >= SHORT_PREFIX_TOP and self._rank(entry) >= self._rank(top[-1]):
+                continue
+            self._short[prefix] = sorted(others + [entry], key=self._rank)[:SHORT_PREFIX_TOP]
+
+    def _reindex(self):
+        pairs = sorted(((key, entry) for (_, normalized), entry in self._terms.items()
+                        for key in self._keys_of(normalized)), key=lambda pair: pair[0])
+        self._index = ([key for key, _ in pairs], [entry for _, entry in pairs])
+        short: Dict[str, Dict[int, Dict]] = {}
+        for (_, normalized), entry in self._terms.items():
+            for prefix in self._short_prefixes(normalized):
+                short.setdefault(prefix, {})[id(entry)] = entry
+        self._short = {prefix: sorted(entries.values(), key=self._rank)[:SHORT_PREFIX_TOP]
+                       for prefix, entries in short.items()}
+        self._cache.clear()
+
+    def build(self, db) -> 'Autocomplete':
+        """
+        Rebuild from a database: place and region counts from the facet aggregate, keyword counts from the myths.
+
+        Args:
+            db (MythDatabase): Source database (or ShardedMythDatabase).
+
+        Returns:
+            Autocomplete: self, for chaining.
+        """
+        # Read first: a write landing during the build leaves the recorded version behind, so the
+        # next check rebuilds rather than trusting counts that may have missed it
+        version = db.get_cache_version('facets')
+        facet_counts = db.get_facet_counts()
+        keyword_counts = db.get_keyword_counts()
+        with self._lock:
+            self._terms = {}
+            for kind in ('place', 'region'):
+                for value, count in facet_counts.get(kind, {}).items():
+                    self._add_term(kind, value, count)
+            for keyword, count in keyword_counts.items():
+                self._add_term('keyword', keyword, count)
+            self.version = version
+            self._reindex()
+        return self
+
+    def _advance(self, version: Optional[int], write: str):
+        # Called with the lock held. Any gap but this write's own bumps means changes this index missed
+        expected = None if self.version is None else self.version + VERSION_BUMPS[write]
+        self.version = version if version is not None and version == expected else None
+
+    def _terms_of(self, myth_data: Dict) -> List[Tuple[str, str]]:
+        return ([('keyword', keyword) for keyword in set(myth_data.get('keywords') or [])]
+                + [('place', myth_data.get('place')), ('region', myth_data.get('region'))])
+
+    def add_myth(self, myth_data: Dict, version: Optional[int] = None):
+        """
+        Count a newly inserted myth's keywords, place and region.
+
+        Args:
+            myth_data (Dict): The inserted myth.
+            version (Optional[int]): The database's 'facets' version read after the insert
+                (get_cache_version); without it the index counts as out of date.
+        """
+        with self._lock:
+            added = [self._add_term(kind, text, 1) for kind, text in self._terms_of(myth_data)]
+            self._advance(version, 'insert')
+            new_terms = [(normalized, entry) for normalized, entry, is_new in filter(None, added) if is_new]
+            if new_terms:
+                # Insert into copies and swap them in, so concurrent suggest() calls see a consistent index
+                keys, entries = list(self._index[0]), list(self._index[1])
+                for normalized, entry in new_terms:
+                    for key in self._keys_of(normalized):
+                        position = bisect.bisect_left(keys, key)
+                        keys.insert(position, key)
+                        entries.insert(position, entry)
+                self._index = (keys, entries)
+            for normalized, entry, _ in filter(None, added):
+                self._offer_short(normalized, entry)
+            self._cache.clear()
+
+    def _discount(self, myth_data: Dict):
+        # Called with the lock held; the caller re-sorts with _reindex()
+        for kind, text in self._terms_of(myth_data):
+            text = (text or '').strip()
+            key = (kind, normalize(text))
+            entry = self._terms.get(key) if text else None
+            if entry is not None:
+                entry['weight'] -= 1
+                if entry['weight'] <= 0:
+                    del self._terms[key]
+
+    def update_myth(self, old: Dict, new: Dict, version: Optional[int] = None):
+        """
+        Move an edited myth's counts from its old keywords, place and region to its new ones.
+
+        Args:
+            old (Dict): The myth before the update.
+            new (Dict): The myth after the update.
+            version (Optional[int]): The database's 'facets' version read after the update.
+        """
+        with self._lock:
+            self._discount(old)
+            for kind, text in self._terms_of(new):
+                self._add_term(kind, text, 1)
+            self._advance(version, 'update')
+            # Edits are rare next to keystrokes; re-sorting keeps the prefix tops exact
+            self._reindex()
+
+    def remove_myth(self, myth_data: Dict, version: Optional[int] = None):
+        """
+        Stop counting a deleted myth; terms no other myth uses are dropped.
+
+        Args:
+            myth_data (Dict): The deleted myth.
+            version (Optional[int]): The database's 'facets' version read after the delete.
+        """
+        with self._lock:
+            self._discount(myth_data)
+            self._advance(version, 'delete')
+            self._reindex()
+
+    def suggest(self, prefix: str, limit: int = 8, kinds: Optional[Iterable[str]] = None) -> List[Dict]:
+        """
+        Return the most frequent terms starting with `prefix`.
+
+        Args:
+            prefix (str): What the user has typed so far (case and accents are ignored).
+            limit (int): Maximum suggestions. Default is 8.
+            kinds (Optional[Iterable[str]]): Restrict to some of 'keyword', 'place', 'region'.
+
+        Returns:
+            List[Dict]: {'text', 'kind', 'weight'} dictionaries, highest weight first.
+        """
+        prefix = normalize(prefix).strip()
+        if not prefix:
+            return []
+        kinds = tuple(sorted(set(kinds))) if kinds is not None else None
+        if len(prefix) <= SHORT_PREFIX_CHARS:
+            top = self._short.get(prefix, [])
+            suggestions = [entry for entry in top if kinds is None or entry['kind'] in kinds]
+            # The precomputed list is cut at SHORT_PREFIX_TOP; if that leaves fewer than `limit`
+            # of the wanted kinds, the range scan below finds the rest
+            if len(suggestions) >= limit or len(top) < SHORT_PREFIX_TOP:
+                return [dict(entry) for entry in suggestions[:limit]]
+        cache_key = (prefix, limit, kinds)
+        suggestions = self._cache.get(cache_key)
+        if suggestions is None:
+            keys, entries = self._index
+            start = bisect.bisect_left(keys, prefix)
+            end = bisect.bisect_left(keys, prefix + '\U0010ffff', start)
+            unique = {id(entry): entry for entry in entries[start:end] if kinds is None or entry['kind'] in kinds}
+            suggestions = heapq.nsmallest(limit, unique.values(), key=self._rank)
+            if len(self._cache) >= self.cache_size:
+                self._cache.clear()
+            self._cache[cache_key] = suggestions
+        return [dict(entry) for entry in suggestions]
+
+    def save(self, path: Optional[str] = None):
+        """
+        Write the terms and their database version to a compact JSON snapshot (atomically).
+        """
+        path = path or self.snapshot_path
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with self._lock:
+            snapshot = {
+                'version': self.version,
+                'terms': [[KINDS.index(entry['kind']), entry['text'], entry['weight']] for entry in self._terms.values()],
+            }
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(snapshot, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_path, path)
+
+    def save_later(self, delay: float = 30.0):
+        """
+        Schedule a save() in `delay` seconds unless one is already pending, so a burst of writes
+        rewrites the snapshot once. Pending saves also run at interpreter exit (see flush()).
+        """
+        with self._lock:
+            if self._save_timer is not None:
+                return
+            self._save_timer = threading.Timer(delay, self.flush)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+            if not self._atexit_registered:
+                atexit.register(self.flush)
+                self._atexit_registered = True
+
+    def flush(self):
+        """
+        Run a pending save now (at shutdown, or when the save_later() timer fires).
+        """
+        with self._lock:
+            timer, self._save_timer = self._save_timer, None
+        if timer is not None:
+            timer.cancel()
+            self.save()
+
+    def load(self, path: Optional[str] = None) -> bool:
+        """
+        Read a snapshot written by save().
+
+        Returns:
+            bool: True if a snapshot was loaded.
+        """
+        path = path or self.snapshot_path
+        if not os.path.exists(path):
+            return False
+        with open(path, encoding='utf-8') as f:
+            snapshot = json.load(f)
+        with self._lock:
+            self._terms = {}
+            for kind_id, text, weight in snapshot['terms']:
+                self._add_term(KINDS[kind_id], text, weight)
+            # Snapshots from before versions were recorded hold none and are rebuilt
+            self.version = snapshot.get('version')
+            self._reindex()
+        return True
+
+    def sync(self, db) -> 'Autocomplete':
+        """
+        Load the snapshot if it matches the database's 'facets' version, otherwise rebuild and save a new one.
+        
+        Returns:
+            Autocomplete: self, for chaining.
+        """
+        self._checked_at = time.monotonic()
+        if not self.load() or self.version is None or self.version != db.get_cache_version('facets'):
+            self.build(db).save()
+        return self
+
+    def check_due(self) -> bool:
+        """
+        True when `check_interval` has passed since the last refresh() or sync().
+        """
+        return time.monotonic() - self._checked_at >= self.check_interval
+
+    def refresh(self, db) -> bool:
+        """
+        Rebuild if the database's 'facets' version moved past the one this index reflects, then
+        schedule a snapshot save.
+
+        Returns:
+            bool: True if the index was rebuilt.
+        """
+        self._checked_at = time.monotonic()
+        if self.version is not None and self.version == db.get_cache_version('facets'):
+            return False
+        self.build(db)
+        self.save_later()
+        return True
+
+    @classmethod
+    def open(cls, db, snapshot_path: str = "data/autocomplete.json") -> 'Autocomplete':
+        """
+        Create an index for `db` from its snapshot (see sync()).
+        """
+        return cls(snapshot_path).sync(db)
+
+
+if __name__ == "__main__":
+    # Example usage: python autocomplete.py kri
+    import sys
+    import time
+    from myth_database import MythDatabase
+    autocomplete = Autocomplete.open(MythDatabase())
+    prefix = sys.argv[1] if len(sys.argv) > 1 else 'a'
+    start = time.perf_counter()
+    suggestions = autocomplete.suggest(prefix)
+    print(f"{(time.perf_counter() - start) * 1e6:.0f} µs:", suggestions)
@@ -0,0 +1,7 @@
+"""
+Performance benchmarks for the Voice-to-Myth app.
+
+Run from the repository root, e.g. `python -m benchmarks.bench_search --rows 1000`.
+Every benchmark prints a JSON report (and writes it with --output) so runs can be compared
+across releases.
+"""
@@ -0,0 +1,124 @@
+import argparse
+import importlib
+import multiprocessing
+import os
+import time
+from typing import Callable, Dict, List, Tuple
+
+from benchmarks.corpus import build_corpus, generate_queries
+from benchmarks.harness import environment, latency_summary, peak_rss_mb, write_report
+
+
+def _like_backend(db, text_processor):
+    # The raw LIKE scan over search_doc, with the keywords SearchEngine would send
+    from tokenizer import normalize
+    return lambda query: db.search_myths(text_processor.extract_keywords(query) + [normalize(query)])
+
+
+def _engine_backend(db, text_processor):
+    from search_engine import SearchEngine
+    engine = SearchEngine(db=db, text_processor=text_processor)
+    return lambda query: engine.search(query, fuzzy=False)
+
+
+def _engine_fuzzy_backend(db, text_processor):
+    from search_engine import SearchEngine
+    engine = SearchEngine(db=db, text_processor=text_processor)
+    return lambda query: engine.search(query, fuzzy=True)
+
+
+def _fuzzy_index_backend(db, text_processor):
+    from tokenizer import tokenize
+    return lambda query: list(db.fuzzy_lookup(tokenize(query)))
+
+
+# name -> factory(db, text_processor) returning search(query) -> results
+BACKENDS = {
+    'like': _like_backend,
+    'engine': _engine_backend,
+    'engine_fuzzy': _engine_fuzzy_backend,
+    'fuzzy_index': _fuzzy_index_backend,
+}
+
+
+def resolve_backend(name: str) -> Callable:
+    """
+    Look up a built-in backend, or import 'package.module:factory' for an alternative implementation.
+    """
+    if name in BACKENDS:
+        return BACKENDS[name]
+    module_name, _, attr = name.partition(':')
+    if not attr:
+        raise ValueError(f"Unknown backend '{name}'; use one of {sorted(BACKENDS)} or 'module:factory'")
+    return getattr(importlib.import_module(module_name), attr)
+
+
+def run_backend(db_path: str, backend: str, queries: List[Tuple[str, str]], warmup: int) -> Dict:
+    """
+    Time every query against one backend and summarize latency per query kind.
+    """
+    from myth_database import MythDatabase
+    from text_processor import TextProcessor
+    search = resolve_backend(backend)(MythDatabase(db_path), TextProcessor())
+    for _, query in queries[:warmup]:
+        search(query)
+
+    by_kind: Dict[str, List[float]] = {}
+    latencies, hits = [], 0
+    start = time.perf_counter()
+    for kind, query in queries:
+        call_start = time.perf_counter()
+        results = search(query)
+        elapsed = time.perf_counter() - call_start
+        latencies.append(elapsed)
+        by_kind.setdefault(kind, []).append(elapsed)
+        hits += len(results)
+    total = time.perf_counter() - start
+
+    return {
+        'backend': backend,
+        'overall': latency_summary(latencies, total),
+        'by_kind': {kind: latency_summary(values) for kind, values in sorted(by_kind.items())},
+        'avg_results': round(hits / len(queries), 2) if queries else 0,
+        'peak_rss_mb': peak_rss_mb(),
+    }
+
+
+def run(rows_list: List[int], backends: List[str], query_count: int, warmup: int, data_dir: str,
+        seed: int, isolate: bool) -> Dict:
+    queries = generate_queries(query_count)
+    report = {'benchmark': 'search', 'environment': environment(), 'query_count': query_count, 'runs': []}
+    for rows in rows_list:
+        corpus = build_corpus(os.path.join(data_dir, f"corpus-{rows}-{seed}.db"), rows, seed)
+        results = []
+        for backend in backends:
+            if isolate:
+                # A fresh process per backend so peak RSS is attributable to that backend alone
+                with multiprocessing.get_context('spawn').Pool(1) as pool:
+                    results.append(pool.apply(run_backend, (corpus['db_path'], backend, queries, warmup)))
+            else:
+                results.append(run_backend(corpus['db_path'], backend, queries, warmup))
+        report['runs'].append({'corpus': corpus, 'results': results})
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark search latency, throughput and memory")
+    parser.add_argument('--rows', type=int, nargs='+', default=[1000],
+                        help="Corpus sizes, e.g. --rows 1000 100000 1000000")
+    parser.add_argument('--backends', nargs='+', default=['like', 'engine', 'engine_fuzzy'],
+                        help=f"Built-in {sorted(BACKENDS)} or 'module:factory'")
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--warmup', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=42, help="Corpus seed")
+    parser.add_argument('--data-dir', default='benchmarks/data', help="Where generated corpora are cached")
+    parser.add_argument('--no-isolate', action='store_true', help="Run all backends in this process")
+    parser.add_argument('--output', help="Also write the JSON report to this file")
+    args = parser.parse_args()
+    report = run(args.rows, args.backends, args.queries, args.warmup, args.data_dir, args.seed,
+                 isolate=not args.no_isolate)
+    write_report(report, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+import argparse
+import array
+import io
+import math
+import multiprocessing
+import os
+import random
+import time
+import wave
+from typing import Dict, List, Optional, Tuple
+
+from benchmarks.harness import Stopwatch, environment, peak_rss_mb, write_report
+
+SAMPLE_RATE = 16000
+
+
+def _wav_bytes(samples: array.array, sample_rate: int = SAMPLE_RATE) -> bytes:
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(samples.tobytes())
+    return buffer.getvalue()
+
+
+def synthesize_speechlike(duration_s: float, seed: int = 0) -> bytes:
+    """
+    Deterministic speech-shaped test signal: voiced "syllables" (a harmonic stack with a
+    drifting pitch) separated by short pauses, as 16 kHz mono WAV.
+
+    It is not intelligible speech, so transcripts are meaningless, but Whisper does the same
+    amount of encoder work per second of audio.
+    """
+    rng = random.Random(seed)
+    samples = array.array('h')
+    total = int(duration_s * SAMPLE_RATE)
+    while len(samples) < total:
+        length = int(rng.uniform(0.12, 0.3) * SAMPLE_RATE)
+        pitch = rng.uniform(100, 220)
+        for i in range(length):
+            t = i / SAMPLE_RATE
+            envelope = math.sin(math.pi * i / length)
+            f0 = pitch * (1 + 0.05 * math.sin(2 * math.pi * 3 * t))
+            value = sum(math.sin(2 * math.pi * f0 * h * t) / h for h in (1, 2, 3, 5))
+            samples.append(int(6000 * envelope * value))
+        samples.extend([0] * int(rng.uniform(0.03, 0.15) * SAMPLE_RATE))
+    del samples[total:]
+    return _wav_bytes(samples)
+
+
+def load_reference_audio(path: str, duration_s: float) -> bytes:
+    """
+    Load a local recording, loop or trim it to `duration_s`, and return it as 16 kHz mono WAV.
+    """
+    import numpy as np
+    import whisper
+    audio = whisper.load_audio(path)
+    repeats = int(math.ceil(duration_s * SAMPLE_RATE / len(audio)))
+    audio = np.tile(audio, repeats)[:int(duration_s * SAMPLE_RATE)]
+    pcm = (np.clip(audio, -1.0, 1.0) * 32767).astype(np.int16)
+    return _wav_bytes(array.array('h', pcm.tobytes()))
+
+
+def run_config(model_name: str, threads: int, device: str, clips: List[Tuple[float, bytes]],
+               repeats: int, batch_sizes: List[int] = ()) -> Dict:
+    """
+    Load one model with a fixed thread count and time every clip.
+
+    Each run times VoiceProcessor.transcribe and splits it by the 'timings' it returns: ffmpeg
+    decoding to a waveform ('decode'), language identification ('language_id') and Whisper
+    transcription ('inference'), with the remainder under 'other'. The language cache is off,
+    so every run pays for detection like a new upload. For each batch size, a burst of copies
+    of the shortest clip (if at most 30 s) is transcribed one by one and with transcribe_batch().
+    """
+    import torch
+    from voice_processor import VoiceProcessor
+    torch.set_num_threads(threads)
+
+    start = time.perf_counter()
+    import whisper
+    import_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    model = whisper.load_model(model_name, device=device)
+    load_seconds = time.perf_counter() - start
+    rss_after_load = peak_rss_mb()
+    processor = VoiceProcessor(model_name, language_cache_size=0)
+    processor.model = model
+
+    # One untimed pass so lazy kernel initialization doesn't land in the first measurement
+    _transcribe_once(processor, clips[0][1], Stopwatch())
+
+    results = []
+    for duration, data in clips:
+        stopwatch = Stopwatch()
+        words = 0
+        for _ in range(repeats):
+            words = len(_transcribe_once(processor, data, stopwatch).split())
+        phases = {name: round(total / repeats, 4) for name, total in stopwatch.totals.items()}
+        total = sum(phases.values())
+        results.append({
+            'duration_s': duration,
+            'repeats': repeats,
+            'phases_s': phases,
+            'total_s': round(total, 4),
+            'rtf': round(total / duration, 4),
+            'inference_rtf': round(phases['inference'] / duration, 4),
+            'words': words,
+        })
+
+    return {
+        'model': model_name,
+        'threads': threads,
+        'device': device,
+        'import_seconds': round(import_seconds, 3),
+        'load_seconds': round(load_seconds, 3),
+        'rss_after_load_mb': rss_after_load,
+        'peak_rss_mb': peak_rss_mb(),
+        'clips': results,
+        'batching': _time_batches(processor, clips, batch_sizes),
+    }
+
+
+def _time_batches(processor, clips: List[Tuple[float, bytes]], batch_sizes: List[int]) -> List[Dict]:
+    duration, data = min(clips)
+    if duration > 30 or not batch_sizes:
+        return []
+    results = []
+    for batch_size in batch_sizes:
+        burst = [(data, 'clip.wav')] * batch_size
+        start = time.perf_counter()
+        for audio_data, filename in burst:
+            processor.transcribe_audio(audio_data, filename)
+        sequential = time.perf_counter() - start
+        start = time.perf_counter()
+        processor.transcribe_batch(burst)
+        batched = time.perf_counter() - start
+        results.append({
+            'duration_s': duration,
+            'batch_size': batch_size,
+            'sequential_clips_per_s': round(batch_size / sequential, 3),
+            'batched_clips_per_s': round(batch_size / batched, 3),
+            'speedup': round(sequential / batched, 2),
+        })
+    return results
+
+
+def _transcribe_once(processor, data: bytes, stopwatch: Stopwatch) -> str:
+    start = time.perf_counter()
+    result = processor.transcribe(data, 'clip.wav')
+    elapsed = time.perf_counter() - start
+    for name, seconds in result['timings'].items():
+        stopwatch.totals[name] = stopwatch.totals.get(name, 0.0) + seconds
+    stopwatch.totals['other'] = stopwatch.totals.get('other', 0.0) + elapsed - sum(result['timings'].values())
+    return result['text']
+
+
+def run(models: List[str], thread_counts: List[int], durations: List[float], repeats: int,
+        device: str, audio_path: Optional[str], batch_sizes: List[int] = ()) -> Dict:
+    clips = [(duration, load_reference_audio(audio_path, duration) if audio_path
+              else synthesize_speechlike(duration)) for duration in durations]
+    report = {
+        'benchmark': 'transcription',
+        'environment': environment(),
+        'audio': {'source': audio_path or 'synthetic', 'durations_s': durations},
+        'runs': [],
+    }
+    for model_name in models:
+        for threads in thread_counts:
+            # A fresh process per configuration: clean load time, thread pool and peak memory
+            with multiprocessing.get_context('spawn').Pool(1) as pool:
+                report['runs'].append(pool.apply(run_config, (model_name, threads, device, clips, repeats, batch_sizes)))
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Whisper transcription cost per model and thread count")
+    parser.add_argument('--models', nargs='+', default=['tiny', 'base'])
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, os.cpu_count() or 1])
+    parser.add_argument('--durations', type=float, nargs='+', default=[5, 30, 120], help="Clip lengths in seconds")
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--device', default='cpu')
+    parser.add_argument('--audio', help="Local recording to loop/trim instead of the synthetic signal")
+    parser.add_argument('--batch-sizes', type=int, nargs='*', default=[1, 4, 8],
+                        help="Burst sizes for comparing sequential and batched transcription of the shortest clip")
+    parser.add_argument('--output', help="Also write the JSON report to this file")
+    args = parser.parse_args()
+    report = run(args.models, sorted(set(args.threads)), args.durations, args.repeats, args.device, args.audio,
+                 args.batch_sizes)
+    write_report(report, args.output)
+
+
+if __name__ == "__main__":
+    main()
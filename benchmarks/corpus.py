@@ -0,0 +1,156 @@
+import os
+import random
+import time
+from typing import Dict, Iterator, List, Tuple
+
+from myth_database import MythDatabase
+from text_processor import TextProcessor
+
+NAMES = ['Krishna', 'Rama', 'Sita', 'Hanuman', 'Ravana', 'Shiva', 'Parvati', 'Ganesha', 'Durga', 'Arjuna',
+         'Karna', 'Draupadi', 'Bhima', 'Murugan', 'Ayyappa', 'Meenakshi', 'Vishnu', 'Lakshmi', 'Indra', 'Yama']
+# Spellings users type that differ from the stored names
+NAME_VARIANTS = ['Krsna', 'Krishn', 'Raam', 'Hanumaan', 'Shiv', 'Ganesh', 'Durgaa', 'Arjun', 'Meenakshee', 'Vishnoo']
+PLACES = ['Mathura', 'Ayodhya', 'Lanka', 'Kashi', 'Madurai', 'Puri', 'Dwarka', 'Kurukshetra', 'Hampi',
+          'Ujjain', 'Sabarimala', 'Kanchipuram']
+REGIONS = ['North', 'South', 'East', 'West', 'Central', 'Northeast']
+NOUNS = ['river', 'mountain', 'serpent', 'demon', 'forest', 'village', 'king', 'queen', 'sage', 'festival',
+         'temple', 'battle', 'boon', 'curse', 'elephant', 'peacock', 'lotus', 'moon', 'monsoon', 'harvest',
+         'drought', 'ocean', 'cave', 'chariot', 'flute', 'bow', 'palace', 'cowherd', 'banyan', 'well']
+ADJECTIVES = ['ancient', 'golden', 'fierce', 'gentle', 'hidden', 'sacred', 'restless', 'silver', 'wise', 'proud']
+VERBS = ['defeated', 'blessed', 'crossed', 'guarded', 'cursed', 'rescued', 'worshipped', 'built', 'lifted', 'tricked']
+
+HINDI = {
+    'names': ['कृष्ण', 'राम', 'सीता', 'हनुमान', 'रावण', 'शिव', 'पार्वती', 'गणेश'],
+    'nouns': ['नदी', 'पर्वत', 'नाग', 'राक्षस', 'वन', 'गाँव', 'राजा', 'मंदिर'],
+    'verbs': ['देखा', 'हराया', 'बचाया', 'पूजा'],
+    'template': '{name} ने {place} के पास {noun} को {verb}।',
+}
+TAMIL = {
+    'names': ['முருகன்', 'ராமர்', 'சிவன்', 'மீனாட்சி', 'அய்யப்பன்'],
+    'nouns': ['நதி', 'மலை', 'கோயில்', 'அரசன்', 'காடு'],
+    'verbs': ['கண்டார்', 'வென்றார்', 'காப்பாற்றினார்'],
+    'template': '{name} {place} அருகே {noun} {verb}.',
+}
+LANGUAGE_MIX = [('en', 0.5), ('hi', 0.3), ('ta', 0.2)]
+QUERY_MIX = [('single_keyword', 0.35), ('multi_keyword', 0.30), ('name', 0.25), ('no_hit', 0.10)]
+
+
+def _english_sentence(rng: random.Random, name: str, place: str) -> str:
+    return (f"{name} {rng.choice(VERBS)} the {rng.choice(ADJECTIVES)} {rng.choice(NOUNS)} "
+            f"near {place} during the {rng.choice(NOUNS)}.")
+
+
+def _native_sentence(rng: random.Random, vocabulary: Dict, place: str) -> str:
+    return vocabulary['template'].format(name=rng.choice(vocabulary['names']), place=place,
+                                         noun=rng.choice(vocabulary['nouns']), verb=rng.choice(vocabulary['verbs']))
+
+
+def _weighted(rng: random.Random, mix: List[Tuple[str, float]]) -> str:
+    return rng.choices([name for name, _ in mix], weights=[weight for _, weight in mix])[0]
+
+
+def generate_myths(rows: int, seed: int = 42, text_processor: TextProcessor = None) -> Iterator[Dict]:
+    """
+    Deterministically generate myth-like records: 3-8 sentences about a few recurring names
+    and places, in English, Hindi or Tamil, each with an English rendering.
+
+    Args:
+        rows (int): Number of myths to generate.
+        seed (int): Random seed; the same seed always yields the same corpus. Default is 42.
+        text_processor (TextProcessor): Used for keywords and summaries. Default creates one.
+
+    Yields:
+        Dict: Complete myth dictionaries ready for MythDatabase.insert_myths.
+    """
+    rng = random.Random(seed)
+    text_processor = text_processor or TextProcessor()
+    for _ in range(rows):
+        language = _weighted(rng, LANGUAGE_MIX)
+        place = rng.choice(PLACES)
+        names = rng.sample(NAMES, 2)
+        sentence_count = rng.randint(3, 8)
+        english_text = ' '.join(_english_sentence(rng, rng.choice(names), place) for _ in range(sentence_count))
+        if language == 'en':
+            original_text = english_text
+        else:
+            vocabulary = HINDI if language == 'hi' else TAMIL
+            original_text = ' '.join(_native_sentence(rng, vocabulary, place) for _ in range(sentence_count))
+        yield {
+            'original_text': original_text,
+            'english_text': english_text,
+            'summary': text_processor.create_summary(english_text),
+            'keywords': text_processor.extract_keywords(english_text),
+            'language': language,
+            'place': place,
+            'region': rng.choice(REGIONS),
+            'image_path': '',
+        }
+
+
+def build_corpus(db_path: str, rows: int, seed: int = 42, batch_size: int = 2000) -> Dict:
+    """
+    Create (or reuse) a benchmark database holding `rows` generated myths.
+
+    Args:
+        db_path (str): Database file to create. An existing file with the right row count is reused.
+        rows (int): Number of myths.
+        seed (int): Corpus seed. Default is 42.
+        batch_size (int): Myths per insert transaction. Default is 2000.
+
+    Returns:
+        Dict: 'db_path', 'rows', 'seed', 'build_seconds' (0 when reused) and 'db_size_mb'.
+    """
+    build_seconds = 0.0
+    if not os.path.exists(db_path) or MythDatabase(db_path).count_myths() != rows:
+        if os.path.exists(db_path):
+            os.remove(db_path)
+        db = MythDatabase(db_path)
+        start = time.perf_counter()
+        batch = []
+        for myth in generate_myths(rows, seed):
+            batch.append(myth)
+            if len(batch) >= batch_size:
+                db.insert_myths(batch)
+                batch = []
+        if batch:
+            db.insert_myths(batch)
+        build_seconds = round(time.perf_counter() - start, 2)
+    return {
+        'db_path': db_path,
+        'rows': rows,
+        'seed': seed,
+        'build_seconds': build_seconds,
+        'db_size_mb': round(os.path.getsize(db_path) / (1024 * 1024), 2),
+    }
+
+
+def generate_queries(count: int, seed: int = 7) -> List[Tuple[str, str]]:
+    """
+    Deterministic query workload as (kind, query) pairs.
+
+    Kinds: 'single_keyword' (one story word), 'multi_keyword' (two or three words),
+    'name' (a character or place, half of them misspelled or transliterated) and
+    'no_hit' (words that never occur in the corpus).
+    """
+    rng = random.Random(seed)
+    queries = []
+    for _ in range(count):
+        kind = _weighted(rng, QUERY_MIX)
+        if kind == 'single_keyword':
+            query = rng.choice(NOUNS)
+        elif kind == 'multi_keyword':
+            query = ' '.join(rng.sample(NOUNS + ADJECTIVES + VERBS, rng.randint(2, 3)))
+        elif kind == 'name':
+            pool = NAME_VARIANTS if rng.random() < 0.5 else NAMES + PLACES
+            query = rng.choice(pool)
+        else:
+            query = ''.join(rng.choice('bcdfghjklmnpqrstvwxz') for _ in range(rng.randint(6, 10)))
+        queries.append((kind, query))
+    return queries
+
+
+if __name__ == "__main__":
+    # Example usage: python -m benchmarks.corpus
+    for myth in generate_myths(3):
+        print(myth['language'], myth['place'], '|', myth['original_text'][:80])
+    print(generate_queries(8))
@@ -0,0 +1,99 @@
+import json
+import os
+import platform
+import resource
+import sys
+import time
+from typing import Dict, List, Optional
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """
+    Nearest-rank percentile of an already sorted list.
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[rank]
+
+
+def latency_summary(latencies_s: List[float], elapsed_s: Optional[float] = None) -> Dict:
+    """
+    Summarize per-call latencies (seconds) as milliseconds percentiles plus throughput.
+
+    Args:
+        latencies_s (List[float]): Wall time of each call.
+        elapsed_s (Optional[float]): Total wall time of the run; defaults to the sum of latencies.
+
+    Returns:
+        Dict: 'count', 'p50_ms', 'p95_ms', 'p99_ms', 'mean_ms', 'max_ms' and 'per_second'.
+    """
+    values = sorted(latencies_s)
+    total = elapsed_s if elapsed_s is not None else sum(values)
+    return {
+        'count': len(values),
+        'p50_ms': round(percentile(values, 50) * 1000, 3),
+        'p95_ms': round(percentile(values, 95) * 1000, 3),
+        'p99_ms': round(percentile(values, 99) * 1000, 3),
+        'mean_ms': round(sum(values) / len(values) * 1000, 3) if values else 0.0,
+        'max_ms': round(values[-1] * 1000, 3) if values else 0.0,
+        'per_second': round(len(values) / total, 2) if total else 0.0,
+    }
+
+
+def peak_rss_mb() -> float:
+    """
+    Peak resident set size of this process in MB (ru_maxrss is KB on Linux, bytes on macOS).
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+class Stopwatch:
+    def __init__(self):
+        """
+        Accumulate wall time per named phase: `with stopwatch.phase('decode'): ...`.
+        """
+        self.totals = {}
+
+    def phase(self, name: str) -> '_Phase':
+        return _Phase(self, name)
+
+    def seconds(self) -> Dict[str, float]:
+        return {name: round(total, 4) for name, total in self.totals.items()}
+
+
+class _Phase:
+    def __init__(self, stopwatch: Stopwatch, name: str):
+        self.stopwatch = stopwatch
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.start
+        self.stopwatch.totals[self.name] = self.stopwatch.totals.get(self.name, 0.0) + elapsed
+        return False
+
+
+def environment() -> Dict:
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def write_report(report: Dict, output: Optional[str] = None):
+    """
+    Print the report as JSON and optionally write it to a file.
+    """
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    print(text)
+    if output:
+        os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+        with open(output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
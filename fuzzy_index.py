@@ -0,0 +1,294 @@
+import re
+import sqlite3
+import unicodedata
+from typing import Dict, Iterable, List, Optional, Set
+from tokenizer import ALL_STOP_WORDS, TokenizedMyth, normalize
+
+# Devanagari to Latin (simplified ISO 15919). Other Indic blocks share Devanagari's layout at
+# 128-codepoint offsets, so they are shifted onto this table before lookup.
+INDIC_BLOCK_START = 0x0900
+INDIC_BLOCK_END = 0x0D7F
+VIRAMA = 0x4D
+CONSONANTS = {
+    0x15: 'k', 0x16: 'kh', 0x17: 'g', 0x18: 'gh', 0x19: 'n',
+    0x1A: 'c', 0x1B: 'ch', 0x1C: 'j', 0x1D: 'jh', 0x1E: 'n',
+    0x1F: 't', 0x20: 'th', 0x21: 'd', 0x22: 'dh', 0x23: 'n',
+    0x24: 't', 0x25: 'th', 0x26: 'd', 0x27: 'dh', 0x28: 'n', 0x29: 'n',
+    0x2A: 'p', 0x2B: 'ph', 0x2C: 'b', 0x2D: 'bh', 0x2E: 'm',
+    0x2F: 'y', 0x30: 'r', 0x31: 'r', 0x32: 'l', 0x33: 'l', 0x34: 'l', 0x35: 'v',
+    0x36: 'sh', 0x37: 'sh', 0x38: 's', 0x39: 'h',
+    0x58: 'q', 0x59: 'kh', 0x5A: 'g', 0x5B: 'z', 0x5C: 'r', 0x5D: 'rh', 0x5E: 'f', 0x5F: 'y',
+}
+VOWELS = {
+    0x05: 'a', 0x06: 'aa', 0x07: 'i', 0x08: 'ii', 0x09: 'u', 0x0A: 'uu', 0x0B: 'ri',
+    0x0E: 'e', 0x0F: 'e', 0x10: 'ai', 0x12: 'o', 0x13: 'o', 0x14: 'au',
+}
+VOWEL_SIGNS = {
+    0x3E: 'aa', 0x3F: 'i', 0x40: 'ii', 0x41: 'u', 0x42: 'uu', 0x43: 'ri',
+    0x46: 'e', 0x47: 'e', 0x48: 'ai', 0x4A: 'o', 0x4B: 'o', 0x4C: 'au',
+}
+MODIFIERS = {0x01: 'n', 0x02: 'n', 0x03: 'h'}
+
+# Spelling variants that collapse to one sound, applied longest first
+PHONETIC_RULES = [
+    ('ksh', 'ks'), ('sh', 's'), ('kh', 'k'), ('gh', 'g'), ('ch', 'c'), ('jh', 'j'),
+    ('th', 't'), ('dh', 'd'), ('ph', 'f'), ('bh', 'b'), ('w', 'v'), ('z', 'j'), ('q', 'k'),
+    ('x', 'ks'), ('ck', 'k'),
+]
+PHONETIC_RULES_RE = re.compile('|'.join(re.escape(src) for src, _ in PHONETIC_RULES))
+PHONETIC_RULES_MAP = dict(PHONETIC_RULES)
+VOWELS_RE = re.compile(r'[aeiouy]+')
+REPEATS_RE = re.compile(r'(.)\1+')
+# Characters after which a capitalized word starts a sentence rather than marking a name
+SENTENCE_END_CHARS = frozenset('.!?।॥:"“\n')
+
+
+def transliterate(text: str) -> str:
+    """
+    Romanize Indic-script text so it can be compared with Latin spellings of the same name.
+
+    Args:
+        text (str): Text in any Indic script supported by the app (Latin passes through unchanged).
+
+    Returns:
+        str: A lowercase Latin approximation.
+    """
+    out = []
+    pending_vowel = False
+    for char in text:
+        code = ord(char)
+        if not INDIC_BLOCK_START <= code <= INDIC_BLOCK_END:
+            if pending_vowel:
+                out.append('a')
+                pending_vowel = False
+            out.append(char)
+            continue
+        offset = (code - INDIC_BLOCK_START) % 0x80
+        if offset in CONSONANTS:
+            if pending_vowel:
+                out.append('a')
+            out.append(CONSONANTS[offset])
+            pending_vowel = True
+        elif offset in VOWEL_SIGNS:
+            out.append(VOWEL_SIGNS[offset])
+            pending_vowel = False
+        elif offset == VIRAMA:
+            pending_vowel = False
+        elif offset in VOWELS:
+            if pending_vowel:
+                out.append('a')
+                pending_vowel = False
+            out.append(VOWELS[offset])
+        elif offset in MODIFIERS:
+            if pending_vowel:
+                out.append('a')
+                pending_vowel = False
+            out.append(MODIFIERS[offset])
+    if pending_vowel:
+        out.append('a')
+    return ''.join(out)
+
+
+def latin_form(term: str) -> str:
+    """
+    Return the normalized, romanized, diacritic-free form of a term.
+    """
+    decomposed = unicodedata.normalize('NFKD', transliterate(normalize(term)))
+    return ''.join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def phonetic_key(term: str) -> str:
+    """
+    Build a transliteration-aware phonetic key: romanize, fold aspirates and sibilants, keep
+    the first letter, drop later vowels and collapse repeated letters.
+
+    "Krishna", "Krsna", "Krishn" and "कृष्ण" all map to "krsn"; "Rama" and "Ram" map to "rm".
+
+    Args:
+        term (str): The term to encode.
+
+    Returns:
+        str: The phonetic key (empty for terms without letters).
+    """
+    latin = latin_form(term)
+    latin = PHONETIC_RULES_RE.sub(lambda m: PHONETIC_RULES_MAP[m.group(0)], latin)
+    latin = ''.join(c for c in latin if c.isalpha())
+    if not latin:
+        return ''
+    key = latin[0] + VOWELS_RE.sub('', latin[1:])
+    return REPEATS_RE.sub(r'\1', key)
+
+
+def trigrams(term: str) -> Set[str]:
+    """
+    Return the padded character trigrams of a term's Latin form.
+    """
+    padded = f"$${latin_form(term)}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def edit_distance(a: str, b: str, max_distance: int) -> int:
+    """
+    Levenshtein distance with early exit once every cell in a row exceeds `max_distance`.
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        if min(current) > max_distance:
+            return max_distance + 1
+        previous = current
+    return previous[-1]
+
+
+def _starts_sentence(text: str, start: int) -> bool:
+    position = start
+    while position > 0 and text[position - 1].isspace():
+        position -= 1
+    return position == 0 or text[position - 1] in SENTENCE_END_CHARS
+
+
+class FuzzyIndex:
+    def __init__(self, max_candidates: int = 50, min_trigram_overlap: float = 0.4):
+        """
+        Initialize the trigram and phonetic-key index over myth keywords, places and names.
+
+        Args:
+            max_candidates (int): Maximum terms considered per query token. Default is 50.
+            min_trigram_overlap (float): Share of the query's trigrams a candidate term must contain. Default is 0.4.
+        """
+        self.max_candidates = max_candidates
+        self.min_trigram_overlap = min_trigram_overlap
+
+    def init_schema(self, cursor: sqlite3.Cursor):
+        """
+        Create the index tables if they don't exist.
+        """
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS fuzzy_terms (
+                term TEXT PRIMARY KEY,
+                latin TEXT NOT NULL,
+                phonetic_key TEXT NOT NULL
+            ) WITHOUT ROWID
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_fuzzy_terms_phonetic ON fuzzy_terms(phonetic_key)')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS fuzzy_trigrams (
+                trigram TEXT NOT NULL,
+                term TEXT NOT NULL,
+                PRIMARY KEY (trigram, term)
+            ) WITHOUT ROWID
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS fuzzy_postings (
+                term TEXT NOT NULL,
+                myth_id INTEGER NOT NULL,
+                PRIMARY KEY (term, myth_id)
+            ) WITHOUT ROWID
+        ''')
+        # Stop words were indexed as names before; their postings matched unrelated queries
+        stop_words = sorted(ALL_STOP_WORDS)
+        cursor.execute(f'DELETE FROM fuzzy_postings WHERE term IN ({",".join("?" * len(stop_words))})', stop_words)
+
+    @staticmethod
+    def terms_for(myth_data: Dict, tokens: Optional[TokenizedMyth] = None) -> Set[str]:
+        """
+        Collect the indexable terms of a myth: keywords, place, region and capitalized names.
+
+        Stop words are never terms. Names come from the English text; a capitalized word at the
+        start of a sentence only counts if it is also capitalized mid-sentence in the English text
+        or the summary.
+        """
+        tokens = tokens or TokenizedMyth(myth_data)
+        terms = set()
+        for field in ('keywords', 'place', 'region'):
+            terms.update(tokens.tokens(field))
+        names, sentence_initial = set(), set()
+        for field in ('english_text', 'summary'):
+            text = tokens.text(field)
+            for token, start, _ in tokens.tokens(field, with_offsets=True):
+                if 'A' <= text[start] <= 'Z':
+                    if not _starts_sentence(text, start):
+                        names.add(token)
+                    elif field == 'english_text':
+                        sentence_initial.add(token)
+        english = set(tokens.tokens('english_text'))
+        terms.update(names & english)
+        terms.update(sentence_initial & names)
+        return terms
+
+    def index_myth(self, cursor: sqlite3.Cursor, myth_id: int, myth_data: Dict,
+                   tokens: Optional[TokenizedMyth] = None):
+        """
+        Add a myth's terms to the index using the caller's cursor (and transaction).
+        """
+        for term in self.terms_for(myth_data, tokens):
+            cursor.execute('INSERT OR IGNORE INTO fuzzy_terms (term, latin, phonetic_key) VALUES (?, ?, ?)',
+                           (term, latin_form(term), phonetic_key(term)))
+            if cursor.rowcount:
+                cursor.executemany('INSERT OR IGNORE INTO fuzzy_trigrams (trigram, term) VALUES (?, ?)',
+                                   [(gram, term) for gram in trigrams(term)])
+            cursor.execute('INSERT OR IGNORE INTO fuzzy_postings (term, myth_id) VALUES (?, ?)', (term, myth_id))
+
+    def remove_myth(self, cursor: sqlite3.Cursor, myth_id: int):
+        """
+        Drop a myth's postings. Orphaned terms stay indexed; they only cost a lookup.
+        """
+        cursor.execute('DELETE FROM fuzzy_postings WHERE myth_id = ?', (myth_id,))
+
+    def candidate_terms(self, cursor: sqlite3.Cursor, token: str) -> List[str]:
+        """
+        Find indexed terms that sound like or are spelled close to a query token.
+
+        Candidates come from the phonetic-key index and the trigram index; edit distance
+        is computed only for that short candidate list.
+        """
+        matches = [row[0] for row in cursor.execute(
+            'SELECT term FROM fuzzy_terms WHERE phonetic_key = ? LIMIT ?',
+            (phonetic_key(token), self.max_candidates)
+        )]
+
+        grams = sorted(trigrams(token))
+        needed = max(1, int(len(grams) * self.min_trigram_overlap))
+        placeholders = ','.join('?' * len(grams))
+        rows = cursor.execute(f'''
+            SELECT t.term, t.latin FROM (
+                SELECT term, COUNT(*) AS shared FROM fuzzy_trigrams
+                WHERE trigram IN ({placeholders})
+                GROUP BY term HAVING shared >= ?
+                ORDER BY shared DESC LIMIT ?
+            ) AS c JOIN fuzzy_terms AS t ON t.term = c.term
+        ''', grams + [needed, self.max_candidates]).fetchall()
+        query_latin = latin_form(token)
+        max_distance = max(1, len(query_latin) // 4)
+        for term, latin in rows:
+            if term not in matches and edit_distance(query_latin, latin, max_distance) <= max_distance:
+                matches.append(term)
+        return matches
+
+    def lookup(self, cursor: sqlite3.Cursor, tokens: Iterable[str]) -> Dict[int, Set[str]]:
+        """
+        Map myth IDs to the indexed terms that fuzzily matched any of the query tokens.
+        """
+        hits: Dict[int, Set[str]] = {}
+        for token in tokens:
+            if not latin_form(token):
+                continue
+            terms = self.candidate_terms(cursor, token)
+            if not terms:
+                continue
+            placeholders = ','.join('?' * len(terms))
+            for term, myth_id in cursor.execute(
+                f'SELECT term, myth_id FROM fuzzy_postings WHERE term IN ({placeholders})', terms
+            ):
+                hits.setdefault(myth_id, set()).add(term)
+        return hits
+
+
+if __name__ == "__main__":
+    # Example usage for testing
+    for word in ["Krishna", "Krsna", "Krishn", "कृष्ण", "Rama", "Ram", "ராமர்"]:
+        print(word, transliterate(normalize(word)), phonetic_key(word))
@@ -0,0 +1,155 @@
+import hashlib
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+HASH_NAME_RE = re.compile(r'^[0-9a-f]{64}$')
+
+
+class LRUByteCache:
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024):
+        """
+        Initialize a thread-safe LRU cache bounded by the total size of its byte-string values.
+
+        Args:
+            max_bytes (int): Maximum total size of cached values. Default is 32 MB.
+        """
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            value = self._items.get(key)
+            if value is not None:
+                self._items.move_to_end(key)
+            return value
+
+    def put(self, key: str, value: bytes):
+        if len(value) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self.current_bytes -= len(old)
+            self._items[key] = value
+            self.current_bytes += len(value)
+            while self.current_bytes > self.max_bytes:
+                _, evicted = self._items.popitem(last=False)
+                self.current_bytes -= len(evicted)
+
+
+class ImageStore:
+    def __init__(self, root: str = "data/images", thumb_size: Tuple[int, int] = (320, 320),
+                 cache_bytes: int = 32 * 1024 * 1024):
+        """
+        Initialize content-addressed image storage with fixed-size thumbnails.
+
+        Args:
+            root (str): Directory for stored images. Thumbnails go to '<root>/thumbs'. Default is 'data/images'.
+            thumb_size (Tuple[int, int]): Bounding box for thumbnails in pixels. Default is (320, 320).
+            cache_bytes (int): Size bound for the in-memory thumbnail cache. Default is 32 MB.
+        """
+        self.root = root
+        self.thumb_dir = os.path.join(root, "thumbs")
+        self.thumb_size = thumb_size
+        self.cache = LRUByteCache(cache_bytes)
+        self._thumb_format = None
+        os.makedirs(self.thumb_dir, exist_ok=True)
+
+    @property
+    def thumb_format(self) -> str:
+        """
+        Thumbnail encoding: WebP when Pillow was built with it, otherwise JPEG.
+        """
+        if self._thumb_format is None:
+            from PIL import features
+            self._thumb_format = "WEBP" if features.check("webp") else "JPEG"
+        return self._thumb_format
+
+    def save(self, data: bytes, filename: str) -> str:
+        """
+        Store an uploaded image under its content hash and generate its thumbnail.
+
+        Uploading the same picture twice reuses the existing file.
+
+        Args:
+            data (bytes): Encoded image bytes as uploaded.
+            filename (str): Original file name (used for the extension).
+
+        Returns:
+            str: Path of the stored image, suitable for the myth's 'image_path'.
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        extension = os.path.splitext(filename)[1].lower() or ".jpg"
+        image_path = os.path.join(self.root, digest + extension)
+        if not os.path.exists(image_path):
+            tmp_path = image_path + ".tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, image_path)
+        self._build_thumbnail(image_path, self.thumbnail_path(image_path))
+        return image_path
+
+    def thumbnail_path(self, image_path: str) -> str:
+        """
+        Return where the thumbnail for `image_path` lives. Legacy (non-hashed) images are
+        keyed by a hash of their path.
+        """
+        stem = os.path.splitext(os.path.basename(image_path))[0]
+        if not HASH_NAME_RE.match(stem):
+            stem = hashlib.sha256(image_path.encode("utf-8")).hexdigest()
+        extension = ".webp" if self.thumb_format == "WEBP" else ".jpg"
+        return os.path.join(self.thumb_dir, stem + extension)
+
+    def _build_thumbnail(self, image_path: str, thumb_path: str):
+        if os.path.exists(thumb_path):
+            return
+        from PIL import Image, ImageOps
+        with Image.open(image_path) as image:
+            # draft() lets the JPEG decoder downscale while decoding instead of after
+            image.draft("RGB", self.thumb_size)
+            image = ImageOps.exif_transpose(image).convert("RGB")
+            image.thumbnail(self.thumb_size)
+            tmp_path = thumb_path + ".tmp"
+            image.save(tmp_path, format=self.thumb_format, quality=80)
+        os.replace(tmp_path, thumb_path)
+
+    def load_thumbnail(self, image_path: str) -> Optional[bytes]:
+        """
+        Return the encoded thumbnail for an image, from memory when cached.
+
+        Thumbnails missing on disk (images stored before thumbnails existed) are built once.
+
+        Args:
+            image_path (str): Stored image path from the myth record.
+
+        Returns:
+            Optional[bytes]: Thumbnail bytes, or None if the image is missing.
+        """
+        if not image_path:
+            return None
+        cached = self.cache.get(image_path)
+        if cached is not None:
+            return cached
+        if not os.path.exists(image_path):
+            return None
+        thumb_path = self.thumbnail_path(image_path)
+        self._build_thumbnail(image_path, thumb_path)
+        with open(thumb_path, "rb") as f:
+            data = f.read()
+        self.cache.put(image_path, data)
+        return data
+
+
+if __name__ == "__main__":
+    # Example usage: python image_store.py <image file>
+    import sys
+    store = ImageStore()
+    with open(sys.argv[1], "rb") as f:
+        path = store.save(f.read(), sys.argv[1])
+    thumb = store.load_thumbnail(path)
+    print(f"Stored {path}; thumbnail {store.thumbnail_path(path)} ({len(thumb)} bytes)")
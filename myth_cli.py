@@ -0,0 +1,390 @@
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from myth_database import MythDatabase
+
+AUDIO_EXTENSIONS = ('.wav', '.mp3', '.m4a', '.flac', '.ogg', '.aac')
+MYTH_FIELDS = ('original_text', 'english_text', 'summary', 'keywords', 'language',
+               'place', 'region', 'image_path', 'audio_path', 'created_at')
+
+
+class Progress:
+    def __init__(self, label: str, total: Optional[int] = None, interval: float = 0.5):
+        """
+        Throttled progress line on stderr showing count, throughput and elapsed time.
+
+        Args:
+            label (str): Verb shown in the line (e.g., 'imported').
+            total (Optional[int]): Expected number of items, if known.
+            interval (float): Minimum seconds between redraws. Default is 0.5.
+        """
+        self.label = label
+        self.total = total
+        self.interval = interval
+        self.count = 0
+        self.start = time.perf_counter()
+        self._last_draw = 0.0
+
+    def update(self, n: int = 1):
+        self.count += n
+        now = time.perf_counter()
+        if now - self._last_draw >= self.interval:
+            self._last_draw = now
+            self._draw(now)
+
+    def _draw(self, now: float, end: str = '\r'):
+        elapsed = max(now - self.start, 1e-9)
+        total = f"/{self.total}" if self.total else ''
+        sys.stderr.write(f"{self.count}{total} {self.label} | {self.count / elapsed:,.1f}/s | {elapsed:,.1f}s{end}")
+        sys.stderr.flush()
+
+    def finish(self):
+        self._draw(time.perf_counter(), end='\n')
+
+
+class Checkpoint:
+    def __init__(self, path: str, source: str, target: str):
+        """
+        Resume position for importing one source into one database, rewritten atomically after
+        every committed batch.
+
+        The database commit happens before the checkpoint write, so a crash in between
+        replays at most one batch on resume.
+
+        Args:
+            path (str): Checkpoint file path.
+            source (str): The input being imported.
+            target (str): The database being imported into. A checkpoint recorded for a different
+                source or database is ignored, so the same file can be loaded into several databases.
+        """
+        self.path = path
+        self.source = os.path.abspath(source)
+        self.target = os.path.abspath(target)
+        self.position = 0
+        self.imported = 0
+        self.complete = False
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                state = json.load(f)
+            if state.get('source') == self.source and state.get('target') == self.target:
+                self.position = state['position']
+                self.imported = state['imported']
+                self.complete = state.get('complete', False)
+
+    def save(self, position, imported: int, complete: bool = False):
+        self.position, self.imported, self.complete = position, imported, complete
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'source': self.source, 'target': self.target, 'position': position,
+                       'imported': imported, 'complete': complete}, f)
+        os.replace(tmp_path, self.path)
+
+
+def _parse_keywords(value) -> List[str]:
+    if isinstance(value, list):
+        return value
+    value = (value or '').strip()
+    if value.startswith('['):
+        return json.loads(value)
+    return [keyword.strip() for keyword in value.split(',') if keyword.strip()]
+
+
+def _myth_fields(record: Dict) -> Dict:
+    myth = {field: record[field] for field in MYTH_FIELDS if record.get(field) not in (None, '')}
+    if 'keywords' in myth:
+        myth['keywords'] = _parse_keywords(myth['keywords'])
+    return myth
+
+
+def read_jsonl(path: str, position: int = 0) -> Iterator[Tuple[int, Optional[Dict]]]:
+    """
+    Yield (resume position, record) pairs from a JSON Lines file. Positions are byte offsets.
+    Lines that are not JSON objects are reported and yielded as None.
+    """
+    with open(path, 'rb') as f:
+        f.seek(position)
+        for line in iter(f.readline, b''):
+            offset = f.tell()
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                record = e
+            if not isinstance(record, dict):
+                reason = record if isinstance(record, ValueError) else "not a JSON object"
+                print(f"\nSkipping line ending at byte {offset}: {reason}", file=sys.stderr)
+                yield offset, None
+                continue
+            yield offset, _myth_fields(record)
+
+
+def read_csv(path: str, position: int = 0) -> Iterator[Tuple[int, Dict]]:
+    """
+    Yield (resume position, record) pairs from a CSV file with a header row. Positions are row counts.
+    """
+    csv.field_size_limit(2 ** 31 - 1)
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        for row_number, row in enumerate(islice(csv.DictReader(f), position, None), position + 1):
+            yield row_number, _myth_fields(row)
+
+
+def read_parquet(path: str, position: int = 0) -> Iterator[Tuple[int, Dict]]:
+    """
+    Yield (resume position, record) pairs from a Parquet file, such as one written by export_myths.
+    Positions are row counts.
+    """
+    import pyarrow.parquet as pq
+    row_number = 0
+    for batch in pq.ParquetFile(path).iter_batches():
+        if row_number + batch.num_rows <= position:
+            row_number += batch.num_rows
+            continue
+        for row in batch.to_pylist():
+            row_number += 1
+            if row_number > position:
+                yield row_number, _myth_fields(row)
+
+
+def read_audio_dir(path: str, position: int = 0, voice_processor=None,
+                   language: Optional[str] = None, audio_store=None,
+                   transcription_batch_size: int = 8) -> Iterator[Tuple[int, Dict]]:
+    """
+    Transcribe each audio file in a directory and yield (resume position, record) pairs.
+    Recordings are kept in the AudioStore and linked with their transcript segments.
+    Files are transcribed `transcription_batch_size` at a time with VoiceProcessor.transcribe_batch.
+
+    A '<file>.json' sidecar next to a recording may supply place, region, language or image_path.
+    Positions are indexes into the sorted file list.
+    """
+    from audio_store import AudioStore
+    from voice_processor import TranscriptionError, VoiceProcessor
+    if voice_processor is None:
+        voice_processor = VoiceProcessor()
+    if audio_store is None:
+        audio_store = AudioStore()
+    files = sorted(name for name in os.listdir(path) if name.lower().endswith(AUDIO_EXTENSIONS))
+    for batch_start in range(position, len(files), transcription_batch_size):
+        names = files[batch_start:batch_start + transcription_batch_size]
+        clips, sidecars = [], []
+        for name in names:
+            file_path = os.path.join(path, name)
+            with open(file_path, 'rb') as f:
+                clips.append((f.read(), name))
+            metadata = {}
+            if os.path.exists(file_path + '.json'):
+                with open(file_path + '.json', encoding='utf-8') as f:
+                    metadata = _myth_fields(json.load(f))
+            sidecars.append(metadata)
+        # Clips whose language is known (flag, sidecar language or region) skip detection; one batch per language
+        by_language = {}
+        for clip_index, metadata in enumerate(sidecars):
+            hint = voice_processor.language_hint(language or metadata.get('language'), metadata.get('region'))
+            by_language.setdefault(hint, []).append(clip_index)
+        transcriptions = [None] * len(clips)
+        for hint, clip_indexes in by_language.items():
+            for clip_index, transcription in zip(clip_indexes, voice_processor.transcribe_batch(
+                    [clips[clip_index] for clip_index in clip_indexes], language=hint)):
+                transcriptions[clip_index] = transcription
+        for index, (audio_data, name), metadata, transcription in zip(range(batch_start + 1, len(files) + 1), clips,
+                                                                      sidecars, transcriptions):
+            if isinstance(transcription, TranscriptionError):
+                print(f"\nSkipping {name}: {transcription.message}", file=sys.stderr)
+                yield index, None
+                continue
+            record = {'original_text': transcription['text'],
+                      'language': language or transcription['language'],
+                      'audio_path': audio_store.save(audio_data, name),
+                      'segments': transcription['segments']}
+            record.update(metadata)
+            yield index, record
+
+
+def detect_format(path: str) -> str:
+    if os.path.isdir(path):
+        return 'audio'
+    extension = os.path.splitext(path)[1].lower()
+    formats = {'.jsonl': 'jsonl', '.ndjson': 'jsonl', '.csv': 'csv', '.parquet': 'parquet'}
+    if extension not in formats:
+        raise ValueError(f"Cannot infer format of {path}; pass --format")
+    return formats[extension]
+
+
+def default_checkpoint_path(db_path: str, source: str) -> str:
+    """
+    Checkpoint file for importing `source` into `db_path`, kept next to the database
+    (e.g., 'data/myths.db.corpus.jsonl.checkpoint.json').
+    """
+    return f"{os.path.abspath(db_path)}.{os.path.basename(os.path.abspath(source).rstrip(os.sep))}.checkpoint.json"
+
+
+def import_myths(db: MythDatabase, source: str, fmt: str = 'auto', batch_size: int = 500,
+                 checkpoint_path: Optional[str] = None, text_processor=None,
+                 language: Optional[str] = None, on_duplicate: str = 'keep') -> int:
+    """
+    Stream myths from a JSONL, CSV or Parquet file or a directory of recordings into the database.
+
+    Records are read, completed (translation, summary, keywords) and inserted one batch at a
+    time, so memory use depends on `batch_size`, not on the size of the input. Malformed records
+    (unparseable lines, no 'original_text', failed transcriptions) are reported, counted and
+    skipped; the checkpoint moves past them, so a resumed import never stops on them again.
+
+    Args:
+        db (MythDatabase): Target database.
+        source (str): Input file or directory.
+        fmt (str): 'jsonl', 'csv', 'parquet', 'audio' or 'auto' to infer from the path. Default is 'auto'.
+        batch_size (int): Myths per transaction. Default is 500.
+        checkpoint_path (Optional[str]): Where to record progress; an interrupted import into the
+            same database resumes from it (see default_checkpoint_path).
+        text_processor: TextProcessor used to fill missing fields. Default creates one.
+        language (Optional[str]): Language for records that don't specify one.
+        on_duplicate (str): 'keep' or 'skip' near-duplicates of stored myths (see MythDatabase.insert_myth).
+
+    Returns:
+        int: Number of myths processed by this run (including skipped duplicates).
+    """
+    if text_processor is None:
+        from text_processor import TextProcessor
+        text_processor = TextProcessor()
+    fmt = detect_format(source) if fmt == 'auto' else fmt
+    checkpoint = Checkpoint(checkpoint_path, source, db.db_path) if checkpoint_path else None
+    if checkpoint and checkpoint.complete:
+        print(f"{source} was already imported into {db.db_path} ({checkpoint.imported} myths); "
+              f"delete {checkpoint_path} to re-import", file=sys.stderr)
+        return 0
+    position = checkpoint.position if checkpoint else 0
+    imported = checkpoint.imported if checkpoint else 0
+
+    if fmt == 'jsonl':
+        records = read_jsonl(source, position)
+    elif fmt == 'csv':
+        records = read_csv(source, position)
+    elif fmt == 'parquet':
+        records = read_parquet(source, position)
+    elif fmt == 'audio':
+        records = read_audio_dir(source, position, language=language)
+    else:
+        raise ValueError(f"Unsupported import format: {fmt}")
+
+    progress = Progress('imported')
+    inserted = 0
+    malformed = 0
+    while True:
+        batch = list(islice(records, batch_size))
+        if not batch:
+            break
+        myths = [record for _, record in batch if record and record.get('original_text')]
+        malformed += len(batch) - len(myths)
+        for myth in myths:
+            myth.setdefault('language', language or 'en')
+        if myths:
+            db.insert_myths(text_processor.complete_myths(myths), on_duplicate=on_duplicate)
+        inserted += len(myths)
+        if checkpoint:
+            checkpoint.save(batch[-1][0], imported + inserted)
+        progress.update(len(myths))
+    progress.finish()
+    if malformed:
+        print(f"Skipped {malformed} malformed records", file=sys.stderr)
+    if checkpoint:
+        checkpoint.save(checkpoint.position, imported + inserted, complete=True)
+    return inserted
+
+
+def export_myths(db: MythDatabase, destination: str, fmt: str = 'auto', batch_size: int = 1000,
+                 after_id: int = 0) -> int:
+    """
+    Stream every myth to a JSONL or Parquet file in ID order.
+
+    Args:
+        db (MythDatabase): Source database.
+        destination (str): Output file path.
+        fmt (str): 'jsonl', 'parquet' or 'auto' to infer from the extension. Default is 'auto'.
+        batch_size (int): Rows read per query (and per Parquet row group). Default is 1000.
+        after_id (int): Only export myths with a larger ID, for incremental dumps. Default is 0.
+
+    Returns:
+        int: Number of myths written.
+    """
+    fmt = detect_format(destination) if fmt == 'auto' else fmt
+    myths = db.iter_myths(batch_size=batch_size, after_id=after_id)
+    progress = Progress('exported', total=db.count_myths() if not after_id else None)
+    tmp_path = destination + '.tmp'
+
+    if fmt == 'jsonl':
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for myth in myths:
+                f.write(json.dumps(myth, ensure_ascii=False) + '\n')
+                progress.update()
+    elif fmt == 'parquet':
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        schema = pa.schema([
+            ('id', pa.int64()), ('original_text', pa.string()), ('english_text', pa.string()),
+            ('summary', pa.string()), ('keywords', pa.list_(pa.string())), ('language', pa.string()),
+            ('place', pa.string()), ('region', pa.string()), ('image_path', pa.string()),
+            ('audio_path', pa.string()), ('created_at', pa.string()),
+        ])
+        with pq.ParquetWriter(tmp_path, schema, compression='zstd') as writer:
+            while True:
+                batch = list(islice(myths, batch_size))
+                if not batch:
+                    break
+                writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+                progress.update(len(batch))
+    else:
+        raise ValueError(f"Unsupported export format: {fmt}")
+
+    os.replace(tmp_path, destination)
+    progress.finish()
+    return progress.count
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Bulk import and export of the Voice-to-Myth database")
+    parser.add_argument('--db', default='data/myths.db', help="SQLite database path")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    import_parser = commands.add_parser('import', help="Load myths from JSONL, CSV, Parquet or a directory of recordings")
+    import_parser.add_argument('source')
+    import_parser.add_argument('--format', default='auto', choices=['auto', 'jsonl', 'csv', 'parquet', 'audio'])
+    import_parser.add_argument('--batch-size', type=int, default=500)
+    import_parser.add_argument('--checkpoint',
+                               help="Progress file for resuming (default: <db>.<source name>.checkpoint.json)")
+    import_parser.add_argument('--no-checkpoint', action='store_true')
+    import_parser.add_argument('--language', help="Language code for records that don't specify one")
+    import_parser.add_argument('--skip-duplicates', action='store_true',
+                               help="Don't store near-duplicates of myths already in the database")
+
+    export_parser = commands.add_parser('export', help="Dump myths to JSONL or Parquet")
+    export_parser.add_argument('destination')
+    export_parser.add_argument('--format', default='auto', choices=['auto', 'jsonl', 'parquet'])
+    export_parser.add_argument('--batch-size', type=int, default=1000)
+    export_parser.add_argument('--after-id', type=int, default=0, help="Only export myths with a larger ID")
+
+    commands.add_parser('rebuild-related', help="Recompute the related-myths graph with current term statistics")
+
+    args = parser.parse_args(argv)
+    db = MythDatabase(args.db)
+    if args.command == 'import':
+        checkpoint = None if args.no_checkpoint else (
+            args.checkpoint or default_checkpoint_path(args.db, args.source))
+        count = import_myths(db, args.source, args.format, args.batch_size, checkpoint, language=args.language,
+                             on_duplicate='skip' if args.skip_duplicates else 'keep')
+        print(f"Imported {count} myths into {args.db}")
+    elif args.command == 'export':
+        count = export_myths(db, args.destination, args.format, args.batch_size, args.after_id)
+        print(f"Exported {count} myths to {args.destination}")
+    else:
+        count = db.rebuild_related_myths()
+        print(f"Rebuilt related myths for {count} myths in {args.db}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,25 +1,80 @@
 import sqlite3
 import json
 import os
-from typing import List, Dict
+from bisect import bisect_right
+from typing import List, Dict, Iterable, Iterator, Optional, Tuple
+from tokenizer import TokenizedMyth, normalize
+from fuzzy_index import FuzzyIndex
+from passages import PassageIndex
+from near_duplicates import NearDuplicateIndex
+from related_myths import RelatedMythsIndex
+from spelling import SpellingIndex
+from myth_record import MythRecord, RecordLayout
+from tracing import traced
+
+FACET_COLUMNS = ('language', 'region', 'place')
+# Columns a list view needs before a story is opened
+SUMMARY_COLUMNS = ('id', 'summary', 'keywords', 'language', 'place', 'region', 'image_path', 'created_at')
+# Columns read into MythRecords; original_text and english_text load on demand
+RECORD_COLUMNS = SUMMARY_COLUMNS + ('audio_path',)
+# Derived indexes tracked in index_state, in the order they are backfilled
+INDEX_NAMES = ('fuzzy', 'passages', 'duplicates', 'related', 'spelling', 'facets')
+
+
+def build_search_doc(myth_data: Dict) -> str:
+    """
+    Build the pre-normalized search document for a myth: all searchable text joined and folded once.
+    
+    Args:
+        myth_data (Dict): Myth fields; 'keywords' is a list of strings.
+    
+    Returns:
+        str: The normalized search document stored in the 'search_doc' column.
+    """
+    return normalize(' '.join([
+        myth_data.get('original_text') or '',
+        myth_data.get('english_text') or '',
+        myth_data.get('summary') or '',
+        ' '.join(myth_data.get('keywords') or [])
+    ]))
 
 class MythDatabase:
-    def __init__(self, db_path: str = "data/myths.db"):
+    def __init__(self, db_path: str = "data/myths.db", backfill: bool = True):
         """
         Initialize the MythDatabase with a specified database path.
         
         Args:
             db_path (str): Path to the SQLite database file. Default is 'data/myths.db'.
+            backfill (bool): Bring derived indexes up to date with stored myths now. Pass False to
+                leave that to backfill_indexes() (e.g., in a background thread once the UI is up).
+                Default is True.
         """
         self.db_path = db_path
-        os.makedirs(os.path.dirname(db_path), exist_ok=True)
-        self.init_database()
+        self.fuzzy_index = FuzzyIndex()
+        self.passage_index = PassageIndex()
+        self.duplicate_index = NearDuplicateIndex()
+        self.related_index = RelatedMythsIndex()
+        self.spelling_index = SpellingIndex()
+        self._facet_cache = None
+        os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+        self.init_database(backfill)
     
-    def init_database(self):
+    def _connect(self) -> sqlite3.Connection:
         """
-        Initialize the database with the myths table if it doesn't exist.
+        Open a connection with the shared tokenizer's NORMALIZE() registered as an SQL function,
+        so stored text and query terms are folded identically (SQL LOWER() only folds ASCII).
         """
         conn = sqlite3.connect(self.db_path)
+        conn.create_function('NORMALIZE', 1, normalize, deterministic=True)
+        return conn
+    
+    def init_database(self, backfill: bool = True):
+        """
+        Initialize the database with the myths table and derived indexes if they don't exist,
+        and (unless `backfill` is False) backfill derived indexes for rows stored before those
+        indexes existed.
+        """
+        conn = self._connect()
         cursor = conn.cursor()
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS myths (
@@ -32,96 +87,868 @@ class MythDatabase:
                 place TEXT,
                 region TEXT,
                 image_path TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                search_doc TEXT,
+                audio_path TEXT DEFAULT ''
             )
         ''')
+        if 'search_doc' not in {row[1] for row in cursor.execute('PRAGMA table_info(myths)')}:
+            cursor.execute('ALTER TABLE myths ADD COLUMN search_doc TEXT')
+        if 'audio_path' not in {row[1] for row in cursor.execute('PRAGMA table_info(myths)')}:
+            cursor.execute("ALTER TABLE myths ADD COLUMN audio_path TEXT DEFAULT ''")
+        # Transcript segments: when each stretch of original_text was spoken in the source recording
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS myth_segments (
+                myth_id INTEGER NOT NULL,
+                segment_no INTEGER NOT NULL,
+                start_ms INTEGER NOT NULL,
+                end_ms INTEGER NOT NULL,
+                text_start INTEGER NOT NULL,
+                text_end INTEGER NOT NULL,
+                PRIMARY KEY (myth_id, segment_no)
+            ) WITHOUT ROWID
+        ''')
+        # Watermarks recording the last myth ID each derived index has processed
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS index_state (
+                name TEXT PRIMARY KEY,
+                last_myth_id INTEGER NOT NULL DEFAULT 0
+            )
+        ''')
+        # Composite indexes serve every facet filter combination with a prefix match
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_myths_language_region_place ON myths(language, region, place)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_myths_region_place ON myths(region, place)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_myths_place ON myths(place)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_myths_created_at ON myths(created_at)')
+        # Per-value row counts, kept current by insert_myth so facet counts never aggregate the myths table
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS facet_counts (
+                facet TEXT NOT NULL,
+                value TEXT NOT NULL,
+                count INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (facet, value)
+            ) WITHOUT ROWID
+        ''')
+        # Version counters that let in-memory caches of aggregates detect changes with one lookup
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS cache_versions (
+                name TEXT PRIMARY KEY,
+                version INTEGER NOT NULL DEFAULT 0
+            )
+        ''')
+        self.fuzzy_index.init_schema(cursor)
+        self.passage_index.init_schema(cursor)
+        self.duplicate_index.init_schema(cursor)
+        self.related_index.init_schema(cursor)
+        self.spelling_index.init_schema(cursor)
+        cursor.executemany('INSERT OR IGNORE INTO index_state (name, last_myth_id) VALUES (?, 0)',
+                           [(name,) for name in INDEX_NAMES])
         conn.commit()
         conn.close()
+        if backfill:
+            self.backfill_indexes()
     
-    def insert_myth(self, myth_data: Dict) -> int:
+    def backfill_indexes(self, batch_size: int = 200):
         """
-        Insert a new myth into the database.
+        Fill 'search_doc' and derived indexes for myths stored before they existed.
         
-        Args:
-            myth_data (Dict): Dictionary containing myth details.
+        Work is committed every `batch_size` myths, so inserts from other threads wait for at
+        most one batch. Until an index has caught up, inserts leave it to this backfill (see
+        _index_new_myth); searches meanwhile miss the myths it has not reached yet.
         
-        Returns:
-            int: The ID of the inserted myth.
+        Args:
+            batch_size (int): Myths processed per transaction. Default is 200.
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        indexers = {
+            'fuzzy': self.fuzzy_index.index_myth,
+            'passages': self.passage_index.index_myth,
+            'duplicates': self.duplicate_index.index_myth,
+            'related': self.related_index.index_myth,
+            'spelling': self.spelling_index.index_myth,
+            'facets': self._count_facets,
+        }
+        conn = self._connect()
+        try:
+            cursor = conn.cursor()
+            self._migrate_search_doc(cursor, batch_size)
+            for name in INDEX_NAMES:
+                self._backfill(cursor, name, indexers[name], batch_size)
+        finally:
+            conn.close()
+    
+    def _migrate_search_doc(self, cursor: sqlite3.Cursor, batch_size: int = 500):
+        """
+        Fill 'search_doc' for rows stored before the column existed, committing per batch.
+        """
+        while True:
+            rows = cursor.execute('''
+                SELECT id, original_text, english_text, summary, keywords FROM myths
+                WHERE search_doc IS NULL LIMIT ?
+            ''', (batch_size,)).fetchall()
+            if not rows:
+                break
+            cursor.executemany('UPDATE myths SET search_doc = ? WHERE id = ?', [
+                (build_search_doc({
+                    'original_text': original_text, 'english_text': english_text, 'summary': summary,
+                    'keywords': json.loads(keywords or '[]')
+                }), myth_id)
+                for myth_id, original_text, english_text, summary, keywords in rows
+            ])
+            cursor.connection.commit()
+    
+    def _backfill(self, cursor: sqlite3.Cursor, name: str, index_fn, batch_size: int = 200):
+        """
+        Run `index_fn(cursor, myth_id, myth)` over myths newer than the index's watermark,
+        committing each batch together with the advanced watermark.
+        """
+        while True:
+            last_id = cursor.execute('SELECT last_myth_id FROM index_state WHERE name = ?', (name,)).fetchone()[0]
+            rows = cursor.execute('SELECT * FROM myths WHERE id > ? ORDER BY id LIMIT ?', (last_id, batch_size))
+            columns = [desc[0] for desc in rows.description]
+            pending = [dict(zip(columns, row)) for row in rows.fetchall()]
+            if not pending:
+                break
+            for myth in pending:
+                myth['keywords'] = json.loads(myth['keywords'] or '[]')
+                index_fn(cursor, myth['id'], myth)
+            cursor.execute('UPDATE index_state SET last_myth_id = ? WHERE name = ?', (pending[-1]['id'], name))
+            cursor.connection.commit()
+    
+    def _count_facets(self, cursor: sqlite3.Cursor, myth_id: int, myth_data: Dict, delta: int = 1):
+        """
+        Adjust the facet_counts aggregate for one myth.
+        """
+        for facet in FACET_COLUMNS:
+            cursor.execute('''
+                INSERT INTO facet_counts (facet, value, count) VALUES (?, ?, ?)
+                ON CONFLICT(facet, value) DO UPDATE SET count = count + excluded.count
+            ''', (facet, myth_data.get(facet) or '', delta))
+        self._bump_version(cursor, 'facets')
+    
+    @staticmethod
+    def _bump_version(cursor: sqlite3.Cursor, name: str):
         cursor.execute('''
-            INSERT INTO myths (original_text, english_text, summary, keywords, 
-                             language, place, region, image_path)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
+            INSERT INTO cache_versions (name, version) VALUES (?, 1)
+            ON CONFLICT(name) DO UPDATE SET version = version + 1
+        ''', (name,))
+    
+    def _index_new_myth(self, cursor: sqlite3.Cursor, myth_id: int, myth_data: Dict,
+                        tokens: Optional[TokenizedMyth] = None):
+        """
+        Update derived indexes for a freshly inserted myth inside the insert's transaction.
+        The myth's texts are tokenized once and the tokens shared by every index.
+        
+        An index whose backfill has not reached the myths before this one is skipped (and its
+        watermark left alone), so the backfill indexes this myth exactly once when it gets there.
+        """
+        tokens = tokens or TokenizedMyth(myth_data)
+        current = {name for (name,) in cursor.execute('''
+            SELECT name FROM index_state
+            WHERE NOT EXISTS (SELECT 1 FROM myths WHERE id > index_state.last_myth_id AND id < ?)
+        ''', (myth_id,))}
+        if 'fuzzy' in current:
+            self.fuzzy_index.index_myth(cursor, myth_id, myth_data, tokens)
+        if 'passages' in current:
+            self.passage_index.index_myth(cursor, myth_id, myth_data, tokens)
+        if 'duplicates' in current:
+            self.duplicate_index.index_myth(cursor, myth_id, myth_data, tokens)
+        if 'related' in current:
+            self.related_index.index_myth(cursor, myth_id, myth_data, tokens)
+        if 'spelling' in current:
+            self.spelling_index.index_myth(cursor, myth_id, myth_data, tokens)
+        if 'facets' in current:
+            self._count_facets(cursor, myth_id, myth_data)
+        cursor.executemany('UPDATE index_state SET last_myth_id = MAX(last_myth_id, ?) WHERE name = ?',
+                           [(myth_id, name) for name in current])
+    
+    def _unindex_myth(self, cursor: sqlite3.Cursor, myth_id: int, myth_data: Dict):
+        """
+        Remove a myth's contributions to derived indexes before it is updated or deleted.
+        Indexes whose backfill has not reached the myth yet hold nothing for it and are skipped.
+        """
+        indexed = {name for (name,) in cursor.execute(
+            'SELECT name FROM index_state WHERE last_myth_id >= ?', (myth_id,))}
+        tokens = TokenizedMyth(myth_data)
+        if 'fuzzy' in indexed:
+            self.fuzzy_index.remove_myth(cursor, myth_id)
+        if 'passages' in indexed:
+            self.passage_index.remove_myth(cursor, myth_id)
+        if 'duplicates' in indexed:
+            self.duplicate_index.remove_myth(cursor, myth_id)
+        if 'related' in indexed:
+            self.related_index.remove_myth(cursor, myth_id, myth_data, tokens)
+        if 'spelling' in indexed:
+            self.spelling_index.remove_myth(cursor, myth_id, myth_data, tokens)
+        if 'facets' in indexed:
+            self._count_facets(cursor, myth_id, myth_data, delta=-1)
+    
+    @staticmethod
+    def _store_segments(cursor: sqlite3.Cursor, myth_id: int, segments: List[Dict], text: str):
+        """
+        Replace a myth's transcript segments. Each segment's text is located in `text` (the
+        transcription stored as original_text) by scanning forward from the previous segment,
+        so only character offsets are stored, not the segment text.
+        """
+        cursor.execute('DELETE FROM myth_segments WHERE myth_id = ?', (myth_id,))
+        rows = []
+        position = 0
+        for segment_no, segment in enumerate(segments or []):
+            segment_text = (segment.get('text') or '').strip()
+            start = text.find(segment_text, position) if segment_text else -1
+            if start < 0:
+                start = position
+            end = max(start + len(segment_text), position) if segment_text else start
+            end = min(end, len(text))
+            rows.append((myth_id, segment_no, int(segment['start'] * 1000), int(segment['end'] * 1000), start, end))
+            position = end
+        cursor.executemany('''
+            INSERT INTO myth_segments (myth_id, segment_no, start_ms, end_ms, text_start, text_end)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', rows)
+    
+    def _insert_row(self, cursor: sqlite3.Cursor, myth_data: Dict, on_duplicate: str = 'keep') -> int:
+        """
+        Insert one myth and index it using the caller's cursor (and transaction).
+        
+        With on_duplicate='skip', a myth that near-duplicates a stored one is not inserted and
+        the ID of the most similar stored myth is returned instead.
+        
+        An explicit 'created_at' is kept, so exported myths keep their timestamps when re-imported;
+        an explicit 'id' is used instead of the next autoincrement value.
+        Optional 'audio_path' (see AudioStore) and 'segments' (transcription segments with 'start'
+        and 'end' in seconds and 'text') link the text to its recording.
+        """
+        columns = ['original_text', 'english_text', 'summary', 'keywords',
+                   'language', 'place', 'region', 'image_path', 'audio_path', 'search_doc']
+        if on_duplicate not in ('keep', 'skip'):
+            raise ValueError(f"on_duplicate must be 'keep' or 'skip', not {on_duplicate!r}")
+        tokens = TokenizedMyth(myth_data)
+        if on_duplicate == 'skip':
+            duplicates = self.duplicate_index.find_duplicates(cursor, myth_data, tokens)
+            if duplicates:
+                return duplicates[0]['id']
+        values = [
             myth_data['original_text'],
             myth_data['english_text'],
             myth_data['summary'],
-            json.dumps(myth_data['keywords']),
+            json.dumps(myth_data['keywords'], ensure_ascii=False),
             myth_data['language'],
             myth_data.get('place', ''),
             myth_data.get('region', ''),
-            myth_data.get('image_path', '')
-        ))
+            myth_data.get('image_path', ''),
+            myth_data.get('audio_path') or '',
+            build_search_doc(myth_data)
+        ]
+        if myth_data.get('created_at'):
+            columns.append('created_at')
+            values.append(myth_data['created_at'])
+        if myth_data.get('id'):
+            # Callers that allocate IDs themselves (ShardedMythDatabase) pass them in
+            columns.append('id')
+            values.append(myth_data['id'])
+        cursor.execute(f'''
+            INSERT INTO myths ({', '.join(columns)})
+            VALUES ({', '.join('?' * len(columns))})
+        ''', values)
         myth_id = cursor.lastrowid
+        if myth_data.get('segments'):
+            self._store_segments(cursor, myth_id, myth_data['segments'], myth_data['original_text'])
+        self._index_new_myth(cursor, myth_id, myth_data, tokens)
+        return myth_id
+    
+    @traced()
+    def insert_myth(self, myth_data: Dict, on_duplicate: str = 'keep') -> int:
+        """
+        Insert a new myth into the database.
+        
+        Every myth is checked against the near-duplicate index (LSH buckets, not the whole
+        corpus); duplicates join the cluster of the myth they repeat.
+        
+        Args:
+            myth_data (Dict): Dictionary containing myth details.
+            on_duplicate (str): 'keep' stores near-duplicates too (clustered with the original);
+                'skip' stores nothing and returns the existing myth's ID. Default is 'keep'.
+        
+        Returns:
+            int: The ID of the inserted myth (or of the existing duplicate when skipped).
+        """
+        conn = self._connect()
+        cursor = conn.cursor()
+        myth_id = self._insert_row(cursor, myth_data, on_duplicate)
         conn.commit()
         conn.close()
         return myth_id
     
-    def search_myths(self, query_keywords: List[str]) -> List[Dict]:
+    @traced()
+    def insert_myths(self, myths: Iterable[Dict], on_duplicate: str = 'keep') -> List[int]:
         """
-        Search myths based on a list of keywords.
+        Insert several myths in a single transaction.
+        
+        Bulk loads should call this with batches of a few hundred rows: one commit per batch
+        instead of one per myth.
+        
+        Args:
+            myths (Iterable[Dict]): Myth dictionaries as accepted by insert_myth.
+            on_duplicate (str): 'keep' or 'skip', as in insert_myth. Default is 'keep'.
+        
+        Returns:
+            List[int]: IDs of the inserted myths, in input order.
+        """
+        conn = self._connect()
+        try:
+            cursor = conn.cursor()
+            myth_ids = [self._insert_row(cursor, myth_data, on_duplicate) for myth_data in myths]
+            conn.commit()
+            return myth_ids
+        finally:
+            conn.close()
+    
+    def update_myth(self, myth_id: int, updates: Dict) -> bool:
+        """
+        Update fields of an existing myth and refresh its derived index entries.
+        
+        Args:
+            myth_id (int): The ID of the myth to update.
+            updates (Dict): Fields to change (any of the columns accepted by insert_myth, plus
+                'segments'). Changing 'original_text' without new 'segments' drops the stored
+                segments, since their offsets no longer apply.
+        
+        Returns:
+            bool: True if the myth existed and was updated.
+        """
+        editable = ('original_text', 'english_text', 'summary', 'keywords',
+                    'language', 'place', 'region', 'image_path', 'audio_path')
+        changes = {key: value for key, value in updates.items() if key in editable}
+        conn = self._connect()
+        cursor = conn.cursor()
+        try:
+            old = self._fetch_for_update(cursor, myth_id)
+            if old is None:
+                return False
+            new = dict(old, **changes)
+            self._unindex_myth(cursor, myth_id, old)
+            cursor.execute('''
+                UPDATE myths SET original_text = ?, english_text = ?, summary = ?, keywords = ?,
+                                 language = ?, place = ?, region = ?, image_path = ?, audio_path = ?,
+                                 search_doc = ?
+                WHERE id = ?
+            ''', (
+                new['original_text'], new['english_text'], new['summary'],
+                json.dumps(new['keywords'], ensure_ascii=False), new['language'],
+                new['place'], new['region'], new['image_path'], new['audio_path'] or '',
+                build_search_doc(new), myth_id
+            ))
+            if 'segments' in updates:
+                self._store_segments(cursor, myth_id, updates['segments'], new['original_text'])
+            elif new['original_text'] != old['original_text']:
+                cursor.execute('DELETE FROM myth_segments WHERE myth_id = ?', (myth_id,))
+            self._index_new_myth(cursor, myth_id, new)
+            conn.commit()
+            return True
+        finally:
+            conn.close()
+    
+    def delete_myth(self, myth_id: int) -> bool:
+        """
+        Delete a myth and its derived index entries.
+        
+        Args:
+            myth_id (int): The ID of the myth to delete.
+        
+        Returns:
+            bool: True if the myth existed and was deleted.
+        """
+        conn = self._connect()
+        cursor = conn.cursor()
+        try:
+            old = self._fetch_for_update(cursor, myth_id)
+            if old is None:
+                return False
+            self._unindex_myth(cursor, myth_id, old)
+            cursor.execute('DELETE FROM myth_segments WHERE myth_id = ?', (myth_id,))
+            cursor.execute('DELETE FROM myths WHERE id = ?', (myth_id,))
+            conn.commit()
+            return True
+        finally:
+            conn.close()
+    
+    @staticmethod
+    def _fetch_for_update(cursor: sqlite3.Cursor, myth_id: int) -> Optional[Dict]:
+        rows = cursor.execute('SELECT * FROM myths WHERE id = ?', (myth_id,))
+        columns = [desc[0] for desc in rows.description]
+        row = rows.fetchone()
+        if row is None:
+            return None
+        myth = dict(zip(columns, row))
+        myth['keywords'] = json.loads(myth['keywords'] or '[]')
+        return myth
+    
+    @staticmethod
+    def _facet_filter(language: Optional[str] = None, region: Optional[str] = None,
+                      place: Optional[str] = None) -> Tuple[List[str], List[str]]:
+        """
+        Build equality conditions for the selected facets, in composite-index column order.
+        """
+        conditions, params = [], []
+        for column, value in zip(FACET_COLUMNS, (language, region, place)):
+            if value is not None:
+                conditions.append(f'{column} = ?')
+                params.append(value)
+        return conditions, params
+    
+    @traced()
+    def search_myths(self, query_keywords: List[str], language: Optional[str] = None,
+                     region: Optional[str] = None, place: Optional[str] = None) -> List[Dict]:
+        """
+        Search myths based on a list of keywords, optionally restricted to facet values.
         
         Args:
             query_keywords (List[str]): List of keywords to search for.
+            language (Optional[str]): Only return myths in this language.
+            region (Optional[str]): Only return myths from this region.
+            place (Optional[str]): Only return myths from this place.
         
         Returns:
-            List[Dict]: List of matching myth dictionaries.
+            List[Dict]: Matching myths as MythRecords (see get_all_myths), each with 'keyword_hits':
+                how many of the keywords its search document contains.
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
+        facet_conditions, facet_params = self._facet_filter(language, region, place)
         search_conditions = []
-        params = []
+        search_params = []
         for keyword in query_keywords:
-            search_conditions.append('''
-                (LOWER(original_text) LIKE ? OR 
-                 LOWER(english_text) LIKE ? OR 
-                 LOWER(summary) LIKE ? OR 
-                 LOWER(keywords) LIKE ?)
-            ''')
-            params.extend([f'%{keyword.lower()}%'] * 4)
+            search_conditions.append('search_doc LIKE ?')
+            search_params.append(f'%{normalize(keyword)}%')
+        # Facet equality is evaluated first so the composite index narrows the rows LIKE has to read
+        where = facet_conditions + ([f"({' OR '.join(search_conditions)})"] if search_conditions else [])
+        # Keyword hits are counted here, so the search document never leaves SQLite
         query = f'''
-            SELECT * FROM myths 
-            WHERE {' OR '.join(search_conditions)}
+            SELECT {', '.join(RECORD_COLUMNS)}, {' + '.join(f'({condition})' for condition in search_conditions) or '0'} AS keyword_hits
+            FROM myths
+            WHERE {' AND '.join(where) or '1'}
             ORDER BY created_at DESC
         '''
-        cursor.execute(query, params)
-        rows = cursor.fetchall()
-        columns = [desc[0] for desc in cursor.description]
-        results = [dict(zip(columns, row)) for row in rows]
-        for result in results:
-            result['keywords'] = json.loads(result['keywords'])
+        cursor.execute(query, search_params + facet_params + search_params)
+        results = self._records(cursor, RECORD_COLUMNS + ('keyword_hits',))
         conn.close()
         return results
     
-    def get_all_myths(self) -> List[Dict]:
+    def _load_texts(self, myth_ids: List[int]) -> Dict[int, Tuple[str, str]]:
+        """
+        Read original_text and english_text for MythRecords (their lazy fields).
+        """
+        conn = self._connect()
+        texts = {}
+        for chunk_start in range(0, len(myth_ids), 500):
+            chunk = myth_ids[chunk_start:chunk_start + 500]
+            texts.update((row[0], row[1:]) for row in conn.execute(
+                f'SELECT id, original_text, english_text FROM myths WHERE id IN ({",".join("?" * len(chunk))})', chunk))
+        conn.close()
+        return texts
+    
+    def _records(self, cursor: sqlite3.Cursor, columns: Tuple[str, ...]) -> List[MythRecord]:
+        """
+        Wrap the cursor's remaining rows in MythRecords sharing one layout.
+        """
+        layout = RecordLayout(columns, self._load_texts)
+        return [MythRecord(layout, row) for row in cursor.fetchall()]
+    
+    @traced()
+    def fuzzy_lookup(self, tokens: Iterable[str]) -> Dict[int, set]:
         """
-        Retrieve all myths from the database.
+        Find myths whose keywords, places or names are spelled similarly to, or sound like, the tokens.
+        
+        Args:
+            tokens (Iterable[str]): Normalized query tokens.
         
         Returns:
-            List[Dict]: List of all myth dictionaries.
+            Dict[int, set]: Mapping from myth ID to the indexed terms that matched.
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
+        hits = self.fuzzy_index.lookup(conn.cursor(), tokens)
+        conn.close()
+        return hits
+    
+    @traced()
+    def best_passages(self, myth_ids: Iterable[int], tokens: Iterable[str]) -> Dict[int, Dict]:
+        """
+        Find the best-matching passage of each myth, with highlight offsets from the stored token positions.
+        
+        Args:
+            myth_ids (Iterable[int]): Myths to look at.
+            tokens (Iterable[str]): Normalized query tokens.
+        
+        Returns:
+            Dict[int, Dict]: Mapping from myth ID to its best passage (see PassageIndex.best_passages).
+        """
+        conn = self._connect()
+        passages = self.passage_index.best_passages(conn.cursor(), myth_ids, tokens)
+        conn.close()
+        return passages
+    
+    @traced()
+    def spelling_suggestions(self, tokens: Iterable[str]) -> Dict[str, List[Tuple[str, int, int]]]:
+        """
+        Look up spelling corrections for query tokens in the corpus vocabulary.
+        
+        Args:
+            tokens (Iterable[str]): Normalized query tokens.
+        
+        Returns:
+            Dict[str, List[Tuple[str, int, int]]]: token -> [(word, edit distance, corpus count)], best
+                first; a word in the vocabulary maps to itself at distance 0.
+        """
+        conn = self._connect()
+        suggestions = self.spelling_index.suggest(conn.cursor(), tokens)
+        conn.close()
+        return suggestions
+    
+    @traced()
+    def find_near_duplicates(self, myth_data: Dict) -> List[Dict]:
+        """
+        Find stored myths that are near-duplicates of a myth that may not be stored yet.
+        
+        Args:
+            myth_data (Dict): Myth fields; 'english_text' (or 'original_text') is compared.
+        
+        Returns:
+            List[Dict]: {'id', 'similarity' (estimated Jaccard), 'cluster_id'}, most similar first.
+        """
+        conn = self._connect()
+        duplicates = self.duplicate_index.find_duplicates(conn.cursor(), myth_data)
+        conn.close()
+        return duplicates
+    
+    def match_signatures(self, signatures: Iterable) -> List[List[Dict]]:
+        """
+        Find near-duplicates of several precomputed MinHash signatures (see
+        NearDuplicateIndex.myth_signature) over one connection.
+        
+        Returns:
+            List[List[Dict]]: For each signature, duplicates as in find_near_duplicates (none for a
+                None signature).
+        """
+        conn = self._connect()
+        try:
+            cursor = conn.cursor()
+            return [self.duplicate_index.find_duplicates(cursor, None, signature=signature) if signature is not None
+                    else [] for signature in signatures]
+        finally:
+            conn.close()
+    
+    def get_duplicate_clusters(self, myth_ids: Iterable[int]) -> Dict[int, int]:
+        """
+        Map myth IDs to their duplicate cluster (the ID of the cluster's first myth).
+        """
+        conn = self._connect()
+        clusters = self.duplicate_index.clusters(conn.cursor(), myth_ids)
+        conn.close()
+        return clusters
+    
+    def get_related_myths(self, myth_id: int) -> List[Dict]:
+        """
+        Retrieve the precomputed nearest neighbours of a myth: one indexed read of the graph, no
+        similarity computation at query time.
+        
+        Args:
+            myth_id (int): The myth's ID.
+        
+        Returns:
+            List[Dict]: Summary fields (SUMMARY_COLUMNS) of the related myths plus 'similarity', most similar first.
+        """
+        conn = self._connect()
+        rows = conn.execute(f'''
+            SELECT {', '.join('m.' + column for column in SUMMARY_COLUMNS)}, r.score
+            FROM related_myths r JOIN myths m ON m.id = r.related_id
+            WHERE r.myth_id = ? ORDER BY r.score DESC
+        ''', (myth_id,)).fetchall()
+        conn.close()
+        related = []
+        for row in rows:
+            myth = dict(zip(SUMMARY_COLUMNS, row))
+            myth['keywords'] = json.loads(myth['keywords'] or '[]')
+            myth['similarity'] = row[-1]
+            related.append(myth)
+        return related
+    
+    def rebuild_related_myths(self) -> int:
+        """
+        Recompute the related-myths graph from scratch with current term statistics (offline batch job).
+        
+        Returns:
+            int: Number of myths in the rebuilt graph.
+        """
+        conn = self._connect()
+        try:
+            cursor = conn.cursor()
+            
+            def myths():
+                # Keyset batches on the same connection, so reads see this transaction's state
+                last_id = 0
+                while True:
+                    rows = conn.execute('''
+                        SELECT id, original_text, english_text, keywords FROM myths
+                        WHERE id > ? ORDER BY id LIMIT 1000
+                    ''', (last_id,)).fetchall()
+                    if not rows:
+                        return
+                    for myth_id, original_text, english_text, keywords in rows:
+                        yield myth_id, {'original_text': original_text, 'english_text': english_text,
+                                        'keywords': json.loads(keywords or '[]')}
+                    last_id = rows[-1][0]
+            
+            self.related_index.rebuild(cursor, myths)
+            cursor.execute('INSERT OR IGNORE INTO index_state (name, last_myth_id) VALUES (?, 0)', ('related',))
+            cursor.execute('''
+                UPDATE index_state SET last_myth_id = (SELECT COALESCE(MAX(id), 0) FROM myths) WHERE name = ?
+            ''', ('related',))
+            conn.commit()
+            return cursor.execute('SELECT COUNT(*) FROM myths').fetchone()[0]
+        finally:
+            conn.close()
+    
+    def get_segments(self, myth_id: int) -> List[Dict]:
+        """
+        Retrieve a myth's transcript segments in order.
+        
+        Args:
+            myth_id (int): The myth's ID.
+        
+        Returns:
+            List[Dict]: Segments with 'start_ms', 'end_ms', 'text_start' and 'text_end'
+                (character offsets into original_text).
+        """
+        conn = self._connect()
+        rows = conn.execute('''
+            SELECT start_ms, end_ms, text_start, text_end FROM myth_segments
+            WHERE myth_id = ? ORDER BY segment_no
+        ''', (myth_id,)).fetchall()
+        conn.close()
+        return [{'start_ms': start_ms, 'end_ms': end_ms, 'text_start': text_start, 'text_end': text_end}
+                for start_ms, end_ms, text_start, text_end in rows]
+    
+    @traced()
+    def locate_segments(self, offsets: Dict[int, int]) -> Dict[int, Dict]:
+        """
+        Find, for each myth, the transcript segment containing a character offset of original_text.
+        
+        Args:
+            offsets (Dict[int, int]): myth_id -> character offset (e.g., the first highlighted match).
+        
+        Returns:
+            Dict[int, Dict]: myth_id -> {'start_ms', 'end_ms'}. Myths without segments are omitted.
+        """
+        myth_ids = list(offsets)
+        rows_by_myth: Dict[int, List[Tuple[int, int, int]]] = {}
+        conn = self._connect()
+        for chunk_start in range(0, len(myth_ids), 500):
+            chunk = myth_ids[chunk_start:chunk_start + 500]
+            for myth_id, start_ms, end_ms, text_end in conn.execute(f'''
+                SELECT myth_id, start_ms, end_ms, text_end FROM myth_segments
+                WHERE myth_id IN ({",".join("?" * len(chunk))}) ORDER BY myth_id, segment_no
+            ''', chunk):
+                rows_by_myth.setdefault(myth_id, []).append((text_end, start_ms, end_ms))
+        conn.close()
+        segments = {}
+        for myth_id, rows in rows_by_myth.items():
+            # Segments are stored in text order, so the first one ending after the offset contains it
+            position = bisect_right([text_end for text_end, _, _ in rows], offsets[myth_id])
+            if position < len(rows):
+                segments[myth_id] = {'start_ms': rows[position][1], 'end_ms': rows[position][2]}
+        return segments
+    
+    def get_myths_by_ids(self, myth_ids: Iterable[int], language: Optional[str] = None,
+                         region: Optional[str] = None, place: Optional[str] = None) -> List[Dict]:
+        """
+        Retrieve myths by ID, optionally restricted to facet values.
+        
+        Args:
+            myth_ids (Iterable[int]): IDs to fetch.
+            language (Optional[str]): Only return myths in this language.
+            region (Optional[str]): Only return myths from this region.
+            place (Optional[str]): Only return myths from this place.
+        
+        Returns:
+            List[Dict]: Matching myths as MythRecords (see get_all_myths), newest first.
+        """
+        myth_ids = list(myth_ids)
+        if not myth_ids:
+            return []
+        conn = self._connect()
+        conditions, params = self._facet_filter(language, region, place)
+        rows = []
+        # Fuzzy hits for a common name can exceed SQLite's bound-variable limit
+        for chunk_start in range(0, len(myth_ids), 500):
+            chunk = myth_ids[chunk_start:chunk_start + 500]
+            rows.extend(conn.execute(f'''
+                SELECT {', '.join(RECORD_COLUMNS)} FROM myths
+                WHERE {" AND ".join(conditions + [f'id IN ({",".join("?" * len(chunk))})'])}
+            ''', params + chunk))
+        conn.close()
+        created_at = RECORD_COLUMNS.index('created_at')
+        rows.sort(key=lambda row: row[created_at] or '', reverse=True)
+        layout = RecordLayout(RECORD_COLUMNS, self._load_texts)
+        return [MythRecord(layout, row) for row in rows]
+    
+    def get_all_myths(self, language: Optional[str] = None, region: Optional[str] = None,
+                      place: Optional[str] = None) -> List[Dict]:
+        """
+        Retrieve all myths from the database, optionally restricted to facet values.
+        
+        Args:
+            language (Optional[str]): Only return myths in this language.
+            region (Optional[str]): Only return myths from this region.
+            place (Optional[str]): Only return myths from this place.
+        
+        Returns:
+            List[Dict]: Myths as MythRecords: read-only-row mappings whose 'keywords' are decoded on
+                first use and whose 'original_text'/'english_text' are read from the database only
+                when accessed (myth_record.load_texts fetches them for a whole list at once). Keys
+                can be set like on a dict; MythRecord.to_dict() gives a plain copy.
+        """
+        conn = self._connect()
+        cursor = conn.cursor()
+        conditions, params = self._facet_filter(language, region, place)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+        cursor.execute(f'SELECT {", ".join(RECORD_COLUMNS)} FROM myths {where} ORDER BY created_at DESC', params)
+        results = self._records(cursor, RECORD_COLUMNS)
+        conn.close()
+        return results
+
+    def iter_myths(self, batch_size: int = 1000, after_id: int = 0) -> Iterator[Dict]:
+        """
+        Stream every myth in ID order, reading `batch_size` rows at a time.
+        
+        Each batch is a fresh keyset query (id > last seen), so memory stays bounded and no
+        read transaction is held open while the caller processes rows.
+        
+        Args:
+            batch_size (int): Rows fetched per query. Default is 1000.
+            after_id (int): Only yield myths with a larger ID. Default is 0 (all myths).
+        
+        Yields:
+            Dict: Myth dictionaries with all fields except 'search_doc'.
+        """
+        columns = ('id', 'original_text', 'english_text') + SUMMARY_COLUMNS[1:] + ('audio_path',)
+        last_id = after_id
+        while True:
+            conn = self._connect()
+            rows = conn.execute(f'''
+                SELECT {', '.join(columns)} FROM myths WHERE id > ? ORDER BY id LIMIT ?
+            ''', (last_id, batch_size)).fetchall()
+            conn.close()
+            if not rows:
+                return
+            for row in rows:
+                myth = dict(zip(columns, row))
+                myth['keywords'] = json.loads(myth['keywords'] or '[]')
+                yield myth
+            last_id = rows[-1][0]
+
+    def get_myths_page(self, limit: int, offset: int = 0, language: Optional[str] = None,
+                       region: Optional[str] = None, place: Optional[str] = None) -> List[Dict]:
+        """
+        Retrieve one page of myths, newest first, with only the fields a list view shows.
+        
+        Args:
+            limit (int): Page size.
+            offset (int): Number of myths to skip. Default is 0.
+            language (Optional[str]): Only return myths in this language.
+            region (Optional[str]): Only return myths from this region.
+            place (Optional[str]): Only return myths from this place.
+        
+        Returns:
+            List[Dict]: Myth dictionaries without 'original_text' and 'english_text'; use get_myth() for those.
+        """
+        conn = self._connect()
         cursor = conn.cursor()
-        cursor.execute('SELECT * FROM myths ORDER BY created_at DESC')
+        conditions, params = self._facet_filter(language, region, place)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+        cursor.execute(f'''
+            SELECT {', '.join(SUMMARY_COLUMNS)} FROM myths {where}
+            ORDER BY created_at DESC, id DESC LIMIT ? OFFSET ?
+        ''', params + [limit, offset])
         rows = cursor.fetchall()
-        columns = [desc[0] for desc in cursor.description]
-        results = [dict(zip(columns, row)) for row in rows]
+        results = [dict(zip(SUMMARY_COLUMNS, row)) for row in rows]
         for result in results:
-            result['keywords'] = json.loads(result['keywords'])
+            result['keywords'] = json.loads(result['keywords'] or '[]')
         conn.close()
         return results
+    
+    def get_myth(self, myth_id: int) -> Optional[Dict]:
+        """
+        Retrieve a single myth with all fields.
+        
+        Args:
+            myth_id (int): The myth's ID.
+        
+        Returns:
+            Optional[Dict]: The myth dictionary, or None if it doesn't exist.
+        """
+        results = self.get_myths_by_ids([myth_id])
+        return results[0].to_dict() if results else None
+    
+    def get_facet_counts(self) -> Dict[str, Dict[str, int]]:
+        """
+        Return myth counts per language, region and place from the maintained aggregate.
+        
+        The aggregate is re-read only when its version counter moves (any insert, update or
+        delete), so repeated calls from the UI cost one primary-key lookup.
+        
+        Returns:
+            Dict[str, Dict[str, int]]: Mapping from facet name to {value: count}, largest first.
+        """
+        conn = self._connect()
+        cursor = conn.cursor()
+        version = cursor.execute("SELECT version FROM cache_versions WHERE name = 'facets'").fetchone()
+        if self._facet_cache is None or self._facet_cache[0] != version:
+            counts = {facet: {} for facet in FACET_COLUMNS}
+            for facet, value, count in cursor.execute(
+                'SELECT facet, value, count FROM facet_counts WHERE count > 0 ORDER BY count DESC, value'
+            ):
+                counts[facet][value] = count
+            self._facet_cache = (version, counts)
+        conn.close()
+        return self._facet_cache[1]
+    
+    def get_keyword_counts(self) -> Dict[str, int]:
+        """
+        Count how many myths carry each keyword (reads only the keywords column).
+        
+        Returns:
+            Dict[str, int]: Mapping from keyword to number of myths.
+        """
+        counts: Dict[str, int] = {}
+        conn = self._connect()
+        for (keywords,) in conn.execute('SELECT keywords FROM myths'):
+            for keyword in set(json.loads(keywords or '[]')):
+                counts[keyword] = counts.get(keyword, 0) + 1
+        conn.close()
+        return counts
+    
+    def count_myths(self) -> int:
+        """
+        Return the total number of myths, read from the facet aggregate once its backfill has
+        caught up (counted from the table until then).
+        """
+        conn = self._connect()
+        pending = conn.execute('''
+            SELECT EXISTS (SELECT 1 FROM myths WHERE id > (SELECT last_myth_id FROM index_state WHERE name = 'facets'))
+        ''').fetchone()[0]
+        count = conn.execute('SELECT COUNT(*) FROM myths').fetchone()[0] if pending else None
+        conn.close()
+        return count if pending else sum(self.get_facet_counts()['language'].values())
+    
+    def get_cache_version(self, name: str) -> int:
+        """
+        Return a cache_versions counter ('facets' moves on every insert, update and delete), so
+        caches kept outside the database can tell whether they are current.
+        """
+        conn = self._connect()
+        row = conn.execute('SELECT version FROM cache_versions WHERE name = ?', (name,)).fetchone()
+        conn.close()
+        return row[0] if row else 0
 
 if __name__ == "__main__":
     # Example usage for testing
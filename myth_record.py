@@ -0,0 +1,120 @@
+import json
+from collections.abc import Mapping
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+# Full texts a result list or ranking never reads; records fetch them on first access
+LAZY_FIELDS = ('original_text', 'english_text')
+
+# loader(myth_ids) -> {myth_id: (original_text, english_text)}
+TextLoader = Callable[[List[int]], Dict[int, Tuple[str, str]]]
+
+
+class RecordLayout:
+    __slots__ = ('columns', 'positions', 'loader', 'keys')
+
+    def __init__(self, columns: Sequence[str], loader: Optional[TextLoader] = None):
+        """
+        Column positions shared by every record of one query, and the loader for their lazy fields.
+
+        Args:
+            columns (Sequence[str]): Names of the selected columns, in row order; must include 'id'.
+            loader (Optional[TextLoader]): Fetches LAZY_FIELDS for a list of IDs. Without one, records
+                have no lazy fields.
+        """
+        self.columns = tuple(columns)
+        self.positions = {column: position for position, column in enumerate(self.columns)}
+        self.loader = loader
+        self.keys = self.columns + (tuple(field for field in LAZY_FIELDS if field not in self.positions)
+                                    if loader else ())
+
+
+class MythRecord(Mapping):
+    __slots__ = ('_layout', '_row', '_keywords', '_texts', '_extra')
+
+    def __init__(self, layout: RecordLayout, row: tuple):
+        """
+        A myth row as a read-mostly mapping, in place of a per-row dict.
+
+        The database row tuple is kept as is and columns are looked up through the shared
+        layout, so a record costs one small object on top of its row. 'keywords' is decoded from
+        JSON on first access, and 'original_text'/'english_text' are read from the database only
+        when asked for (load_texts() fetches them for many records in one query). Values set with
+        record[key] = value (e.g., 'relevance_score') are kept in a small dict of their own.
+
+        Args:
+            layout (RecordLayout): Shared column layout of the query.
+            row (tuple): Row values in layout order.
+        """
+        self._layout = layout
+        self._row = row
+        self._keywords = None
+        self._texts = None
+        self._extra = None
+
+    def __getitem__(self, key: str):
+        if self._extra is not None and key in self._extra:
+            return self._extra[key]
+        if key == 'keywords':
+            if self._keywords is None:
+                self._keywords = json.loads(self._row[self._layout.positions['keywords']] or '[]')
+            return self._keywords
+        position = self._layout.positions.get(key)
+        if position is not None:
+            return self._row[position]
+        if key in LAZY_FIELDS and self._layout.loader is not None:
+            if self._texts is None:
+                load_texts([self])
+            return self._texts[LAZY_FIELDS.index(key)]
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value):
+        if self._extra is None:
+            self._extra = {}
+        self._extra[key] = value
+
+    def __contains__(self, key) -> bool:
+        # Answered from the layout, without loading lazy fields
+        return key in self._layout.positions or (self._extra is not None and key in self._extra) or (
+            key in LAZY_FIELDS and self._layout.loader is not None)
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self._layout.keys
+        if self._extra is not None:
+            yield from (key for key in self._extra if key not in self._layout.positions and key not in LAZY_FIELDS)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return f"MythRecord(id={self['id']})"
+
+    def to_dict(self) -> Dict:
+        """
+        Return a plain dictionary with every field, loading the full texts if they aren't yet.
+        """
+        return {key: self[key] for key in self}
+
+
+def load_texts(records: Iterable[MythRecord]):
+    """
+    Fetch the lazy text fields of many records with one loader call per database.
+    """
+    pending: Dict[int, Tuple[TextLoader, List[MythRecord]]] = {}
+    for record in records:
+        if isinstance(record, MythRecord) and record._texts is None and record._layout.loader is not None:
+            pending.setdefault(id(record._layout.loader), (record._layout.loader, []))[1].append(record)
+    for loader, group in pending.values():
+        texts = loader([record['id'] for record in group])
+        for record in group:
+            # A myth deleted since the query has no text left to show
+            record._texts = texts.get(record['id'], (None, None))
+
+
+if __name__ == "__main__":
+    # Example usage: compare the size of a record with the dict it replaces
+    import sys
+    layout = RecordLayout(('id', 'summary', 'keywords'), lambda ids: {i: ("original " * 500, "english " * 500) for i in ids})
+    record = MythRecord(layout, (1, "A hero's tale", '["hero", "village"]'))
+    as_dict = record.to_dict()
+    print(record, record['keywords'], len(record['original_text']))
+    print("record bytes:", sys.getsizeof(record), "dict bytes:", sys.getsizeof(as_dict) + sum(map(sys.getsizeof, as_dict.values())))
@@ -0,0 +1,208 @@
+import hashlib
+import random
+import sqlite3
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+from tokenizer import TokenizedMyth, tokenize
+
+MERSENNE_PRIME = (1 << 61) - 1
+# Shingles keep every word (stemmed), so short retellings still produce n-grams
+SHINGLE_TOKENS = {'remove_stop_words': False, 'min_length': 1, 'use_stemming': True}
+
+
+def _hash64(data: bytes) -> int:
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), 'little')
+
+
+def shingles(tokens: List[str], size: int = 3) -> set:
+    """
+    Hashed word n-grams of a token sequence; sequences shorter than `size` words use their words.
+    """
+    if len(tokens) < size:
+        return {_hash64(token.encode('utf-8')) for token in tokens}
+    return {_hash64(' '.join(tokens[i:i + size]).encode('utf-8')) for i in range(len(tokens) - size + 1)}
+
+
+class NearDuplicateIndex:
+    def __init__(self, num_perm: int = 128, bands: int = 16, threshold: float = 0.8, shingle_size: int = 3):
+        """
+        Initialize the near-duplicate index: a MinHash signature per myth and a banded LSH table.
+
+        Signatures are split into `bands` bands; myths sharing any band bucket are candidates, and
+        only those candidates are compared. With the defaults (16 bands of 8 rows) pairs above about
+        0.7 Jaccard similarity almost always share a bucket, while dissimilar pairs rarely do.
+
+        Args:
+            num_perm (int): Signature length (hash functions). Default is 128.
+            bands (int): LSH bands; must divide num_perm. Default is 16.
+            threshold (float): Estimated Jaccard similarity at which two myths count as duplicates. Default is 0.8.
+            shingle_size (int): Words per shingle. Default is 3.
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        # Fixed seed: signatures stored in the database must be reproducible by every process
+        rng = random.Random(1)
+        self._permutations = [(rng.randrange(1, MERSENNE_PRIME), rng.randrange(0, MERSENNE_PRIME))
+                              for _ in range(num_perm)]
+
+    def init_schema(self, cursor: sqlite3.Cursor):
+        """
+        Create the index tables if they don't exist.
+        """
+        # cluster_id: ID of the first myth of its duplicate group (the myth's own ID if it has none)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS myth_minhash (
+                myth_id INTEGER PRIMARY KEY,
+                signature BLOB NOT NULL,
+                cluster_id INTEGER NOT NULL
+            )
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS minhash_bands (
+                band INTEGER NOT NULL,
+                bucket INTEGER NOT NULL,
+                myth_id INTEGER NOT NULL,
+                PRIMARY KEY (band, bucket, myth_id)
+            ) WITHOUT ROWID
+        ''')
+        # Older versions stored an all-maximum signature for myths without words, which made them
+        # all duplicates of each other
+        empty = array('Q', [MERSENNE_PRIME] * self.num_perm).tobytes()
+        cursor.execute('DELETE FROM minhash_bands WHERE myth_id IN (SELECT myth_id FROM myth_minhash WHERE signature = ?)',
+                       (empty,))
+        cursor.execute('DELETE FROM myth_minhash WHERE signature = ?', (empty,))
+
+    def myth_signature(self, myth_data: Dict, tokens: Optional[TokenizedMyth] = None) -> Optional[array]:
+        """
+        Compute the MinHash signature a myth is indexed under (None if its text has no words).
+        """
+        # The English text lets retellings recorded in different languages match
+        field = 'english_text' if myth_data.get('english_text') else 'original_text'
+        tokens = tokens or TokenizedMyth(myth_data)
+        return self._signature(tokens.tokens(field, **SHINGLE_TOKENS))
+
+    def signature(self, text: str) -> Optional[array]:
+        """
+        Compute the MinHash signature of a text.
+
+        Returns:
+            Optional[array]: `num_perm` unsigned 64-bit minimums, or None for text without words
+                (an empty shingle set would give every such text the same all-maximum signature).
+        """
+        return self._signature(tokenize(text, **SHINGLE_TOKENS))
+
+    def _signature(self, tokens: List[str]) -> Optional[array]:
+        hashes = shingles(tokens, self.shingle_size)
+        if not hashes:
+            return None
+        return array('Q', [min([(a * x + b) % MERSENNE_PRIME for x in hashes]) for a, b in self._permutations])
+
+    def buckets(self, signature: array) -> List[Tuple[int, int]]:
+        """
+        Return the (band, bucket) keys of a signature; signatures sharing one are LSH candidates.
+        """
+        rows = self.rows
+        return [
+            (band, int.from_bytes(hashlib.blake2b(signature[band * rows:(band + 1) * rows].tobytes(),
+                                                  digest_size=8).digest(), 'little', signed=True))
+            for band in range(self.bands)
+        ]
+
+    @staticmethod
+    def similarity(left: array, right: array) -> float:
+        """
+        Estimate Jaccard similarity as the share of equal signature positions.
+        """
+        return sum(1 for a, b in zip(left, right) if a == b) / len(left)
+
+    def _matches(self, cursor: sqlite3.Cursor, signature: Optional[array],
+                 exclude_id: int = None) -> List[Tuple[int, float, int]]:
+        if signature is None:
+            return []
+        candidates = set()
+        for band, bucket in self.buckets(signature):
+            candidates.update(row[0] for row in cursor.execute(
+                'SELECT myth_id FROM minhash_bands WHERE band = ? AND bucket = ?', (band, bucket)))
+        candidates.discard(exclude_id)
+        matches = []
+        for myth_id in candidates:
+            blob, cluster_id = cursor.execute(
+                'SELECT signature, cluster_id FROM myth_minhash WHERE myth_id = ?', (myth_id,)).fetchone()
+            stored = array('Q')
+            stored.frombytes(blob)
+            score = self.similarity(signature, stored)
+            if score >= self.threshold:
+                matches.append((myth_id, score, cluster_id))
+        return sorted(matches, key=lambda match: (-match[1], match[0]))
+
+    def find_duplicates(self, cursor: sqlite3.Cursor, myth_data: Optional[Dict],
+                        tokens: Optional[TokenizedMyth] = None, signature: Optional[array] = None) -> List[Dict]:
+        """
+        Find stored myths that are near-duplicates of `myth_data` (or of a precomputed `signature`),
+        comparing only LSH candidates.
+
+        Returns:
+            List[Dict]: {'id', 'similarity', 'cluster_id'} for each duplicate, most similar first;
+                empty for a myth without words.
+        """
+        if signature is None:
+            signature = self.myth_signature(myth_data, tokens)
+        return [{'id': myth_id, 'similarity': score, 'cluster_id': cluster_id}
+                for myth_id, score, cluster_id in self._matches(cursor, signature)]
+
+    def index_myth(self, cursor: sqlite3.Cursor, myth_id: int, myth_data: Dict,
+                   tokens: Optional[TokenizedMyth] = None):
+        """
+        Store a myth's signature and buckets, joining the cluster of its closest duplicate, using the caller's cursor.
+        Myths without words are not stored: they are nobody's duplicate and form their own cluster.
+        """
+        signature = self.myth_signature(myth_data, tokens)
+        if signature is None:
+            return
+        matches = self._matches(cursor, signature, exclude_id=myth_id)
+        cluster_id = matches[0][2] if matches else myth_id
+        cursor.execute('INSERT OR REPLACE INTO myth_minhash (myth_id, signature, cluster_id) VALUES (?, ?, ?)',
+                       (myth_id, signature.tobytes(), cluster_id))
+        cursor.executemany('INSERT OR IGNORE INTO minhash_bands (band, bucket, myth_id) VALUES (?, ?, ?)',
+                           [(band, bucket, myth_id) for band, bucket in self.buckets(signature)])
+
+    def remove_myth(self, cursor: sqlite3.Cursor, myth_id: int):
+        """
+        Drop a myth's signature and buckets (bucket keys are recomputed from the stored signature).
+        """
+        row = cursor.execute('SELECT signature FROM myth_minhash WHERE myth_id = ?', (myth_id,)).fetchone()
+        if row is None:
+            return
+        signature = array('Q')
+        signature.frombytes(row[0])
+        cursor.executemany('DELETE FROM minhash_bands WHERE band = ? AND bucket = ? AND myth_id = ?',
+                           [(band, bucket, myth_id) for band, bucket in self.buckets(signature)])
+        cursor.execute('DELETE FROM myth_minhash WHERE myth_id = ?', (myth_id,))
+
+    @staticmethod
+    def clusters(cursor: sqlite3.Cursor, myth_ids: Iterable[int]) -> Dict[int, int]:
+        """
+        Return myth_id -> cluster_id for the given myths.
+        """
+        myth_ids = list(myth_ids)
+        clusters = {}
+        for chunk_start in range(0, len(myth_ids), 500):
+            chunk = myth_ids[chunk_start:chunk_start + 500]
+            clusters.update(cursor.execute(
+                f'SELECT myth_id, cluster_id FROM myth_minhash WHERE myth_id IN ({",".join("?" * len(chunk))})',
+                chunk))
+        return clusters
+
+
+if __name__ == "__main__":
+    # Example usage for testing
+    index = NearDuplicateIndex()
+    a = index.signature("Krishna lifted the Govardhan hill on his little finger to shelter the villagers from the rain.")
+    b = index.signature("Krishna lifted Govardhan hill on his little finger to shelter the villagers from the storm.")
+    c = index.signature("Rama crossed the ocean to Lanka with an army of monkeys.")
+    print("similar:", index.similarity(a, b), "different:", index.similarity(a, c))
@@ -0,0 +1,203 @@
+import re
+import sqlite3
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+from tokenizer import TokenizedMyth
+
+# Field IDs are stored in the tables; keep the order stable
+PASSAGE_FIELDS = ('english_text', 'original_text')
+SENTENCE_END_RE = re.compile(r'[.!?।॥]+\s+|\n+')
+WHITESPACE_RE = re.compile(r'\s+')
+
+
+def split_passages(text: str, target_chars: int = 400, max_chars: int = 800) -> List[Tuple[int, int]]:
+    """
+    Split text into passages of whole sentences, about `target_chars` long.
+
+    Unpunctuated runs (common in long transcriptions) are cut at the last whitespace
+    before `max_chars`.
+
+    Args:
+        text (str): The text to split.
+        target_chars (int): A passage ends at the first sentence boundary past this length. Default is 400.
+        max_chars (int): Hard limit on passage length. Default is 800.
+
+    Returns:
+        List[Tuple[int, int]]: (start, end) character offsets covering the text.
+    """
+    passages = []
+    start = 0
+    length = len(text)
+    while start < length:
+        end = min(start + max_chars, length)
+        if end < length:
+            boundary = None
+            for match in SENTENCE_END_RE.finditer(text, start + 1, end):
+                boundary = match.end()
+                if boundary - start >= target_chars:
+                    break
+            if boundary is None:
+                spaces = [m.end() for m in WHITESPACE_RE.finditer(text, start + 1, end)]
+                boundary = spaces[-1] if spaces else end
+            end = boundary
+        passages.append((start, end))
+        start = end
+    return passages
+
+
+class PassageIndex:
+    def __init__(self, target_chars: int = 400):
+        """
+        Initialize the passage index: myth texts split into passages, with every token's
+        character span stored so matches can be highlighted without re-scanning the text.
+
+        Args:
+            target_chars (int): Approximate passage length. Default is 400.
+        """
+        self.target_chars = target_chars
+
+    def init_schema(self, cursor: sqlite3.Cursor):
+        """
+        Create the index tables if they don't exist.
+        """
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS myth_passages (
+                myth_id INTEGER NOT NULL,
+                field INTEGER NOT NULL,
+                passage_no INTEGER NOT NULL,
+                start INTEGER NOT NULL,
+                end INTEGER NOT NULL,
+                PRIMARY KEY (myth_id, field, passage_no)
+            ) WITHOUT ROWID
+        ''')
+        # positions: packed uint32 (start, end) pairs, offsets into the myth's field text
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS passage_postings (
+                token TEXT NOT NULL,
+                myth_id INTEGER NOT NULL,
+                field INTEGER NOT NULL,
+                passage_no INTEGER NOT NULL,
+                positions BLOB NOT NULL,
+                PRIMARY KEY (token, myth_id, field, passage_no)
+            ) WITHOUT ROWID
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_passage_postings_myth ON passage_postings(myth_id)')
+
+    def index_myth(self, cursor: sqlite3.Cursor, myth_id: int, myth_data: Dict,
+                   tokens: Optional[TokenizedMyth] = None):
+        """
+        Split a myth's texts into passages and store token positions, using the caller's cursor.
+        """
+        tokens = tokens or TokenizedMyth(myth_data)
+        for field_id, field in enumerate(PASSAGE_FIELDS):
+            text = myth_data.get(field) or ''
+            # English myths carry the same text in both fields; index it once
+            if not text or (field == 'original_text' and text == myth_data.get('english_text')):
+                continue
+            lang = 'en' if field == 'english_text' else myth_data.get('language')
+            spans = split_passages(text, self.target_chars, self.target_chars * 2)
+            cursor.executemany(
+                'INSERT OR REPLACE INTO myth_passages (myth_id, field, passage_no, start, end) VALUES (?, ?, ?, ?, ?)',
+                [(myth_id, field_id, passage_no, start, end) for passage_no, (start, end) in enumerate(spans)]
+            )
+            postings: Dict[Tuple[str, int], array] = {}
+            passage_no = 0
+            for token, start, end in tokens.tokens(field, lang=lang, with_offsets=True):
+                while start >= spans[passage_no][1]:
+                    passage_no += 1
+                postings.setdefault((token, passage_no), array('I')).extend((start, end))
+            cursor.executemany(
+                'INSERT OR REPLACE INTO passage_postings (token, myth_id, field, passage_no, positions) '
+                'VALUES (?, ?, ?, ?, ?)',
+                [(token, myth_id, field_id, number, positions.tobytes())
+                 for (token, number), positions in postings.items()]
+            )
+
+    def remove_myth(self, cursor: sqlite3.Cursor, myth_id: int):
+        """
+        Drop a myth's passages and postings.
+        """
+        cursor.execute('DELETE FROM passage_postings WHERE myth_id = ?', (myth_id,))
+        cursor.execute('DELETE FROM myth_passages WHERE myth_id = ?', (myth_id,))
+
+    def best_passages(self, cursor: sqlite3.Cursor, myth_ids: Iterable[int],
+                      tokens: Iterable[str]) -> Dict[int, Dict]:
+        """
+        Pick the passage of each myth that matches the most distinct query tokens.
+
+        Args:
+            cursor (sqlite3.Cursor): Database cursor.
+            myth_ids (Iterable[int]): Myths to look at (typically the search results).
+            tokens (Iterable[str]): Normalized query tokens.
+
+        Returns:
+            Dict[int, Dict]: myth_id -> {'field', 'start', 'end', 'text' (the passage itself),
+                'in_original' (True if the offsets are also valid in original_text: English myths
+                index their shared text once, as english_text), 'matched' (distinct tokens),
+                'coverage' (share of query tokens matched), 'highlights' (absolute (start, end) spans)}.
+                Myths without any matching passage are omitted.
+        """
+        myth_ids = list(myth_ids)
+        tokens = sorted(set(tokens))
+        if not myth_ids or not tokens:
+            return {}
+        candidates: Dict[Tuple[int, int, int], Dict] = {}
+        for chunk_start in range(0, len(myth_ids), 500):
+            chunk = myth_ids[chunk_start:chunk_start + 500]
+            rows = cursor.execute(f'''
+                SELECT token, myth_id, field, passage_no, positions FROM passage_postings
+                WHERE token IN ({','.join('?' * len(tokens))}) AND myth_id IN ({','.join('?' * len(chunk))})
+            ''', tokens + chunk)
+            for token, myth_id, field_id, passage_no, blob in rows:
+                entry = candidates.setdefault((myth_id, field_id, passage_no), {'matched': set(), 'positions': []})
+                entry['matched'].add(token)
+                positions = array('I')
+                positions.frombytes(blob)
+                entry['positions'].extend(zip(positions[::2], positions[1::2]))
+
+        best: Dict[int, Tuple] = {}
+        for (myth_id, field_id, passage_no), entry in candidates.items():
+            # Most distinct tokens first, then most occurrences, then English over original, then earliest
+            rank = (len(entry['matched']), len(entry['positions']), -field_id, -passage_no)
+            if myth_id not in best or rank > best[myth_id][0]:
+                best[myth_id] = (rank, field_id, passage_no, entry)
+
+        english_id, original_id = PASSAGE_FIELDS.index('english_text'), PASSAGE_FIELDS.index('original_text')
+        # Only the passages are cut out of the texts, all of them in one query per chunk of myths;
+        # callers never need to hold a whole field
+        keys = [(myth_id, field_id, passage_no) for myth_id, (_, field_id, passage_no, _) in best.items()]
+        details = {}
+        for chunk_start in range(0, len(keys), 300):
+            chunk = keys[chunk_start:chunk_start + 300]
+            details.update((row[0], row[1:]) for row in cursor.execute(f'''
+                SELECT p.myth_id, p.start, p.end,
+                       substr(CASE p.field WHEN {english_id} THEN m.english_text ELSE m.original_text END,
+                              p.start + 1, p.end - p.start),
+                       p.field = {original_id} OR NOT EXISTS (
+                           SELECT 1 FROM myth_passages o WHERE o.myth_id = p.myth_id AND o.field = {original_id})
+                FROM myth_passages p JOIN myths m ON m.id = p.myth_id
+                WHERE (p.myth_id, p.field, p.passage_no) IN (VALUES {','.join(['(?, ?, ?)'] * len(chunk))})
+            ''', [value for key in chunk for value in key]))
+        passages = {}
+        for myth_id, (_, field_id, passage_no, entry) in best.items():
+            if myth_id not in details:
+                continue  # Deleted since its postings were read
+            start, end, text, in_original = details[myth_id]
+            passages[myth_id] = {
+                'field': PASSAGE_FIELDS[field_id],
+                'start': start,
+                'end': end,
+                'text': text or '',
+                'in_original': bool(in_original),
+                'matched': sorted(entry['matched']),
+                'coverage': len(entry['matched']) / len(tokens),
+                'highlights': sorted(entry['positions']),
+            }
+        return passages
+
+
+if __name__ == "__main__":
+    # Example usage for testing
+    sample = "Krishna lifted the hill. " * 30 + "Then Rama crossed the ocean to Lanka. " * 10
+    for start, end in split_passages(sample):
+        print(start, end, sample[start:start + 40])
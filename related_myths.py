@@ -0,0 +1,250 @@
+import math
+import sqlite3
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+from tokenizer import TokenizedMyth
+
+
+class RelatedMythsIndex:
+    def __init__(self, k: int = 5, max_terms: int = 32, max_df_ratio: float = 0.2, min_score: float = 0.05,
+                 candidate_terms: int = 8, max_postings: int = 256):
+        """
+        Initialize the related-myths index: a k-nearest-neighbour graph over TF-IDF vectors.
+
+        Each myth keeps its `max_terms` highest-weighted terms (L2-normalized) in an inverted table;
+        neighbours are the myths with the largest dot product over shared terms. Inserts add the new
+        myth to the graph incrementally (and to its neighbours' lists when it ranks high enough);
+        rebuild() recomputes every vector with current IDF values and the whole graph.
+
+        An insert looks for neighbours through its `candidate_terms` heaviest terms only, reading at
+        most `max_postings` of the highest-weighted postings of each, so its cost does not grow with
+        the corpus. rebuild() scores candidates over every term and posting.
+
+        Args:
+            k (int): Neighbours kept per myth. Default is 5.
+            max_terms (int): Terms kept per myth vector. Default is 32.
+            max_df_ratio (float): Terms in a larger share of myths are not used to find candidates. Default is 0.2.
+            min_score (float): Minimum cosine similarity for a neighbour. Default is 0.05.
+            candidate_terms (int): Terms of a new myth used to find its neighbours. Default is 8.
+            max_postings (int): Postings read per term when finding neighbours on insert. Default is 256.
+        """
+        self.k = k
+        self.max_terms = max_terms
+        self.max_df_ratio = max_df_ratio
+        self.min_score = min_score
+        self.candidate_terms = candidate_terms
+        self.max_postings = max_postings
+
+    def init_schema(self, cursor: sqlite3.Cursor):
+        """
+        Create the index tables if they don't exist.
+        """
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS related_term_df (
+                term TEXT PRIMARY KEY,
+                df INTEGER NOT NULL
+            ) WITHOUT ROWID
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS related_vectors (
+                term TEXT NOT NULL,
+                myth_id INTEGER NOT NULL,
+                weight REAL NOT NULL,
+                PRIMARY KEY (term, myth_id)
+            ) WITHOUT ROWID
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_related_vectors_myth ON related_vectors(myth_id)')
+        # Lets inserts read only the strongest postings of a term
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_related_vectors_term_weight ON related_vectors(term, weight DESC)')
+        # Number of indexed myths (the IDF corpus size), kept in the same transaction as the vectors
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS related_stats (
+                name TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            ) WITHOUT ROWID
+        ''')
+        # Databases indexed before the counter existed are counted once
+        cursor.execute('''
+            INSERT OR IGNORE INTO related_stats (name, value)
+            VALUES ('myths', (SELECT COUNT(DISTINCT myth_id) FROM related_vectors))
+        ''')
+        # The graph itself: showing related myths is one primary-key range read
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS related_myths (
+                myth_id INTEGER NOT NULL,
+                related_id INTEGER NOT NULL,
+                score REAL NOT NULL,
+                PRIMARY KEY (myth_id, related_id)
+            ) WITHOUT ROWID
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_related_myths_related ON related_myths(related_id)')
+
+    @staticmethod
+    def _terms(myth_data: Dict, tokens: Optional[TokenizedMyth] = None) -> Counter:
+        tokens = tokens or TokenizedMyth(myth_data)
+        field = 'english_text' if myth_data.get('english_text') else 'original_text'
+        return Counter(tokens.tokens(field, lang='en', use_stemming=True)
+                       + tokens.tokens('keywords', lang='en', use_stemming=True))
+
+    @staticmethod
+    def _corpus_size(cursor: sqlite3.Cursor) -> int:
+        return cursor.execute("SELECT value FROM related_stats WHERE name = 'myths'").fetchone()[0]
+
+    @staticmethod
+    def _count_myths(cursor: sqlite3.Cursor, delta: int):
+        cursor.execute("UPDATE related_stats SET value = MAX(value + ?, 0) WHERE name = 'myths'", (delta,))
+
+    def _vector(self, cursor: sqlite3.Cursor, counts: Counter, corpus_size: int) -> Dict[str, float]:
+        if not counts:
+            return {}
+        terms = list(counts)
+        df = {}
+        for chunk_start in range(0, len(terms), 500):
+            chunk = terms[chunk_start:chunk_start + 500]
+            df.update(cursor.execute(
+                f'SELECT term, df FROM related_term_df WHERE term IN ({",".join("?" * len(chunk))})', chunk))
+        weights = {term: (1 + math.log(count)) * math.log((corpus_size + 1) / (df.get(term, 0) + 1)) + 1e-6
+                   for term, count in counts.items()}
+        top = sorted(weights.items(), key=lambda item: (-item[1], item[0]))[:self.max_terms]
+        norm = math.sqrt(sum(weight * weight for _, weight in top))
+        return {term: weight / norm for term, weight in top}
+
+    def _stored_vector(self, cursor: sqlite3.Cursor, myth_id: int) -> Dict[str, float]:
+        return dict(cursor.execute('SELECT term, weight FROM related_vectors WHERE myth_id = ?', (myth_id,)))
+
+    def _neighbours(self, cursor: sqlite3.Cursor, myth_id: int, vector: Dict[str, float],
+                    corpus_size: int, exhaustive: bool = False) -> List[Tuple[int, float]]:
+        # Bounded search (the default) scores the strongest postings of the heaviest terms only
+        max_df = max(2, int(corpus_size * self.max_df_ratio))
+        terms = sorted(vector, key=lambda term: (-vector[term], term))
+        if not exhaustive:
+            terms = terms[:self.candidate_terms]
+        if not terms:
+            return []
+        df = dict(cursor.execute(
+            f'SELECT term, df FROM related_term_df WHERE term IN ({",".join("?" * len(terms))})', terms))
+        scores: Dict[int, float] = {}
+        for term in terms:
+            # Very common terms would make every myth a candidate while adding little to the score
+            if df.get(term, 0) > max_df:
+                continue
+            postings = cursor.execute(
+                'SELECT myth_id, weight FROM related_vectors WHERE term = ?', (term,)
+            ) if exhaustive else cursor.execute(
+                'SELECT myth_id, weight FROM related_vectors WHERE term = ? ORDER BY weight DESC LIMIT ?',
+                (term, self.max_postings))
+            weight = vector[term]
+            for other_id, other_weight in postings:
+                if other_id != myth_id:
+                    scores[other_id] = scores.get(other_id, 0.0) + weight * other_weight
+        ranked = sorted(((score, other_id) for other_id, score in scores.items() if score >= self.min_score),
+                        reverse=True)[:self.k]
+        return [(other_id, score) for score, other_id in ranked]
+
+    def _store_neighbours(self, cursor: sqlite3.Cursor, myth_id: int, neighbours: List[Tuple[int, float]]):
+        cursor.execute('DELETE FROM related_myths WHERE myth_id = ?', (myth_id,))
+        cursor.executemany('INSERT INTO related_myths (myth_id, related_id, score) VALUES (?, ?, ?)',
+                           [(myth_id, other_id, score) for other_id, score in neighbours])
+
+    def _offer(self, cursor: sqlite3.Cursor, myth_id: int, candidate_id: int, score: float):
+        # Add candidate to myth's neighbour list if it beats the weakest of its k neighbours
+        rows = cursor.execute('SELECT related_id, score FROM related_myths WHERE myth_id = ?', (myth_id,)).fetchall()
+        if len(rows) >= self.k:
+            weakest_id, weakest_score = min(rows, key=lambda row: row[1])
+            if score <= weakest_score:
+                return
+            cursor.execute('DELETE FROM related_myths WHERE myth_id = ? AND related_id = ?', (myth_id, weakest_id))
+        cursor.execute('INSERT OR REPLACE INTO related_myths (myth_id, related_id, score) VALUES (?, ?, ?)',
+                       (myth_id, candidate_id, score))
+
+    def index_myth(self, cursor: sqlite3.Cursor, myth_id: int, myth_data: Dict,
+                   tokens: Optional[TokenizedMyth] = None):
+        """
+        Add a myth to the graph using the caller's cursor: store its vector, link it to its
+        nearest neighbours, and offer it to each of those neighbours' lists.
+        """
+        counts = self._terms(myth_data, tokens)
+        cursor.executemany('''
+            INSERT INTO related_term_df (term, df) VALUES (?, 1)
+            ON CONFLICT(term) DO UPDATE SET df = df + 1
+        ''', [(term,) for term in counts])
+        self._count_myths(cursor, 1)
+        corpus_size = self._corpus_size(cursor)
+        vector = self._vector(cursor, counts, corpus_size)
+        cursor.executemany('INSERT OR REPLACE INTO related_vectors (term, myth_id, weight) VALUES (?, ?, ?)',
+                           [(term, myth_id, weight) for term, weight in vector.items()])
+        neighbours = self._neighbours(cursor, myth_id, vector, corpus_size)
+        self._store_neighbours(cursor, myth_id, neighbours)
+        for other_id, score in neighbours:
+            self._offer(cursor, other_id, myth_id, score)
+
+    def remove_myth(self, cursor: sqlite3.Cursor, myth_id: int, myth_data: Dict,
+                    tokens: Optional[TokenizedMyth] = None):
+        """
+        Drop a myth from the graph. Myths that listed it as a neighbour get their lists recomputed
+        from their stored vectors.
+        """
+        cursor.executemany('UPDATE related_term_df SET df = df - 1 WHERE term = ?',
+                           [(term,) for term in self._terms(myth_data, tokens)])
+        cursor.execute('DELETE FROM related_term_df WHERE df <= 0')
+        self._count_myths(cursor, -1)
+        cursor.execute('DELETE FROM related_vectors WHERE myth_id = ?', (myth_id,))
+        cursor.execute('DELETE FROM related_myths WHERE myth_id = ?', (myth_id,))
+        affected = [row[0] for row in cursor.execute(
+            'SELECT myth_id FROM related_myths WHERE related_id = ?', (myth_id,)).fetchall()]
+        cursor.execute('DELETE FROM related_myths WHERE related_id = ?', (myth_id,))
+        corpus_size = self._corpus_size(cursor)
+        for other_id in affected:
+            self._store_neighbours(cursor, other_id, self._neighbours(
+                cursor, other_id, self._stored_vector(cursor, other_id), corpus_size))
+
+    def rebuild(self, cursor: sqlite3.Cursor, myths, batch_size: int = 1000):
+        """
+        Recompute document frequencies, every vector and the whole graph.
+
+        Incremental inserts weight terms with the IDF values of the moment; run this offline
+        (e.g., nightly) so all vectors share current IDF values.
+
+        Args:
+            cursor (sqlite3.Cursor): Database cursor; the caller commits.
+            myths: Callable returning a fresh iterator of (myth_id, myth_data) in ID order.
+            batch_size (int): Myths written per executemany. Default is 1000.
+        """
+        cursor.execute('DELETE FROM related_term_df')
+        cursor.execute('DELETE FROM related_vectors')
+        cursor.execute('DELETE FROM related_myths')
+        df: Counter = Counter()
+        corpus_size = 0
+        for _, myth_data in myths():
+            df.update(self._terms(myth_data).keys())
+            corpus_size += 1
+        cursor.executemany('INSERT INTO related_term_df (term, df) VALUES (?, ?)', df.items())
+        cursor.execute("INSERT OR REPLACE INTO related_stats (name, value) VALUES ('myths', ?)", (corpus_size,))
+        rows = []
+        for myth_id, myth_data in myths():
+            vector = self._vector(cursor, self._terms(myth_data), corpus_size)
+            rows.extend((term, myth_id, weight) for term, weight in vector.items())
+            if len(rows) >= batch_size * self.max_terms:
+                cursor.executemany('INSERT INTO related_vectors (term, myth_id, weight) VALUES (?, ?, ?)', rows)
+                rows = []
+        cursor.executemany('INSERT INTO related_vectors (term, myth_id, weight) VALUES (?, ?, ?)', rows)
+        for myth_id, _ in myths():
+            self._store_neighbours(cursor, myth_id, self._neighbours(
+                cursor, myth_id, self._stored_vector(cursor, myth_id), corpus_size, exhaustive=True))
+
+    @staticmethod
+    def related(cursor: sqlite3.Cursor, myth_id: int) -> List[Tuple[int, float]]:
+        """
+        Return the stored (related_id, score) pairs of a myth, most similar first.
+        """
+        return cursor.execute(
+            'SELECT related_id, score FROM related_myths WHERE myth_id = ? ORDER BY score DESC', (myth_id,)
+        ).fetchall()
+
+
+if __name__ == "__main__":
+    # Example usage: rebuild the graph of a database offline
+    import sys
+    from myth_database import MythDatabase
+    db = MythDatabase(sys.argv[1] if len(sys.argv) > 1 else "data/myths.db")
+    print(f"Rebuilt related myths for {db.rebuild_related_myths()} myths")
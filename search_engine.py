@@ -1,48 +1,170 @@
-from typing import List, Dict
+from typing import List, Dict, Optional
 from myth_database import MythDatabase
+from spelling import SpellingIndex
 from text_processor import TextProcessor
+from tokenizer import normalize, tokenize, tokenize_with_offsets
+from tracing import span, traced
 
 class SearchEngine:
-    def __init__(self):
+    def __init__(self, db: Optional[MythDatabase] = None, text_processor: Optional[TextProcessor] = None):
         """
         Initialize the SearchEngine with a database and text processor.
+        
+        Args:
+            db (Optional[MythDatabase]): Database to search. Default opens 'data/myths.db'.
+            text_processor (Optional[TextProcessor]): Shared text processor. Default creates one.
         """
-        self.db = MythDatabase()
-        self.text_processor = TextProcessor()
+        self.db = db if db is not None else MythDatabase()
+        self.text_processor = text_processor if text_processor is not None else TextProcessor()
 
-    def search(self, query: str) -> List[Dict]:
+    @traced()
+    def search(self, query: str, fuzzy: bool = True, language: Optional[str] = None,
+               region: Optional[str] = None, place: Optional[str] = None,
+               collapse_duplicates: bool = False, autocorrect: bool = False) -> List[Dict]:
         """
         Search myths based on a query string.
         
         Args:
-            query (str): The search query (e.g., keywords, places, characters).
+            query (str): The search query (e.g., keywords, places, characters). May be empty
+                when at least one facet filter is given.
+            fuzzy (bool): Also match misspelled or transliterated names ("Krsna" for "Krishna")
+                through the trigram/phonetic index. Default is True.
+            language (Optional[str]): Only return myths in this language.
+            region (Optional[str]): Only return myths from this region.
+            place (Optional[str]): Only return myths from this place.
+            collapse_duplicates (bool): Return only the best-ranked myth of each near-duplicate
+                cluster, listing the others in its 'duplicates'. Default is False.
+            autocorrect (bool): Replace words missing from the corpus vocabulary with their closest
+                spelling (see correct_query) before retrieval; results then carry 'corrected_query'.
+                Default is False.
         
         Returns:
             List[Dict]: A list of myth dictionaries ranked by relevance.
         """
+        facets = {'language': language, 'region': region, 'place': place}
+        corrected_query = self.correct_query(query) if autocorrect else None
+        if corrected_query:
+            results = self.search(corrected_query, fuzzy, language, region, place, collapse_duplicates)
+            for result in results:
+                result['corrected_query'] = corrected_query
+            return results
+        if not query.strip():
+            # Pure facet browsing: the composite index yields the rows directly
+            results = self.db.get_all_myths(**facets) if any(v is not None for v in facets.values()) else []
+            for result in results:
+                result['relevance_score'] = 0
+            return self._collapse_duplicates(results) if collapse_duplicates else results
+        
         # Extract keywords from query
         query_keywords = self.text_processor.extract_keywords(query)
-        query_keywords.append(query.strip())  # Include the full query as a keyword
+        query_keywords.append(normalize(query.strip()))  # Include the full query as a keyword
         
         # Search in database
-        results = self.db.search_myths(query_keywords)
+        results = self.db.search_myths(query_keywords, **facets)
         
-        # Rank results by relevance
+        # Fuzzy candidates come from the term index, never from scanning rows
+        fuzzy_hits = {}
+        if fuzzy:
+            fuzzy_hits = self.db.fuzzy_lookup(tokenize(query))
+            found_ids = {result['id'] for result in results}
+            results.extend(self.db.get_myths_by_ids(set(fuzzy_hits) - found_ids, **facets))
+        
+        # Best passage per myth, with match offsets read from the passage index
+        query_tokens = set(tokenize(query))
+        for terms in fuzzy_hits.values():
+            query_tokens.update(terms)
+        passages = self.db.best_passages([result['id'] for result in results], query_tokens)
+        
+        # For transcribed myths, find when the passage's first match was spoken in the recording.
+        # Segment offsets refer to original_text (identical to english_text for English myths).
+        segment_offsets = {}
         for result in results:
-            score = 0
-            text_to_search = (
-                result['original_text'] + ' ' +
-                result['english_text'] + ' ' +
-                result['summary'] + ' ' +
-                ' '.join(result['keywords'])
-            ).lower()
-            for keyword in query_keywords:
-                if keyword.lower() in text_to_search:
-                    score += 1
-            result['relevance_score'] = score
+            passage = passages.get(result['id'])
+            if passage and result.get('audio_path') and passage['in_original']:
+                segment_offsets[result['id']] = passage['highlights'][0][0] if passage['highlights'] else passage['start']
+        segments = self.db.locate_segments(segment_offsets) if segment_offsets else {}
+        
+        # Rank results by relevance
+        with span('ranking'):
+            for result in results:
+                # Keywords found in the pre-normalized search document, counted by the database
+                # (fuzzy-only results matched none of them)
+                score = result.get('keyword_hits', 0)
+                # Fuzzy term matches count for less than exact keyword hits
+                score += 0.5 * len(fuzzy_hits.get(result['id'], ()))
+                passage = passages.get(result['id'])
+                if passage:
+                    # Terms that occur together in one passage beat terms scattered across a long text
+                    score += passage['coverage']
+                    result['passage'] = self._passage_snippet(passage)
+                    if result['id'] in segments:
+                        result['passage']['segment'] = segments[result['id']]
+                result['relevance_score'] = score
+            
+            # Sort by relevance score
+            results = sorted(results, key=lambda x: x['relevance_score'], reverse=True)
+        return self._collapse_duplicates(results) if collapse_duplicates else results
+
+    @traced()
+    def correct_query(self, query: str) -> Optional[str]:
+        """
+        Suggest a respelling of the query ("Did you mean ...?") from the corpus vocabulary.
+        
+        Only words that never occur in the stored myths are replaced, each by the closest
+        vocabulary word (ties go to the more frequent one); stop words and short words are kept.
         
-        # Sort by relevance score
-        return sorted(results, key=lambda x: x['relevance_score'], reverse=True)
+        Args:
+            query (str): The search query as typed.
+        
+        Returns:
+            Optional[str]: The corrected query, or None when every word is known or has no close match.
+        """
+        spans = tokenize_with_offsets(query)
+        if not spans:
+            return None
+        suggestions = self.db.spelling_suggestions({token for token, _, _ in spans})
+        corrected = query
+        changed = False
+        # Replace from the end so earlier spans stay valid
+        for token, start, end in reversed(spans):
+            replacement = SpellingIndex.best(suggestions.get(token, []))
+            if replacement:
+                if query[start:end][:1].isupper():
+                    replacement = replacement[:1].upper() + replacement[1:]
+                corrected = corrected[:start] + replacement + corrected[end:]
+                changed = True
+        return corrected if changed else None
+
+    def _collapse_duplicates(self, results: List[Dict]) -> List[Dict]:
+        """
+        Keep the first (best-ranked) result of each near-duplicate cluster; the others' IDs go to its 'duplicates'.
+        """
+        clusters = self.db.get_duplicate_clusters([result['id'] for result in results])
+        representatives = {}
+        collapsed = []
+        for result in results:
+            cluster_id = clusters.get(result['id'], result['id'])
+            if cluster_id in representatives:
+                representatives[cluster_id]['duplicates'].append(result['id'])
+                continue
+            result['duplicates'] = []
+            representatives[cluster_id] = result
+            collapsed.append(result)
+        return collapsed
+
+    @staticmethod
+    def _passage_snippet(passage: Dict) -> Dict:
+        """
+        Shift the passage's highlights to be relative to its text.
+        """
+        start = passage['start']
+        return {
+            'field': passage['field'],
+            'start': start,
+            'end': passage['end'],
+            'text': passage['text'],
+            'highlights': [(s - start, e - start) for s, e in passage['highlights']],
+        }
 
 if __name__ == "__main__":
     # Example usage for testing
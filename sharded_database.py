@@ -0,0 +1,454 @@
+import heapq
+import json
+import multiprocessing
+import os
+import threading
+from contextlib import ExitStack
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from myth_database import FACET_COLUMNS, MythDatabase
+from search_engine import SearchEngine
+from tracing import traced
+
+PARTITIONS = ('hash', 'region')
+
+# Shard databases opened by write-pool processes, by path
+_process_shards: Dict[str, MythDatabase] = {}
+
+
+def _newest_first(myth: Dict):
+    return (myth.get('created_at') or '', myth['id'])
+
+
+def _insert_in_process(db_path: str, batch: List[Dict], on_duplicate: str) -> List[int]:
+    if db_path not in _process_shards:
+        # The parent's shard already backfilled (or is backfilling) the indexes
+        _process_shards[db_path] = MythDatabase(db_path, backfill=False)
+    return _process_shards[db_path].insert_myths(batch, on_duplicate)
+
+
+class ShardedMythDatabase:
+    def __init__(self, shard_dir: str = "data/shards", num_shards: int = 4, partition: str = 'hash',
+                 max_workers: Optional[int] = None, write_processes: int = 0, backfill: bool = True):
+        """
+        Initialize a MythDatabase partitioned across several SQLite files.
+
+        Each shard is an ordinary MythDatabase with its own file, indexes and write lock, so writes
+        to different shards proceed in parallel and searches fan out to all shards on a thread pool
+        (sqlite3 releases the GIL while a query runs). Myth IDs come from one increasing sequence and
+        id % num_shards is the shard, so reads by ID need no routing lookup.
+
+        A new myth that near-duplicates a stored one (in any shard) or an earlier myth of the same
+        batch is written to that myth's shard, so on_duplicate and duplicate clusters work as on a
+        single database. The exception is a kept duplicate under region partitioning, which stays
+        in its own region's shard and is not clustered with retellings from other regions.
+
+        The layout is recorded in '<shard_dir>/shards.json' on first use; an existing layout takes
+        precedence over `num_shards` and `partition`. IDs are allocated in memory, so only one
+        process should write to a shard directory at a time (any number of threads may).
+
+        Args:
+            shard_dir (str): Directory holding the shard files and layout. Default is 'data/shards'.
+            num_shards (int): Number of shard files for a new layout. Default is 4.
+            partition (str): 'hash' spreads myths evenly by ID; 'region' keeps each region in one
+                shard (assigned to the smallest shard when first seen). Default is 'hash'.
+            max_workers (Optional[int]): Threads for fan-out. Default is one per shard.
+            write_processes (int): Worker processes for insert_myths. Index maintenance on insert is
+                Python code that holds the GIL, so bulk loads only scale with the number of shards when
+                each shard's batch is written by its own process. Default is 0 (write on threads).
+            backfill (bool): Bring every shard's derived indexes up to date now; False leaves it
+                to backfill_indexes(). Default is True.
+        """
+        self.shard_dir = shard_dir
+        self.manifest_path = os.path.join(shard_dir, 'shards.json')
+        os.makedirs(shard_dir, exist_ok=True)
+        self._manifest_lock = threading.Lock()
+        self._manifest_mtime = None
+        if os.path.exists(self.manifest_path):
+            self._load_manifest()
+        else:
+            if partition not in PARTITIONS:
+                raise ValueError(f"partition must be one of {PARTITIONS}, not {partition!r}")
+            self.manifest = {'num_shards': num_shards, 'partition': partition, 'regions': {}}
+            self._save_manifest()
+        self.num_shards = self.manifest['num_shards']
+        self.partition = self.manifest['partition']
+        self.shards = [MythDatabase(os.path.join(shard_dir, f"shard_{i:03d}.db"), backfill=False)
+                       for i in range(self.num_shards)]
+        self.executor = ThreadPoolExecutor(max_workers or self.num_shards, thread_name_prefix='shard')
+        self._write_locks = [threading.Lock() for _ in self.shards]
+        self._id_lock = threading.Lock()
+        self._last_id: Optional[int] = None
+        # Spawned, not forked: the pool starts from fan-out threads, and forking a threaded process can deadlock
+        self._write_pool = ProcessPoolExecutor(
+            write_processes, mp_context=multiprocessing.get_context('spawn')) if write_processes else None
+        if backfill:
+            self.backfill_indexes()
+
+    # Routing
+
+    def _load_manifest(self):
+        with open(self.manifest_path, encoding='utf-8') as f:
+            self.manifest = json.load(f)
+        self._manifest_mtime = os.path.getmtime(self.manifest_path)
+
+    def _save_manifest(self):
+        tmp_path = self.manifest_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+        self._manifest_mtime = os.path.getmtime(self.manifest_path)
+
+    def shard_of(self, myth_id: int) -> int:
+        """
+        Return the shard number holding a myth ID.
+        """
+        return myth_id % self.num_shards
+
+    def _route_new(self, myth_data: Dict, offset: int = 0) -> int:
+        if self.partition == 'hash':
+            # The shard of the ID the myth will get (IDs are allocated in order); `offset` counts
+            # myths of the same batch routed before it
+            with self._id_lock:
+                return (self._load_last_id() + 1 + offset) % self.num_shards
+        region = myth_data.get('region') or ''
+        shard = self.manifest['regions'].get(region)
+        if shard is not None:
+            return shard
+        with self._manifest_lock:
+            # Another process may have assigned the region since the cached copy was read
+            if os.path.getmtime(self.manifest_path) != self._manifest_mtime:
+                self._load_manifest()
+            if region not in self.manifest['regions']:
+                # Fewest regions first, then fewest myths
+                regions = list(self.manifest['regions'].values())
+                loads = [(regions.count(shard), shard_db.count_myths()) for shard, shard_db in enumerate(self.shards)]
+                self.manifest['regions'][region] = loads.index(min(loads))
+                self._save_manifest()
+            return self.manifest['regions'][region]
+
+    def _route(self, myths: List[Dict], on_duplicate: str) -> List[int]:
+        """
+        Pick the shard of each new myth: the shard of its most similar near-duplicate, stored or
+        earlier in `myths`, where on_duplicate needs it found (always with hash partitioning, only
+        for skips with region partitioning); otherwise _route_new.
+        """
+        if self.partition != 'hash' and on_duplicate != 'skip':
+            return [self._route_new(myth_data) for myth_data in myths]
+        # Every shard's LSH index only holds its own myths, so each signature is looked up in all of them
+        index = self.shards[0].duplicate_index
+        signatures = [index.myth_signature(myth_data) for myth_data in myths]
+        stored = self._fan_out(lambda shard_db: shard_db.match_signatures(signatures))
+        batch_buckets: Dict[Tuple[int, int], List[int]] = {}
+        shards = []
+        fresh = 0
+        for position, (myth_data, signature) in enumerate(zip(myths, signatures)):
+            best = None
+            for shard, matches in enumerate(stored):
+                if matches[position] and (best is None or matches[position][0]['similarity'] > best[0]):
+                    best = (matches[position][0]['similarity'], shard)
+            # Texts without words have no signature: no duplicates and no buckets
+            buckets = index.buckets(signature) if signature is not None else []
+            for earlier in sorted({earlier for bucket in buckets for earlier in batch_buckets.get(bucket, ())}):
+                similarity = index.similarity(signature, signatures[earlier])
+                if similarity >= index.threshold and (best is None or similarity > best[0]):
+                    best = (similarity, shards[earlier])
+            if best is not None:
+                shards.append(best[1])
+            else:
+                shards.append(self._route_new(myth_data, fresh))
+                fresh += 1
+            for bucket in buckets:
+                batch_buckets.setdefault(bucket, []).append(position)
+        return shards
+
+    def _load_last_id(self) -> int:
+        # Called with the ID lock held
+        if self._last_id is None:
+            self._last_id = 0
+            for shard_db in self.shards:
+                conn = shard_db._connect()
+                self._last_id = max(self._last_id,
+                                    conn.execute('SELECT COALESCE(MAX(id), 0) FROM myths').fetchone()[0])
+                conn.close()
+        return self._last_id
+
+    def _next_id(self, shard: int) -> int:
+        # Called with the shard's write lock held, so IDs increase within each shard: the next ID
+        # above every allocated one that falls in this shard
+        with self._id_lock:
+            last_id = self._load_last_id()
+            myth_id = last_id + 1 + (shard - last_id - 1) % self.num_shards
+            self._last_id = myth_id
+            return myth_id
+
+    def _fan_out(self, fn: Callable, shards: Optional[Iterable[int]] = None) -> List:
+        """
+        Run fn(shard_db) on the given shards (default all) concurrently; results in shard order.
+        """
+        shards = range(self.num_shards) if shards is None else list(shards)
+        futures = [self.executor.submit(fn, self.shards[shard]) for shard in shards]
+        return [future.result() for future in futures]
+
+    def _by_shard(self, myth_ids: Iterable[int]) -> Dict[int, List[int]]:
+        groups: Dict[int, List[int]] = {}
+        for myth_id in myth_ids:
+            groups.setdefault(self.shard_of(myth_id), []).append(myth_id)
+        return groups
+
+    def _fan_out_ids(self, myth_ids: Iterable[int], fn: Callable) -> List:
+        """
+        Run fn(shard_db, ids_in_shard) for each shard owning some of `myth_ids`, concurrently.
+        """
+        groups = self._by_shard(myth_ids)
+        futures = [self.executor.submit(fn, self.shards[shard], ids) for shard, ids in groups.items()]
+        return [future.result() for future in futures]
+
+    # Writes
+
+    def insert_myth(self, myth_data: Dict, on_duplicate: str = 'keep') -> int:
+        """
+        Insert a myth into its shard (see MythDatabase.insert_myth).
+        """
+        shard = self._route([myth_data], on_duplicate)[0]
+        with self._write_locks[shard]:
+            return self.shards[shard].insert_myth(dict(myth_data, id=self._next_id(shard)), on_duplicate)
+
+    @traced('sharded_insert_myths')
+    def insert_myths(self, myths: Iterable[Dict], on_duplicate: str = 'keep') -> List[int]:
+        """
+        Insert several myths: one transaction per shard, with the shards written concurrently.
+
+        Returns:
+            List[int]: IDs of the inserted myths, in input order.
+        """
+        myths = list(myths)
+        routes = self._route(myths, on_duplicate)
+        groups: Dict[int, List[Dict]] = {}
+        positions: Dict[int, List[int]] = {}
+
+        def insert_group(shard: int, batch: List[Dict]) -> List[int]:
+            if self._write_pool is not None:
+                return self._write_pool.submit(
+                    _insert_in_process, self.shards[shard].db_path, batch, on_duplicate).result()
+            return self.shards[shard].insert_myths(batch, on_duplicate)
+
+        with ExitStack() as stack:
+            # Every target shard stays locked (in shard order, so batches can't deadlock) while IDs
+            # are allocated in input order and the groups are written: IDs stay dense and increase
+            # within each shard
+            for shard in sorted(set(routes)):
+                stack.enter_context(self._write_locks[shard])
+            for position, (myth_data, shard) in enumerate(zip(myths, routes)):
+                groups.setdefault(shard, []).append(dict(myth_data, id=self._next_id(shard)))
+                positions.setdefault(shard, []).append(position)
+            futures = {shard: self.executor.submit(insert_group, shard, batch) for shard, batch in groups.items()}
+            myth_ids = [0] * len(myths)
+            for shard, shard_positions in positions.items():
+                for position, myth_id in zip(shard_positions, futures[shard].result()):
+                    myth_ids[position] = myth_id
+        return myth_ids
+
+    def update_myth(self, myth_id: int, updates: Dict) -> bool:
+        """
+        Update a myth in place. Changing the region does not move it to another shard.
+        """
+        return self.shards[self.shard_of(myth_id)].update_myth(myth_id, updates)
+
+    def delete_myth(self, myth_id: int) -> bool:
+        return self.shards[self.shard_of(myth_id)].delete_myth(myth_id)
+
+    # Scatter-gather reads
+
+    @traced('sharded_search_myths')
+    def search_myths(self, query_keywords: List[str], language: Optional[str] = None,
+                     region: Optional[str] = None, place: Optional[str] = None) -> List[Dict]:
+        """
+        Search every shard concurrently and k-way merge the per-shard lists, newest first.
+        """
+        if region is not None and self.partition == 'region':
+            shard = self.manifest['regions'].get(region)
+            if shard is None:
+                return []
+            return self.shards[shard].search_myths(query_keywords, language, region, place)
+        results = self._fan_out(lambda shard_db: shard_db.search_myths(query_keywords, language, region, place))
+        return list(heapq.merge(*results, key=_newest_first, reverse=True))
+
+    def fuzzy_lookup(self, tokens: Iterable[str]) -> Dict[int, set]:
+        tokens = list(tokens)
+        hits = {}
+        for shard_hits in self._fan_out(lambda shard_db: shard_db.fuzzy_lookup(tokens)):
+            hits.update(shard_hits)
+        return hits
+
+    def best_passages(self, myth_ids: Iterable[int], tokens: Iterable[str]) -> Dict[int, Dict]:
+        tokens = list(tokens)
+        passages = {}
+        for shard_passages in self._fan_out_ids(myth_ids, lambda shard_db, ids: shard_db.best_passages(ids, tokens)):
+            passages.update(shard_passages)
+        return passages
+
+    def locate_segments(self, offsets: Dict[int, int]) -> Dict[int, Dict]:
+        segments = {}
+        for shard_segments in self._fan_out_ids(offsets, lambda shard_db, ids: shard_db.locate_segments(
+                {myth_id: offsets[myth_id] for myth_id in ids})):
+            segments.update(shard_segments)
+        return segments
+
+    def find_near_duplicates(self, myth_data: Dict) -> List[Dict]:
+        """
+        Near-duplicates from every shard, most similar first. Duplicate clusters are per shard;
+        inserts route near-duplicates to one shard (see __init__), so clusters only split across
+        regions under region partitioning.
+        """
+        results = self._fan_out(lambda shard_db: shard_db.find_near_duplicates(myth_data))
+        return sorted((duplicate for result in results for duplicate in result),
+                      key=lambda duplicate: (-duplicate['similarity'], duplicate['id']))
+
+    def spelling_suggestions(self, tokens: Iterable[str]) -> Dict[str, List[Tuple[str, int, int]]]:
+        """
+        Spelling candidates from every shard's vocabulary, with counts summed across shards.
+        """
+        tokens = list(tokens)
+        merged: Dict[str, Dict[str, Tuple[int, int]]] = {token: {} for token in tokens}
+        for suggestions in self._fan_out(lambda shard_db: shard_db.spelling_suggestions(tokens)):
+            for token, candidates in suggestions.items():
+                for word, distance, count in candidates:
+                    previous = merged[token].get(word, (distance, 0))
+                    merged[token][word] = (distance, previous[1] + count)
+        return {token: sorted(((word, distance, count) for word, (distance, count) in candidates.items()),
+                              key=lambda candidate: (candidate[1], -candidate[2], candidate[0]))[:3]
+                for token, candidates in merged.items()}
+
+    def get_duplicate_clusters(self, myth_ids: Iterable[int]) -> Dict[int, int]:
+        clusters = {}
+        for shard_clusters in self._fan_out_ids(myth_ids, lambda shard_db, ids: shard_db.get_duplicate_clusters(ids)):
+            clusters.update(shard_clusters)
+        return clusters
+
+    def get_myths_by_ids(self, myth_ids: Iterable[int], language: Optional[str] = None,
+                         region: Optional[str] = None, place: Optional[str] = None) -> List[Dict]:
+        results = self._fan_out_ids(myth_ids, lambda shard_db, ids: shard_db.get_myths_by_ids(
+            ids, language, region, place))
+        return list(heapq.merge(*results, key=_newest_first, reverse=True))
+
+    def get_all_myths(self, language: Optional[str] = None, region: Optional[str] = None,
+                      place: Optional[str] = None) -> List[Dict]:
+        results = self._fan_out(lambda shard_db: shard_db.get_all_myths(language, region, place))
+        return list(heapq.merge(*results, key=_newest_first, reverse=True))
+
+    def get_myths_page(self, limit: int, offset: int = 0, language: Optional[str] = None,
+                       region: Optional[str] = None, place: Optional[str] = None) -> List[Dict]:
+        """
+        One page across shards: each shard returns its first offset + limit rows and the merged
+        stream is sliced.
+        """
+        results = self._fan_out(lambda shard_db: shard_db.get_myths_page(offset + limit, 0, language, region, place))
+        merged = heapq.merge(*results, key=_newest_first, reverse=True)
+        return [myth for _, myth in zip(range(offset + limit), merged)][offset:]
+
+    def iter_myths(self, batch_size: int = 1000, after_id: int = 0) -> Iterator[Dict]:
+        """
+        Stream every myth in global ID order by merging the shards' ID-ordered streams.
+        """
+        return heapq.merge(*(shard_db.iter_myths(batch_size, after_id) for shard_db in self.shards),
+                           key=lambda myth: myth['id'])
+
+    def get_myth(self, myth_id: int) -> Optional[Dict]:
+        return self.shards[self.shard_of(myth_id)].get_myth(myth_id)
+
+    def get_segments(self, myth_id: int) -> List[Dict]:
+        return self.shards[self.shard_of(myth_id)].get_segments(myth_id)
+
+    def get_related_myths(self, myth_id: int) -> List[Dict]:
+        """
+        Related myths from the myth's own shard (each shard keeps its own neighbour graph).
+        """
+        return self.shards[self.shard_of(myth_id)].get_related_myths(myth_id)
+
+    def backfill_indexes(self, batch_size: int = 200):
+        self._fan_out(lambda shard_db: shard_db.backfill_indexes(batch_size))
+
+    def rebuild_related_myths(self) -> int:
+        return sum(self._fan_out(lambda shard_db: shard_db.rebuild_related_myths()))
+
+    def get_facet_counts(self) -> Dict[str, Dict[str, int]]:
+        """
+        Sum the shards' cached facet aggregates.
+        """
+        totals = {facet: {} for facet in FACET_COLUMNS}
+        for counts in self._fan_out(lambda shard_db: shard_db.get_facet_counts()):
+            for facet, values in counts.items():
+                for value, count in values.items():
+                    totals[facet][value] = totals[facet].get(value, 0) + count
+        return {facet: dict(sorted(values.items(), key=lambda item: (-item[1], item[0])))
+                for facet, values in totals.items()}
+
+    def get_keyword_counts(self) -> Dict[str, int]:
+        totals: Dict[str, int] = {}
+        for counts in self._fan_out(lambda shard_db: shard_db.get_keyword_counts()):
+            for keyword, count in counts.items():
+                totals[keyword] = totals.get(keyword, 0) + count
+        return totals
+
+    def count_myths(self) -> int:
+        return sum(self._fan_out(lambda shard_db: shard_db.count_myths()))
+
+    def get_cache_version(self, name: str) -> int:
+        """
+        Sum of the shards' counters: they only grow, so the sum moves whenever any shard's does.
+        """
+        return sum(self._fan_out(lambda shard_db: shard_db.get_cache_version(name)))
+
+
+class ShardedSearchEngine:
+    def __init__(self, db: ShardedMythDatabase, text_processor=None):
+        """
+        Run a full SearchEngine on every shard concurrently and merge the ranked lists.
+
+        A myth's relevance score depends only on the myth and the query, so per-shard rankings
+        merge exactly with a k-way heap merge on the score.
+
+        Args:
+            db (ShardedMythDatabase): The sharded database.
+            text_processor: Shared TextProcessor. Default creates one.
+        """
+        if text_processor is None:
+            from text_processor import TextProcessor
+            text_processor = TextProcessor()
+        self.db = db
+        self.text_processor = text_processor
+        self.engines = [SearchEngine(db=shard_db, text_processor=text_processor) for shard_db in db.shards]
+        # Spelling is corrected once against the combined vocabulary, not per shard
+        self.corrector = SearchEngine(db=db, text_processor=text_processor)
+
+    def correct_query(self, query: str) -> Optional[str]:
+        return self.corrector.correct_query(query)
+
+    @traced('sharded_search')
+    def search(self, query: str, fuzzy: bool = True, language: Optional[str] = None,
+               region: Optional[str] = None, place: Optional[str] = None,
+               collapse_duplicates: bool = False, autocorrect: bool = False) -> List[Dict]:
+        """
+        Search all shards (see SearchEngine.search); results are ranked by relevance across shards.
+        """
+        corrected_query = self.correct_query(query) if autocorrect else None
+        futures = [self.db.executor.submit(engine.search, corrected_query or query, fuzzy, language, region, place,
+                                           collapse_duplicates)
+                   for engine in self.engines]
+        results = list(heapq.merge(*(future.result() for future in futures),
+                                   key=lambda result: result['relevance_score'], reverse=True))
+        if corrected_query:
+            for result in results:
+                result['corrected_query'] = corrected_query
+        return results
+
+
+if __name__ == "__main__":
+    # Example usage: python sharded_database.py data/shards "krishna"
+    import sys
+    sharded = ShardedMythDatabase(sys.argv[1] if len(sys.argv) > 1 else "data/shards")
+    print(f"{sharded.count_myths()} myths in {sharded.num_shards} shards ({sharded.partition} partitioning)")
+    if len(sys.argv) > 2:
+        for myth in ShardedSearchEngine(sharded).search(sys.argv[2])[:10]:
+            print(myth['id'], myth['relevance_score'], myth.get('place'), (myth.get('summary') or '')[:60])
@@ -0,0 +1,203 @@
+import argparse
+import json
+import os
+import sqlite3
+import time
+from typing import Dict, List, Optional
+
+SNAPSHOT_COLUMNS = ('id', 'original_text', 'english_text', 'summary', 'keywords', 'language',
+                    'place', 'region', 'image_path', 'created_at')
+
+
+def _schema():
+    import pyarrow as pa
+    return pa.schema([
+        ('id', pa.int64()), ('original_text', pa.string()), ('english_text', pa.string()),
+        ('summary', pa.string()), ('keywords', pa.list_(pa.string())),
+        ('language', pa.string()), ('place', pa.string()), ('region', pa.string()),
+        ('image_path', pa.string()), ('created_at', pa.timestamp('s')),
+    ])
+
+
+class SnapshotExporter:
+    def __init__(self, db_path: str = "data/myths.db", snapshot_dir: str = "data/snapshots/myths",
+                 batch_size: int = 10000):
+        """
+        Export the myths table to memory-mappable Arrow IPC files for analytics.
+
+        Each run appends one part file holding the myths added since the previous run (by ID
+        watermark), reading through a read-only connection in short batches so the app's writers
+        are never blocked. The watermark only advances with new IDs: update_myth edits and
+        deletions of already-exported myths never reach incremental parts, so the snapshot drifts
+        from the database until the next full rebuild (`export(full=True)`).
+
+        Args:
+            db_path (str): Path of the live SQLite database. Default is 'data/myths.db'.
+            snapshot_dir (str): Directory for part files and the manifest. Default is 'data/snapshots/myths'.
+            batch_size (int): Rows read per query and written per record batch. Default is 10000.
+        """
+        self.db_path = db_path
+        self.snapshot_dir = snapshot_dir
+        self.batch_size = batch_size
+        self.manifest_path = os.path.join(snapshot_dir, "manifest.json")
+
+    def _connect_readonly(self) -> sqlite3.Connection:
+        uri = f"file:{os.path.abspath(self.db_path)}?mode=ro"
+        return sqlite3.connect(uri, uri=True)
+
+    def load_manifest(self) -> Dict:
+        if not os.path.exists(self.manifest_path):
+            return {'watermark': 0, 'parts': []}
+        with open(self.manifest_path, encoding='utf-8') as f:
+            return json.load(f)
+
+    def _save_manifest(self, manifest: Dict):
+        tmp_path = self.manifest_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+
+    def _read_batches(self, after_id: int):
+        # One short read transaction per batch; the keyset condition makes each query an index seek
+        last_id = after_id
+        while True:
+            conn = self._connect_readonly()
+            rows = conn.execute(f'''
+                SELECT {', '.join(SNAPSHOT_COLUMNS)} FROM myths WHERE id > ? ORDER BY id LIMIT ?
+            ''', (last_id, self.batch_size)).fetchall()
+            conn.close()
+            if not rows:
+                return
+            yield rows
+            last_id = rows[-1][0]
+
+    def _to_record_batch(self, rows: List[tuple]):
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        columns = list(zip(*rows))
+        keywords = [json.loads(value or '[]') for value in columns[4]]
+        # SQLite CURRENT_TIMESTAMP text, stored as a real timestamp so analysts can filter by time
+        created_at = pc.strptime(pa.array(columns[9], pa.string()), format='%Y-%m-%d %H:%M:%S',
+                                 unit='s', error_is_null=True)
+        arrays = [
+            pa.array(columns[0], pa.int64()),
+            pa.array(columns[1], pa.string()),
+            pa.array(columns[2], pa.string()),
+            pa.array(columns[3], pa.string()),
+            pa.array(keywords, pa.list_(pa.string())),
+            pa.array(columns[5], pa.string()),
+            pa.array(columns[6], pa.string()),
+            pa.array(columns[7], pa.string()),
+            pa.array(columns[8], pa.string()),
+            created_at,
+        ]
+        return pa.RecordBatch.from_arrays(arrays, schema=_schema())
+
+    def export(self, full: bool = False) -> Dict:
+        """
+        Write myths newer than the manifest's watermark to a new part file.
+
+        Incremental runs see only myths with IDs above the watermark, never edits or deletions
+        of exported ones; a full run replaces every part (an empty table leaves an empty snapshot).
+
+        Args:
+            full (bool): Discard existing parts and export every myth again. Default is False.
+
+        Returns:
+            Dict: The part entry written ({'file', 'rows', 'min_id', 'max_id'}), or an empty dict
+                when there was nothing new.
+        """
+        import pyarrow as pa
+        os.makedirs(self.snapshot_dir, exist_ok=True)
+        manifest = {'watermark': 0, 'parts': []} if full else self.load_manifest()
+        part_name = f"part-{int(time.time() * 1000)}-{manifest['watermark']}.arrow"
+        part_path = os.path.join(self.snapshot_dir, part_name)
+        tmp_path = part_path + '.tmp'
+
+        rows_written, min_id, max_id = 0, None, None
+        writer = None
+        try:
+            for rows in self._read_batches(manifest['watermark']):
+                batch = self._to_record_batch(rows)
+                if writer is None:
+                    # Uncompressed IPC so readers can memory-map without decoding
+                    writer = pa.ipc.new_file(tmp_path, batch.schema)
+                writer.write_batch(batch)
+                rows_written += len(rows)
+                min_id = rows[0][0] if min_id is None else min_id
+                max_id = rows[-1][0]
+            if writer is not None:
+                writer.close()
+        except BaseException:
+            # A half-written part is never referenced by the manifest; don't leave it behind
+            if writer is not None:
+                try:
+                    writer.close()
+                except Exception:
+                    pass
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        if not rows_written and not full:
+            return {}
+
+        previous_parts = [] if not full else self.load_manifest()['parts']
+        part = {}
+        if rows_written:
+            os.replace(tmp_path, part_path)
+            part = {'file': part_name, 'rows': rows_written, 'min_id': min_id, 'max_id': max_id}
+            manifest['parts'].append(part)
+            manifest['watermark'] = max_id
+        manifest['updated_at'] = time.strftime('%Y-%m-%dT%H:%M:%S')
+        self._save_manifest(manifest)
+        # Old parts are removed only after the new manifest no longer references them
+        for old in previous_parts:
+            old_path = os.path.join(self.snapshot_dir, old['file'])
+            if os.path.exists(old_path):
+                os.remove(old_path)
+        return part
+
+
+def load_snapshot(snapshot_dir: str = "data/snapshots/myths", columns: Optional[List[str]] = None):
+    """
+    Open a snapshot as one Arrow table backed by memory-mapped part files.
+
+    Only the requested columns are touched, and pages are read from disk on demand;
+    `table.to_pandas()` gives a DataFrame.
+
+    Args:
+        snapshot_dir (str): Snapshot directory written by SnapshotExporter. Default is 'data/snapshots/myths'.
+        columns (Optional[List[str]]): Columns to keep. Default is all.
+
+    Returns:
+        pyarrow.Table: The snapshot rows in ID order.
+    """
+    import pyarrow as pa
+    with open(os.path.join(snapshot_dir, "manifest.json"), encoding='utf-8') as f:
+        manifest = json.load(f)
+    tables = []
+    for part in manifest['parts']:
+        source = pa.memory_map(os.path.join(snapshot_dir, part['file']), 'r')
+        table = pa.ipc.open_file(source).read_all()
+        tables.append(table.select(columns) if columns else table)
+    if not tables:
+        schema = _schema()
+        return schema.empty_table().select(columns) if columns else schema.empty_table()
+    return pa.concat_tables(tables)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the myths table to Arrow files for analytics")
+    parser.add_argument('--db', default='data/myths.db', help="SQLite database path")
+    parser.add_argument('--out', default='data/snapshots/myths', help="Snapshot directory")
+    parser.add_argument('--full', action='store_true', help="Rebuild from scratch (picks up edits and deletions)")
+    args = parser.parse_args()
+    part = SnapshotExporter(args.db, args.out).export(full=args.full)
+    if part:
+        print(f"Wrote {part['rows']} myths (IDs {part['min_id']}-{part['max_id']}) to {part['file']}")
+    else:
+        print("Snapshot is up to date")
+
+
+if __name__ == "__main__":
+    main()
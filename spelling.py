@@ -0,0 +1,163 @@
+import sqlite3
+from itertools import combinations
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from tokenizer import TokenizedMyth
+
+
+def edit_distance(left: str, right: str, max_distance: int) -> int:
+    """
+    Damerau-Levenshtein distance (optimal string alignment), or max_distance + 1 once it is exceeded.
+    """
+    if abs(len(left) - len(right)) > max_distance:
+        return max_distance + 1
+    previous_previous = None
+    previous = list(range(len(right) + 1))
+    for i in range(1, len(left) + 1):
+        current = [i] + [0] * len(right)
+        for j in range(1, len(right) + 1):
+            cost = 0 if left[i - 1] == right[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if (i > 1 and j > 1 and left[i - 1] == right[j - 2] and left[i - 2] == right[j - 1]):
+                current[j] = min(current[j], previous_previous[j - 2] + 1)
+        if min(current) > max_distance:
+            return max_distance + 1
+        previous_previous, previous = previous, current
+    return previous[-1]
+
+
+class SpellingIndex:
+    def __init__(self, max_edit_distance: int = 2, prefix_length: int = 7):
+        """
+        Initialize the symmetric-delete spelling index (SymSpell) over the corpus vocabulary.
+
+        Every vocabulary word is stored with the strings obtained by deleting up to
+        `max_edit_distance` characters from its first `prefix_length` characters. A misspelling
+        produces the same delete variants, so its candidates are found with one indexed lookup of
+        a fixed number of variants, independent of vocabulary size.
+
+        Args:
+            max_edit_distance (int): Largest correction distance. Default is 2.
+            prefix_length (int): Characters of each word used for delete variants. Default is 7.
+        """
+        self.max_edit_distance = max_edit_distance
+        self.prefix_length = prefix_length
+
+    def init_schema(self, cursor: sqlite3.Cursor):
+        """
+        Create the index tables if they don't exist.
+        """
+        # count: occurrences across all myths
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS spelling_words (
+                word TEXT PRIMARY KEY,
+                count INTEGER NOT NULL
+            ) WITHOUT ROWID
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS spelling_deletes (
+                variant TEXT NOT NULL,
+                word TEXT NOT NULL,
+                PRIMARY KEY (variant, word)
+            ) WITHOUT ROWID
+        ''')
+
+    def deletes(self, word: str) -> Set[str]:
+        """
+        The word's prefix and every string made by deleting up to max_edit_distance of its characters.
+        """
+        prefix = word[:self.prefix_length]
+        variants = {prefix}
+        for count in range(1, min(self.max_edit_distance, len(prefix) - 1) + 1):
+            for positions in combinations(range(len(prefix)), count):
+                variants.add(''.join(char for i, char in enumerate(prefix) if i not in positions))
+        return variants
+
+    @staticmethod
+    def _word_counts(myth_data: Dict, tokens: Optional[TokenizedMyth] = None) -> Dict[str, int]:
+        tokens = tokens or TokenizedMyth(myth_data)
+        counts = {}
+        for field in ('original_text', 'english_text', 'keywords', 'place', 'region'):
+            for word in tokens.tokens(field):
+                counts[word] = counts.get(word, 0) + 1
+        return counts
+
+    def index_myth(self, cursor: sqlite3.Cursor, myth_id: int, myth_data: Dict,
+                   tokens: Optional[TokenizedMyth] = None):
+        """
+        Add a myth's words to the vocabulary using the caller's cursor; new words get their delete variants.
+        """
+        counts = self._word_counts(myth_data, tokens)
+        if not counts:
+            return
+        words = list(counts)
+        known = set()
+        for chunk_start in range(0, len(words), 500):
+            chunk = words[chunk_start:chunk_start + 500]
+            known.update(row[0] for row in cursor.execute(
+                f'SELECT word FROM spelling_words WHERE word IN ({",".join("?" * len(chunk))})', chunk))
+        cursor.executemany('''
+            INSERT INTO spelling_words (word, count) VALUES (?, ?)
+            ON CONFLICT(word) DO UPDATE SET count = count + excluded.count
+        ''', counts.items())
+        cursor.executemany('INSERT OR IGNORE INTO spelling_deletes (variant, word) VALUES (?, ?)',
+                           [(variant, word) for word in words if word not in known for variant in self.deletes(word)])
+
+    def remove_myth(self, cursor: sqlite3.Cursor, myth_id: int, myth_data: Dict,
+                    tokens: Optional[TokenizedMyth] = None):
+        """
+        Subtract a myth's words from the vocabulary; words no longer used lose their delete variants.
+        """
+        counts = self._word_counts(myth_data, tokens)
+        cursor.executemany('UPDATE spelling_words SET count = count - ? WHERE word = ?',
+                           [(count, word) for word, count in counts.items()])
+        gone = [word for word in counts if (cursor.execute(
+            'SELECT count FROM spelling_words WHERE word = ?', (word,)).fetchone() or (0,))[0] <= 0]
+        cursor.executemany('DELETE FROM spelling_deletes WHERE variant = ? AND word = ?',
+                           [(variant, word) for word in gone for variant in self.deletes(word)])
+        cursor.executemany('DELETE FROM spelling_words WHERE word = ?', [(word,) for word in gone])
+
+    def suggest(self, cursor: sqlite3.Cursor, tokens: Iterable[str],
+                max_suggestions: int = 3) -> Dict[str, List[Tuple[str, int, int]]]:
+        """
+        Look up corrections for normalized tokens.
+
+        Args:
+            cursor (sqlite3.Cursor): Database cursor.
+            tokens (Iterable[str]): Normalized words.
+            max_suggestions (int): Candidates returned per token. Default is 3.
+
+        Returns:
+            Dict[str, List[Tuple[str, int, int]]]: token -> [(word, distance, count)], closest and most
+                frequent first. A known word maps to itself at distance 0.
+        """
+        suggestions = {}
+        for token in set(tokens):
+            variants = list(self.deletes(token))
+            rows = cursor.execute(f'''
+                SELECT DISTINCT w.word, w.count FROM spelling_deletes d JOIN spelling_words w ON w.word = d.word
+                WHERE d.variant IN ({','.join('?' * len(variants))})
+            ''', variants).fetchall()
+            candidates = []
+            for word, count in rows:
+                distance = edit_distance(token, word, self.max_edit_distance)
+                if distance <= self.max_edit_distance:
+                    candidates.append((word, distance, count))
+            candidates.sort(key=lambda candidate: (candidate[1], -candidate[2], candidate[0]))
+            suggestions[token] = candidates[:max_suggestions]
+        return suggestions
+
+    @staticmethod
+    def best(candidates: List[Tuple[str, int, int]]) -> Optional[str]:
+        """
+        Pick the correction for a token: None if it is a known word or nothing is close enough.
+        """
+        if not candidates or candidates[0][1] == 0:
+            return None
+        return candidates[0][0]
+
+
+if __name__ == "__main__":
+    # Example usage for testing
+    index = SpellingIndex()
+    print(sorted(index.deletes("krishna"))[:10], len(index.deletes("krishna")))
+    print(edit_distance("krishna", "krsihna", 2), edit_distance("govardhan", "gobardan", 2))
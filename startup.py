@@ -0,0 +1,194 @@
+import importlib.abc
+import os
+import sys
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+
+
+class _TimedLoader(importlib.abc.Loader):
+    def __init__(self, loader, timer: 'ImportTimer'):
+        self.loader = loader
+        self.timer = timer
+
+    def create_module(self, spec):
+        return self.loader.create_module(spec)
+
+    def exec_module(self, module):
+        self.timer._enter(module.__name__)
+        try:
+            self.loader.exec_module(module)
+        finally:
+            self.timer._exit(module.__name__)
+
+    def __getattr__(self, attr):
+        return getattr(self.loader, attr)
+
+
+class ImportTimer(importlib.abc.MetaPathFinder):
+    def __init__(self):
+        """
+        Meta path hook that records how long each module takes to import, as a tree.
+
+        Cumulative time includes nested imports; self time excludes them.
+        """
+        self.records = []
+        self._local = threading.local()
+
+    def install(self) -> 'ImportTimer':
+        if self not in sys.meta_path:
+            sys.meta_path.insert(0, self)
+        return self
+
+    def uninstall(self):
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+
+    def find_spec(self, fullname, path, target=None):
+        # Ask the remaining finders, then wrap the loader; re-entrant lookups are passed through
+        if getattr(self._local, 'finding', False):
+            return None
+        self._local.finding = True
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, 'find_spec'):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    if spec.loader is not None and hasattr(spec.loader, 'exec_module'):
+                        spec.loader = _TimedLoader(spec.loader, self)
+                    return spec
+            return None
+        finally:
+            self._local.finding = False
+
+    def _stack(self) -> list:
+        # Warmup threads import concurrently, so nesting is tracked per thread
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _enter(self, name: str):
+        self._stack().append([name, time.perf_counter(), 0.0])
+
+    def _exit(self, name: str):
+        stack = self._stack()
+        entry_name, start, child_time = stack.pop()
+        elapsed = time.perf_counter() - start
+        if stack:
+            stack[-1][2] += elapsed
+        self.records.append({
+            'module': entry_name,
+            'depth': len(stack),
+            'cumulative_ms': elapsed * 1000,
+            'self_ms': (elapsed - child_time) * 1000,
+        })
+
+    def report(self, top: int = 25, max_depth: Optional[int] = None) -> List[Dict]:
+        """
+        Return the slowest imports by cumulative time.
+
+        Args:
+            top (int): Number of entries to return. Default is 25.
+            max_depth (Optional[int]): Only include imports at or above this nesting depth.
+
+        Returns:
+            List[Dict]: Records with 'module', 'depth', 'cumulative_ms' and 'self_ms'.
+        """
+        records = [r for r in self.records if max_depth is None or r['depth'] <= max_depth]
+        return sorted(records, key=lambda r: r['cumulative_ms'], reverse=True)[:top]
+
+
+_import_timer = None
+
+
+def install_import_timer_from_env() -> Optional[ImportTimer]:
+    """
+    Install the process-wide ImportTimer when MYTH_STARTUP_REPORT is set. Call before heavy imports.
+    """
+    global _import_timer
+    if _import_timer is None and os.environ.get('MYTH_STARTUP_REPORT', '').lower() in ('1', 'true', 'yes'):
+        _import_timer = ImportTimer().install()
+    return _import_timer
+
+
+def get_import_timer() -> Optional[ImportTimer]:
+    return _import_timer
+
+
+class Warmup:
+    def __init__(self):
+        """
+        Run named warmup tasks (model loads, index priming) in background threads and track readiness.
+        """
+        self._tasks = {}
+        self._after = {}
+        self._status = {}
+        self._timings = {}
+        self._events = {}
+        self._lock = threading.Lock()
+
+    def add(self, name: str, fn: Callable[[], object], after: Iterable[str] = ()):
+        """
+        Register a task; it starts once the tasks named in `after` have finished.
+        """
+        self._tasks[name] = fn
+        self._after[name] = tuple(after)
+        self._status[name] = 'pending'
+        self._events[name] = threading.Event()
+
+    def _run(self, name: str):
+        for dependency in self._after[name]:
+            self.wait(dependency)
+        start = time.perf_counter()
+        try:
+            self._tasks[name]()
+            status = 'ready'
+        except Exception as e:
+            status = f'failed: {e}'
+        with self._lock:
+            self._status[name] = status
+            self._timings[name] = time.perf_counter() - start
+        self._events[name].set()
+
+    def start(self) -> 'Warmup':
+        """
+        Start every pending task in its own daemon thread.
+        """
+        with self._lock:
+            pending = [name for name, status in self._status.items() if status == 'pending']
+            for name in pending:
+                self._status[name] = 'running'
+        for name in pending:
+            threading.Thread(target=self._run, args=(name,), name=f'warmup-{name}', daemon=True).start()
+        return self
+
+    def status(self) -> Dict[str, Dict]:
+        """
+        Return {task: {'status': ..., 'seconds': ...}} for every task.
+        """
+        with self._lock:
+            return {name: {'status': status, 'seconds': self._timings.get(name)}
+                    for name, status in self._status.items()}
+
+    def is_ready(self, name: str) -> bool:
+        return self._status.get(name) == 'ready'
+
+    def wait(self, name: str, timeout: Optional[float] = None) -> bool:
+        """
+        Block until a task finishes (successfully or not). Returns False on timeout.
+        """
+        event = self._events.get(name)
+        return event.wait(timeout) if event else True
+
+
+if __name__ == "__main__":
+    # Example usage: print the import tree of the app's modules
+    timer = ImportTimer().install()
+    import search_engine  # noqa: F401
+    import voice_processor  # noqa: F401
+    timer.uninstall()
+    for record in timer.report():
+        print(f"{'  ' * record['depth']}{record['module']}: {record['cumulative_ms']:.1f} ms "
+              f"(self {record['self_ms']:.1f} ms)")
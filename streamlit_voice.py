@@ -0,0 +1,74 @@
+import streamlit as st
+from typing import Dict, Optional
+from voice_processor import TranscriptionError, VoiceProcessor
+
+
+class StreamlitVoiceProcessor:
+    def __init__(self, processor: Optional[VoiceProcessor] = None):
+        """
+        Streamlit front end for VoiceProcessor: shows spinners, progress and errors as banners.
+
+        Args:
+            processor (Optional[VoiceProcessor]): The transcription core. Default creates one with the 'tiny' model.
+        """
+        self.processor = processor or VoiceProcessor()
+        st.info(f"🎤 VoiceProcessor initialized. Whisper model '{self.processor.model_name}' will load when needed.")
+
+    @staticmethod
+    def _progress(stage: str, message: str):
+        if stage in ('detecting_language', 'transcribing'):
+            st.info(f"📊 {message}")
+
+    @staticmethod
+    def _show_error(error: TranscriptionError):
+        st.error(f"❌ {error.message}")
+        if error.hint:
+            st.info(f"💡 {error.hint}")
+
+    def load_model(self):
+        """
+        Load the model without UI calls (safe from warmup threads).
+        """
+        return self.processor.load_model()
+
+    def load_whisper_model(self) -> bool:
+        """
+        Load the Whisper model if not already loaded, with a spinner.
+
+        Returns:
+            bool: True if model loaded successfully, False otherwise.
+        """
+        if self.processor.model is not None:
+            return True
+        try:
+            with st.spinner(f"Loading Whisper model '{self.processor.model_name}'... This may take a moment."):
+                self.processor.load_model()
+            st.success(f"✅ Whisper '{self.processor.model_name}' model loaded successfully!")
+            return True
+        except TranscriptionError as e:
+            self._show_error(e)
+            return False
+
+    def transcribe_audio(self, audio_data: bytes, filename: str = "temp_audio.wav",
+                         language: Optional[str] = None) -> Optional[Dict]:
+        """
+        Transcribe audio data, reporting progress and errors in the page.
+
+        Args:
+            audio_data (bytes): Raw audio data (e.g., from file upload).
+            filename (str): Name of the audio file (used for extension detection). Default is 'temp_audio.wav'.
+            language (Optional[str]): The spoken language if the user chose one; detected otherwise.
+
+        Returns:
+            Optional[Dict]: The result of VoiceProcessor.transcribe, or None if transcription fails.
+        """
+        if not self.load_whisper_model():
+            return None
+        try:
+            with st.spinner("🤖 Transcribing audio..."):
+                result = self.processor.transcribe(audio_data, filename, language, progress=self._progress)
+        except TranscriptionError as e:
+            self._show_error(e)
+            return None
+        st.success("✅ Audio transcribed successfully!")
+        return result
@@ -0,0 +1,119 @@
+import asyncio
+import json
+
+import pytest
+from api_server import MythAPIServer
+from audio_store import AudioStore
+from autocomplete import Autocomplete
+from myth_database import MythDatabase
+
+
+@pytest.fixture
+def server(tmp_path):
+    db = MythDatabase(str(tmp_path / "myths.db"))
+    return MythAPIServer(db=db, audio_store=AudioStore(str(tmp_path / "audio")),
+                         autocomplete=Autocomplete(str(tmp_path / "autocomplete.json")))
+
+
+def request(server, raw: bytes):
+    """Send one raw HTTP request through handle_connection and return (status, decoded body)."""
+
+    async def exchange():
+        listener = await asyncio.start_server(server.handle_connection, '127.0.0.1', 0)
+        port = listener.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        writer.write(raw)
+        await writer.drain()
+        response = await reader.read()
+        writer.close()
+        listener.close()
+        await listener.wait_closed()
+        return response
+
+    response = asyncio.run(exchange())
+    head, _, body = response.partition(b'\r\n\r\n')
+    status = int(head.split(b' ')[1])
+    if b'chunked' in head.lower():
+        chunks, rest = [], body
+        while True:
+            size_line, _, rest = rest.partition(b'\r\n')
+            size = int(size_line, 16)
+            if not size:
+                break
+            chunks.append(rest[:size])
+            rest = rest[size + 2:]
+        body = b''.join(chunks)
+    return status, json.loads(body)
+
+
+def get(server, target: str):
+    return request(server, f"GET {target} HTTP/1.1\r\nHost: test\r\nConnection: close\r\n\r\n".encode())
+
+
+@pytest.mark.parametrize("target", ["/myths?limit=0", "/myths?limit=-1", "/myths?offset=-5",
+                                    "/search?q=rama&limit=-1", "/suggest?q=ra&limit=0"])
+def test_out_of_range_paging_parameters_are_rejected(server, target):
+    status, body = get(server, target)
+    assert status == 400
+    assert "must be at least" in body['error']
+
+
+def test_non_integer_parameter_is_rejected(server):
+    assert get(server, "/myths?limit=ten")[0] == 400
+
+
+def test_valid_paging_parameters_are_accepted(server):
+    status, body = get(server, "/myths?limit=1&offset=0")
+    assert status == 200 and body == []
+
+
+@pytest.mark.parametrize("length", [b"abc", b"-1"])
+def test_malformed_content_length_is_a_bad_request(server, length):
+    status, body = request(server, b"POST /myths HTTP/1.1\r\nHost: test\r\nContent-Length: " + length + b"\r\n\r\n{}")
+    assert status == 400
+    assert body == {'error': "Malformed Content-Length header"}
+
+
+def sample_myth(**fields):
+    myth = {'original_text': 'Krishna lifted the hill.', 'english_text': 'Krishna lifted the hill.',
+            'summary': 'Krishna lifted a hill.', 'keywords': ['Krishna'], 'language': 'en',
+            'place': 'Mathura', 'region': 'North'}
+    myth.update(fields)
+    return myth
+
+
+def test_edits_and_deletes_update_suggestions(server):
+    server.autocomplete.sync(server.db)
+    myth_id = server._insert_myth(sample_myth())
+    assert [s['text'] for s in server.autocomplete.suggest('kri')] == ['Krishna']
+    assert server._update_myth(myth_id, {'keywords': ['Rama']})
+    assert server.autocomplete.suggest('kri') == []
+    assert [s['text'] for s in server.autocomplete.suggest('ram')] == ['Rama']
+    assert server._delete_myth(myth_id)
+    assert server.autocomplete.suggest('ram') == []
+    # Every write went through the index, so it still matches the database
+    assert not server.autocomplete.refresh(server.db)
+
+
+def test_snapshot_is_rebuilt_after_outside_writes(tmp_path):
+    db = MythDatabase(str(tmp_path / "myths.db"))
+    myth_id = db.insert_myth(sample_myth())
+    snapshot_path = str(tmp_path / "autocomplete.json")
+    autocomplete = Autocomplete.open(db, snapshot_path)
+    assert [s['text'] for s in autocomplete.suggest('kri')] == ['Krishna']
+    # Same myth count, different keywords: only the version counter shows the change
+    db.update_myth(myth_id, {'keywords': ['Rama']})
+    assert Autocomplete.open(db, snapshot_path).suggest('kri') == []
+    assert autocomplete.refresh(db)
+    assert [s['text'] for s in autocomplete.suggest('ram')] == ['Rama']
+
+
+def test_non_utf8_form_field_is_a_bad_request(server):
+    boundary = b'xyz'
+    body = (b'--xyz\r\nContent-Disposition: form-data; name="audio"; filename="a.wav"\r\n\r\nRIFF\r\n'
+            b'--xyz\r\nContent-Disposition: form-data; name="place"\r\n\r\n\xff\xfe\r\n--xyz--\r\n')
+    status, body = request(server, b"POST /transcribe HTTP/1.1\r\nHost: test\r\nConnection: close\r\n"
+                                   b"Content-Type: multipart/form-data; boundary=" + boundary + b"\r\n"
+                                   b"Content-Length: " + str(len(body)).encode() + b"\r\n\r\n" + body)
+    assert status == 400
+    assert body == {'error': "Form fields must be UTF-8 text"}
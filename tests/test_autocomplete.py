@@ -0,0 +1,51 @@
+import pytest
+from autocomplete import SHORT_PREFIX_TOP, Autocomplete
+from myth_database import MythDatabase
+
+# More keywords under one prefix than the precomputed short-prefix lists hold
+KEYWORDS = [f"kashyap{i:02d}" for i in range(SHORT_PREFIX_TOP + 6)]
+
+
+def myth(i, **fields):
+    data = {'original_text': f"Story {i}.", 'english_text': f"Story {i}.", 'summary': f"Story {i}.",
+            'keywords': KEYWORDS, 'language': 'en', 'place': 'Mathura', 'region': 'North'}
+    data.update(fields)
+    return data
+
+
+@pytest.fixture
+def autocomplete(tmp_path):
+    db = MythDatabase(str(tmp_path / "myths.db"))
+    db.insert_myths([myth(1), myth(2), myth(3, place='Kashi', keywords=[])])
+    return Autocomplete(str(tmp_path / "autocomplete.json")).build(db)
+
+
+@pytest.mark.parametrize("prefix", ["ka", "kash"])
+def test_kinds_are_filtered_before_the_list_is_cut(autocomplete, prefix):
+    assert [s['text'] for s in autocomplete.suggest(prefix, limit=2, kinds=['place'])] == ['Kashi']
+    assert [s['kind'] for s in autocomplete.suggest(prefix, limit=2)] == ['keyword', 'keyword']
+
+
+def test_short_prefixes_scan_when_the_precomputed_list_is_too_short(autocomplete):
+    suggestions = autocomplete.suggest('k', limit=50)
+    assert len(suggestions) == len(KEYWORDS) + 1
+    assert suggestions[-1]['text'] == 'Kashi'
+
+
+def test_new_terms_reach_short_prefixes_without_changing_earlier_lists(autocomplete):
+    before = autocomplete.suggest('m')
+    top = autocomplete._short['m']
+    snapshot = list(top)
+    for _ in range(3):
+        autocomplete.add_myth({'keywords': ['Manthara'], 'place': 'Madurai'})
+    assert top == snapshot
+    assert [s['text'] for s in autocomplete.suggest('m')] == ['Madurai', 'Manthara', 'Mathura']
+    assert before == [{'text': 'Mathura', 'kind': 'place', 'weight': 2}]
+
+
+def test_suggestions_rank_by_weight_and_match_later_words(tmp_path):
+    db = MythDatabase(str(tmp_path / "myths.db"))
+    db.insert_myths([myth(1, keywords=['Krishna'], region='Uttar Pradesh'), myth(2, keywords=['Krishna', 'Kripa'])])
+    autocomplete = Autocomplete(str(tmp_path / "autocomplete.json")).build(db)
+    assert [(s['text'], s['weight']) for s in autocomplete.suggest('kri')] == [('Krishna', 2), ('Kripa', 1)]
+    assert [s['text'] for s in autocomplete.suggest('prad', kinds=['region'])] == ['Uttar Pradesh']
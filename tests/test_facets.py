@@ -0,0 +1,68 @@
+import sqlite3
+
+import pytest
+from myth_database import MythDatabase
+
+
+def myth(i, **fields):
+    text = f"Story {i} of the river."
+    data = {'original_text': text, 'english_text': text, 'summary': text, 'keywords': ['river'],
+            'language': 'en', 'place': 'Varanasi', 'region': 'North'}
+    data.update(fields)
+    return data
+
+
+@pytest.fixture
+def db(tmp_path):
+    return MythDatabase(str(tmp_path / "myths.db"))
+
+
+def test_facet_counts_follow_insert_update_and_delete(db):
+    first = db.insert_myth(myth(1))
+    db.insert_myth(myth(2, language='hi', place='Madurai', region='South'))
+    assert db.get_facet_counts() == {'language': {'en': 1, 'hi': 1}, 'region': {'North': 1, 'South': 1},
+                                     'place': {'Madurai': 1, 'Varanasi': 1}}
+
+    db.update_myth(first, {'region': 'South', 'place': 'Madurai'})
+    assert db.get_facet_counts()['region'] == {'South': 2}
+    assert db.get_facet_counts()['place'] == {'Madurai': 2}
+
+    db.delete_myth(first)
+    assert db.get_facet_counts() == {'language': {'hi': 1}, 'region': {'South': 1}, 'place': {'Madurai': 1}}
+    assert db.count_myths() == 1
+
+
+def test_facet_filters_select_matching_rows(db):
+    db.insert_myths([myth(1), myth(2, region='South'), myth(3, language='hi')])
+    assert {m['summary'] for m in db.get_all_myths(region='North')} == {myth(1)['summary'], myth(3)['summary']}
+    assert [m['summary'] for m in db.get_all_myths(language='hi', region='North')] == [myth(3)['summary']]
+    assert db.get_all_myths(place='Nowhere') == []
+
+
+def test_count_falls_back_to_the_table_while_facets_backfill(db):
+    db.insert_myths([myth(i) for i in range(3)])
+    conn = sqlite3.connect(db.db_path)
+    conn.execute("UPDATE index_state SET last_myth_id = 0 WHERE name = 'facets'")
+    conn.execute('DELETE FROM facet_counts')
+    conn.commit()
+    conn.close()
+    assert db.count_myths() == 3
+    db.backfill_indexes()
+    assert db.get_facet_counts()['language'] == {'en': 3}
+    assert db.count_myths() == 3
+
+
+def test_lookup_by_many_ids_is_chunked_and_newest_first(db):
+    ids = db.insert_myths([myth(i, created_at=f"2024-01-01 00:{i // 60:02d}:{i % 60:02d}") for i in range(1200)])
+    results = db.get_myths_by_ids(ids + [10 ** 9], region='North')
+    assert len(results) == 1200
+    assert [m['id'] for m in results] == ids[::-1]
+
+
+def test_pages_tolerate_null_keywords(db):
+    myth_id = db.insert_myth(myth(1))
+    conn = sqlite3.connect(db.db_path)
+    conn.execute('UPDATE myths SET keywords = NULL WHERE id = ?', (myth_id,))
+    conn.commit()
+    conn.close()
+    assert [m['keywords'] for m in db.get_myths_page(10)] == [[]]
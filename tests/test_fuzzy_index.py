@@ -0,0 +1,56 @@
+import pytest
+from fuzzy_index import FuzzyIndex, edit_distance, phonetic_key
+from myth_database import MythDatabase
+from search_engine import SearchEngine
+from text_processor import TextProcessor
+
+
+def myth(text, **fields):
+    data = {'original_text': text, 'english_text': text, 'summary': text, 'keywords': [], 'language': 'en'}
+    data.update(fields)
+    return data
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = MythDatabase(str(tmp_path / "myths.db"))
+    db.insert_myth(myth("The king crossed the river to Lanka."))
+    db.insert_myth(myth("Krishna lifted the hill at Mathura.", summary="The boy Krishna lifts a hill.",
+                        keywords=['Govardhan']))
+    return db
+
+
+@pytest.mark.parametrize("spelling", ["Krishna", "Krsna", "Krishn", "कृष्ण"])
+def test_spellings_and_scripts_share_a_phonetic_key(spelling):
+    assert phonetic_key(spelling) == "krsn"
+
+
+def test_edit_distance_stops_past_the_limit():
+    assert edit_distance("lanka", "lanca", 1) == 1
+    assert edit_distance("lanka", "mathura", 1) == 2
+
+
+def test_names_exclude_stop_words_and_sentence_initial_words():
+    terms = FuzzyIndex.terms_for(myth("They met Rama. The sage blessed Rama at Ayodhya. Sita waited."))
+    assert terms == {'rama', 'ayodhya'}
+
+
+def test_sentence_initial_word_that_is_also_a_name_elsewhere_is_kept():
+    terms = FuzzyIndex.terms_for(myth("Rama left. Hanuman followed Rama.", place='Ayodhya'))
+    assert terms == {'rama', 'ayodhya'}
+
+
+def test_summary_confirms_a_sentence_initial_name():
+    data = myth("Krishna lifted the hill.", summary="A tale of Krishna.")
+    assert FuzzyIndex.terms_for(data) == {'krishna'}
+    assert FuzzyIndex.terms_for(myth("Krishna lifted the hill.")) == set()
+
+
+@pytest.mark.parametrize("query, expected", [("krsna", {2}), ("Lankaa", {1}), ("govardan", {2})])
+def test_misspelled_and_transliterated_queries_match(db, query, expected):
+    assert set(db.fuzzy_lookup([query.lower()])) == expected
+
+
+@pytest.mark.parametrize("query", ["they", "the hero"])
+def test_stop_words_do_not_match_unrelated_myths(db, query):
+    assert SearchEngine(db=db, text_processor=TextProcessor()).search(query) == []
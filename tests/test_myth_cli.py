@@ -0,0 +1,64 @@
+import json
+
+import pytest
+from myth_cli import Checkpoint, default_checkpoint_path, main
+from myth_database import MythDatabase
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    path = tmp_path / "corpus.jsonl"
+    records = [{'original_text': f"Story number {i} about the river.", 'english_text': f"Story number {i} about the river.",
+                'language': 'en', 'keywords': ['river']} for i in range(5)]
+    path.write_text(''.join(json.dumps(record) + '\n' for record in records), encoding='utf-8')
+    return path
+
+
+def test_same_source_imports_into_each_database(tmp_path, corpus):
+    first, second = str(tmp_path / "t2.db"), str(tmp_path / "t3.db")
+    main(['--db', first, 'import', str(corpus), '--batch-size', '2'])
+    main(['--db', second, 'import', str(corpus), '--batch-size', '2'])
+    assert MythDatabase(first).count_myths() == 5
+    assert MythDatabase(second).count_myths() == 5
+
+
+def test_completed_import_is_not_repeated(tmp_path, corpus):
+    db_path = str(tmp_path / "myths.db")
+    main(['--db', db_path, 'import', str(corpus)])
+    main(['--db', db_path, 'import', str(corpus)])
+    assert MythDatabase(db_path).count_myths() == 5
+
+
+def test_checkpoint_for_another_database_is_ignored(tmp_path, corpus):
+    path = str(tmp_path / "shared.checkpoint.json")
+    Checkpoint(path, str(corpus), str(tmp_path / "a.db")).save(120, 3, complete=True)
+    assert Checkpoint(path, str(corpus), str(tmp_path / "a.db")).complete
+    other = Checkpoint(path, str(corpus), str(tmp_path / "b.db"))
+    assert (other.position, other.imported, other.complete) == (0, 0, False)
+
+
+def test_default_checkpoint_lives_next_to_the_database(tmp_path, corpus):
+    path = default_checkpoint_path(str(tmp_path / "db" / "myths.db"), str(corpus))
+    assert path == str(tmp_path / "db" / "myths.db.corpus.jsonl.checkpoint.json")
+
+
+def test_malformed_records_are_skipped_and_not_retried(tmp_path, corpus, capsys):
+    lines = corpus.read_text(encoding='utf-8').splitlines(keepends=True)
+    lines[1:1] = ['{"original_text": "broken\n', '["not", "an", "object"]\n', '{"language": "en"}\n']
+    corpus.write_text(''.join(lines), encoding='utf-8')
+    db_path = str(tmp_path / "myths.db")
+    main(['--db', db_path, 'import', str(corpus), '--batch-size', '2'])
+    assert MythDatabase(db_path).count_myths() == 5
+    assert "Skipped 3 malformed records" in capsys.readouterr().err
+    main(['--db', db_path, 'import', str(corpus)])
+    assert MythDatabase(db_path).count_myths() == 5
+
+
+def test_parquet_export_imports_again(tmp_path, corpus):
+    pytest.importorskip("pyarrow")
+    source, target = str(tmp_path / "source.db"), str(tmp_path / "target.db")
+    main(['--db', source, 'import', str(corpus)])
+    main(['--db', source, 'export', str(tmp_path / "myths.parquet")])
+    main(['--db', target, 'import', str(tmp_path / "myths.parquet")])
+    assert sorted(m['summary'] for m in MythDatabase(target).get_all_myths()) == sorted(
+        m['summary'] for m in MythDatabase(source).get_all_myths())
@@ -0,0 +1,61 @@
+import pytest
+from myth_database import MythDatabase
+from myth_record import MythRecord, RecordLayout, load_texts
+
+
+class CountingLoader:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, myth_ids):
+        self.calls.append(list(myth_ids))
+        return {myth_id: (f"original {myth_id}", f"english {myth_id}") for myth_id in myth_ids if myth_id != 99}
+
+
+def record(myth_id, loader):
+    return MythRecord(RecordLayout(('id', 'summary', 'keywords'), loader), (myth_id, f"Summary {myth_id}", '["hero"]'))
+
+
+def test_texts_load_on_first_access_only():
+    loader = CountingLoader()
+    myth = record(1, loader)
+    assert myth['summary'] == "Summary 1" and 'original_text' in myth
+    assert loader.calls == []
+    assert myth['english_text'] == "english 1" and myth['original_text'] == "original 1"
+    assert loader.calls == [[1]]
+
+
+def test_load_texts_fetches_many_records_in_one_call():
+    loader = CountingLoader()
+    records = [record(myth_id, loader) for myth_id in (1, 2, 99)]
+    load_texts(records)
+    assert loader.calls == [[1, 2, 99]]
+    assert [myth['original_text'] for myth in records] == ["original 1", "original 2", None]
+    load_texts(records)
+    assert len(loader.calls) == 1
+
+
+def test_records_behave_like_dicts():
+    myth = record(1, CountingLoader())
+    myth['relevance_score'] = 2.5
+    assert myth['keywords'] == ['hero']
+    assert list(myth) == ['id', 'summary', 'keywords', 'original_text', 'english_text', 'relevance_score']
+    assert myth.to_dict() == {'id': 1, 'summary': "Summary 1", 'keywords': ['hero'], 'original_text': "original 1",
+                              'english_text': "english 1", 'relevance_score': 2.5}
+    assert myth.get('place') is None
+    with pytest.raises(KeyError):
+        MythRecord(RecordLayout(('id',)), (1,))['original_text']
+
+
+def test_database_listings_return_lazy_records(tmp_path):
+    db = MythDatabase(str(tmp_path / "myths.db"))
+    myth_id = db.insert_myth({'original_text': "राम कथा", 'english_text': "The story of Rama", 'summary': "Rama",
+                              'keywords': ['Rama'], 'language': 'hi'})
+    listed = db.get_all_myths()[0]
+    assert isinstance(listed, MythRecord) and listed._texts is None
+    assert listed['keywords'] == ['Rama']
+    assert listed['original_text'] == "राम कथा" and listed['english_text'] == "The story of Rama"
+
+    stale = db.get_all_myths()[0]
+    db.delete_myth(myth_id)
+    assert stale['summary'] == "Rama" and stale['english_text'] is None
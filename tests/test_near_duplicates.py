@@ -0,0 +1,57 @@
+import pytest
+from myth_database import MythDatabase
+from near_duplicates import NearDuplicateIndex
+
+GOVARDHAN = "Krishna lifted the Govardhan hill on his little finger to shelter the villagers of Braj from the rain of Indra for seven days."
+
+
+def myth(text, **fields):
+    data = {'original_text': text, 'english_text': text, 'summary': text[:40], 'keywords': [], 'language': 'en'}
+    data.update(fields)
+    return data
+
+
+@pytest.fixture
+def db(tmp_path):
+    return MythDatabase(str(tmp_path / "myths.db"))
+
+
+def test_similarity_estimates_jaccard():
+    index = NearDuplicateIndex()
+    same = index.signature(GOVARDHAN)
+    assert index.similarity(same, index.signature(GOVARDHAN.upper())) == 1.0
+    retelling = index.signature(GOVARDHAN.replace("seven days", "seven nights"))
+    assert 0.8 <= index.similarity(same, retelling) < 1.0
+    other = index.signature("Rama crossed the ocean to Lanka with an army of monkeys and bears.")
+    assert index.similarity(same, other) < 0.2
+
+
+def test_text_without_words_has_no_signature():
+    index = NearDuplicateIndex()
+    assert index.signature("") is None
+    assert index.signature("... !!") is None
+
+
+@pytest.mark.parametrize("threshold, expected", [(0.8, True), (0.99, False)])
+def test_threshold_decides_what_counts_as_a_duplicate(tmp_path, threshold, expected):
+    db = MythDatabase(str(tmp_path / "myths.db"))
+    db.duplicate_index.threshold = threshold
+    stored = db.insert_myth(myth(GOVARDHAN))
+    duplicates = db.find_near_duplicates(myth(GOVARDHAN.replace("seven days", "seven nights")))
+    assert [d['id'] for d in duplicates] == ([stored] if expected else [])
+
+
+def test_duplicates_join_the_first_myths_cluster(db):
+    first = db.insert_myth(myth(GOVARDHAN))
+    second = db.insert_myth(myth(GOVARDHAN.replace("seven days", "seven nights")))
+    other = db.insert_myth(myth("Rama crossed the ocean to Lanka with an army of monkeys and bears."))
+    assert db.get_duplicate_clusters([first, second, other]) == {first: first, second: first, other: other}
+    assert db.insert_myth(myth(GOVARDHAN), on_duplicate='skip') == first
+
+
+def test_myths_without_words_are_not_duplicates_of_each_other(db):
+    first = db.insert_myth(myth("", original_text="..."))
+    second = db.insert_myth(myth("", original_text="..."), on_duplicate='skip')
+    assert second != first
+    assert db.find_near_duplicates(myth("")) == []
+    assert db.get_duplicate_clusters([first, second]) == {}
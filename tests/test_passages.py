@@ -0,0 +1,62 @@
+import pytest
+from myth_database import MythDatabase
+from passages import split_passages
+
+
+def myth(text, **fields):
+    data = {'original_text': text, 'english_text': text, 'summary': text[:40], 'keywords': [], 'language': 'en'}
+    data.update(fields)
+    return data
+
+
+@pytest.fixture
+def db(tmp_path):
+    return MythDatabase(str(tmp_path / "myths.db"))
+
+
+def test_passages_cover_the_text_and_end_on_sentences():
+    text = "Krishna lifted the hill. " * 30 + "Then Rama crossed the ocean to Lanka. " * 10
+    spans = split_passages(text, target_chars=100, max_chars=200)
+    assert spans[0][0] == 0 and spans[-1][1] == len(text)
+    assert all(end == next_start for (_, end), (next_start, _) in zip(spans, spans[1:]))
+    assert all(text[start:end].endswith(". ") for start, end in spans[:-1])
+    assert all(end - start <= 200 for start, end in spans)
+
+
+def test_unpunctuated_text_is_cut_at_whitespace():
+    text = "word " * 100
+    spans = split_passages(text, target_chars=50, max_chars=60)
+    assert all(text[start:end].endswith(" ") and end - start <= 60 for start, end in spans[:-1])
+    assert split_passages("a" * 25, target_chars=5, max_chars=10) == [(0, 10), (10, 20), (20, 25)]
+
+
+def test_best_passage_highlights_point_into_the_text(db):
+    text = "Krishna lifted the hill. " * 20 + "Then Rama crossed the ocean to Lanka. " * 3
+    myth_id = db.insert_myth(myth(text))
+    passage = db.best_passages([myth_id], ['rama', 'lanka'])[myth_id]
+    assert passage['field'] == 'english_text' and passage['in_original']
+    assert passage['text'] == text[passage['start']:passage['end']]
+    assert passage['matched'] == ['lanka', 'rama'] and passage['coverage'] == 1.0
+    assert passage['highlights']
+    for start, end in passage['highlights']:
+        assert passage['start'] <= start < end <= passage['end']
+        assert text[start:end] in ("Rama", "Lanka")
+
+
+def test_original_text_offsets_are_kept_apart_from_english(db):
+    original = "राम ने रावण को हराया। " * 3
+    myth_id = db.insert_myth(myth("Rama defeated Ravana.", original_text=original, language='hi'))
+    passage = db.best_passages([myth_id], ['रावण'])[myth_id]
+    assert passage['field'] == 'original_text' and passage['in_original']
+    assert [original[start:end] for start, end in passage['highlights']] == ["रावण"] * 3
+
+    english = db.best_passages([myth_id], ['ravana'])[myth_id]
+    assert english['field'] == 'english_text' and not english['in_original']
+
+
+def test_unmatched_and_deleted_myths_are_omitted(db):
+    kept = db.insert_myth(myth("Rama crossed the ocean."))
+    deleted = db.insert_myth(myth("Rama returned to Ayodhya."))
+    db.delete_myth(deleted)
+    assert set(db.best_passages([kept, deleted], ['rama'])) == {kept}
+    assert db.best_passages([kept], ['hanuman']) == {}
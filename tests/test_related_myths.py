@@ -0,0 +1,72 @@
+import sqlite3
+
+import pytest
+from myth_database import MythDatabase
+
+# Unrelated stories first: a term shared by the only two myths in the corpus has no IDF weight
+STORIES = [
+    "Ganga descended from the matted hair of Shiva to the plains.",
+    "Markandeya clung to Shiva's linga when Yama came for his life.",
+    "Savitri followed Yama and won back the life of Satyavan.",
+    "Durga rode a lion into battle against the buffalo demon Mahishasura.",
+    "Krishna lifted Govardhan hill to shelter the cowherds from the storm.",
+    "The cowherds of Braj sheltered under Govardhan hill while Krishna held it up.",
+    "Rama built a bridge of floating stones across the ocean to Lanka.",
+    "The monkey army carried stones to build the bridge to Lanka for Rama.",
+]
+
+
+def myth(text, **fields):
+    data = {'original_text': text, 'english_text': text, 'summary': text[:40], 'keywords': [], 'language': 'en'}
+    data.update(fields)
+    return data
+
+
+def stored_count(db):
+    conn = sqlite3.connect(db.db_path)
+    value = conn.execute("SELECT value FROM related_stats WHERE name = 'myths'").fetchone()[0]
+    conn.close()
+    return value
+
+
+@pytest.fixture
+def db(tmp_path):
+    return MythDatabase(str(tmp_path / "myths.db"))
+
+
+def related_ids(db, myth_id):
+    return [m['id'] for m in db.get_related_myths(myth_id)]
+
+
+def test_inserted_myth_links_to_its_neighbours_both_ways(db):
+    ids = db.insert_myths([myth(text) for text in STORIES])
+    assert related_ids(db, ids[5])[0] == ids[4]
+    assert ids[5] in related_ids(db, ids[4])
+    assert related_ids(db, ids[7])[0] == ids[6]
+    scores = [m['similarity'] for m in db.get_related_myths(ids[4])]
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_neighbour_lists_hold_at_most_k_myths(db):
+    db.related_index.k = 2
+    ids = db.insert_myths([myth(f"Krishna lifted Govardhan hill, telling {i}.") for i in range(5)]
+                          + [myth(text) for text in STORIES[:4]])
+    assert max(len(db.get_related_myths(myth_id)) for myth_id in ids) == 2
+
+
+def test_deleting_a_myth_removes_it_from_every_list(db):
+    ids = db.insert_myths([myth(text) for text in STORIES])
+    db.delete_myth(ids[4])
+    assert db.get_related_myths(ids[4]) == []
+    assert all(ids[4] not in related_ids(db, myth_id) for myth_id in ids if myth_id != ids[4])
+    assert stored_count(db) == len(STORIES) - 1
+
+
+def test_corpus_counter_follows_inserts_updates_and_rebuilds(db):
+    ids = db.insert_myths([myth(text) for text in STORIES])
+    assert stored_count(db) == len(STORIES)
+    db.update_myth(ids[4], {'english_text': "Krishna danced on the hoods of the serpent Kaliya."})
+    assert stored_count(db) == len(STORIES)
+    assert db.rebuild_related_myths() == len(STORIES)
+    assert stored_count(db) == len(STORIES)
+    assert related_ids(db, ids[7])[0] == ids[6]
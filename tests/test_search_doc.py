@@ -0,0 +1,51 @@
+import sqlite3
+
+from myth_database import MythDatabase, build_search_doc
+
+
+def myth(**fields):
+    data = {'original_text': "ராமர் கடலைக் கடந்தார்", 'english_text': "RĀMA crossed the Ｓea.",
+            'summary': "Straße to Lanka", 'keywords': ['Setu', 'Lanka'], 'language': 'ta'}
+    data.update(fields)
+    return data
+
+
+def stored_doc(db, myth_id):
+    conn = sqlite3.connect(db.db_path)
+    doc = conn.execute('SELECT search_doc FROM myths WHERE id = ?', (myth_id,)).fetchone()[0]
+    conn.close()
+    return doc
+
+
+def test_search_doc_joins_and_folds_every_searchable_field():
+    assert build_search_doc(myth()) == "ராமர் கடலைக் கடந்தார் rāma crossed the sea. strasse to lanka setu lanka"
+
+
+def test_search_doc_tolerates_missing_fields():
+    assert build_search_doc({'english_text': "Rama", 'keywords': None}) == " rama  "
+
+
+def test_search_doc_is_stored_and_refreshed_on_update(tmp_path):
+    db = MythDatabase(str(tmp_path / "myths.db"))
+    myth_id = db.insert_myth(myth())
+    assert stored_doc(db, myth_id) == build_search_doc(myth())
+    db.update_myth(myth_id, {'keywords': ['Hanuman']})
+    assert stored_doc(db, myth_id).endswith("strasse to lanka hanuman")
+
+
+def test_queries_match_regardless_of_case_and_width(tmp_path):
+    db = MythDatabase(str(tmp_path / "myths.db"))
+    myth_id = db.insert_myth(myth())
+    for keyword in ["rāma", "sea", "strasse", "ராமர்"]:
+        assert [m['id'] for m in db.search_myths([keyword])] == [myth_id]
+
+
+def test_rows_without_search_doc_are_backfilled(tmp_path):
+    db = MythDatabase(str(tmp_path / "myths.db"))
+    myth_id = db.insert_myth(myth())
+    conn = sqlite3.connect(db.db_path)
+    conn.execute('UPDATE myths SET search_doc = NULL')
+    conn.commit()
+    conn.close()
+    db.backfill_indexes()
+    assert stored_doc(db, myth_id) == build_search_doc(myth())
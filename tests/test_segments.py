@@ -0,0 +1,40 @@
+import pytest
+from myth_database import MythDatabase
+
+
+def myth(text, segments, **fields):
+    data = {'original_text': text, 'english_text': text, 'summary': text, 'keywords': [], 'language': 'en',
+            'segments': segments}
+    data.update(fields)
+    return data
+
+
+@pytest.fixture
+def db(tmp_path):
+    return MythDatabase(str(tmp_path / "myths.db"))
+
+
+def test_segments_store_offsets_into_the_transcript(db):
+    myth_id = db.insert_myth(myth("Rama left. Sita followed.", [
+        {'start': 0.0, 'end': 1.5, 'text': " Rama left."}, {'start': 1.5, 'end': 3.0, 'text': "Sita followed."}]))
+    assert db.get_segments(myth_id) == [
+        {'start_ms': 0, 'end_ms': 1500, 'text_start': 0, 'text_end': 10},
+        {'start_ms': 1500, 'end_ms': 3000, 'text_start': 11, 'text_end': 25},
+    ]
+
+
+def test_locate_segments_picks_the_segment_containing_each_offset(db):
+    segments = [{'start': 0.0, 'end': 1.0, 'text': "Rama left."}, {'start': 1.0, 'end': 2.0, 'text': "Sita followed."}]
+    first = db.insert_myth(myth("Rama left. Sita followed.", segments))
+    second = db.insert_myth(myth("Rama left. Sita followed.", segments, summary="Again"))
+    plain = db.insert_myth(myth("No recording.", []))
+    assert db.locate_segments({first: 0, second: 12, plain: 0}) == {
+        first: {'start_ms': 0, 'end_ms': 1000}, second: {'start_ms': 1000, 'end_ms': 2000}}
+    assert db.locate_segments({first: 100}) == {}
+
+
+def test_locate_segments_handles_more_myths_than_one_chunk(db):
+    ids = db.insert_myths([myth(f"Story {i}.", [{'start': i, 'end': i + 1, 'text': f"Story {i}."}]) for i in range(600)])
+    located = db.locate_segments({myth_id: 0 for myth_id in ids})
+    assert len(located) == 600
+    assert located[ids[-1]] == {'start_ms': 599000, 'end_ms': 600000}
@@ -0,0 +1,78 @@
+import pytest
+from sharded_database import ShardedMythDatabase, ShardedSearchEngine
+
+GOVARDHAN = "Krishna lifted the Govardhan hill on his little finger to shelter the villagers of Braj from the rain of Indra for seven days."
+
+
+def myth(text, **fields):
+    data = {'original_text': text, 'english_text': text, 'summary': text[:40], 'keywords': [], 'language': 'en'}
+    data.update(fields)
+    return data
+
+
+def stories(count):
+    return [myth(f"Story number {i} about a different village {i * 7} and its {i * 13} guardian spirits.",
+                 created_at=f"2024-01-01 00:{i // 60:02d}:{i % 60:02d}", region=f"Region {i % 3}")
+            for i in range(count)]
+
+
+@pytest.fixture
+def sharded(tmp_path):
+    return ShardedMythDatabase(str(tmp_path / "shards"), num_shards=3)
+
+
+def shard_holding(db, myth_id):
+    return [shard for shard, shard_db in enumerate(db.shards) if shard_db.get_myth(myth_id)]
+
+
+def test_ids_are_unique_and_name_their_shard(sharded):
+    ids = sharded.insert_myths(stories(10)) + [sharded.insert_myth(myth("A single story of the hills."))]
+    assert len(set(ids)) == 11
+    assert all(shard_holding(sharded, myth_id) == [myth_id % 3] for myth_id in ids)
+    assert sorted({myth_id % 3 for myth_id in ids}) == [0, 1, 2]
+    assert sharded.count_myths() == 11
+
+
+def test_near_duplicates_are_written_to_the_original_shard(sharded):
+    first = sharded.insert_myth(myth(GOVARDHAN))
+    batch = sharded.insert_myths(stories(4) + [myth(GOVARDHAN.replace("seven days", "seven nights"))])
+    assert batch[-1] % 3 == first % 3
+    assert sharded.get_duplicate_clusters([first, batch[-1]]) == {first: first, batch[-1]: first}
+    assert sharded.insert_myth(myth(GOVARDHAN), on_duplicate='skip') == first
+    assert sharded.count_myths() == 6
+
+
+def test_duplicates_within_one_batch_share_a_shard(sharded):
+    ids = sharded.insert_myths([myth(GOVARDHAN), myth("Rama crossed the ocean to Lanka."),
+                                myth(GOVARDHAN.replace("seven days", "seven nights"))])
+    assert ids[0] % 3 == ids[2] % 3
+
+
+def test_region_partitioning_keeps_a_region_together(tmp_path):
+    sharded = ShardedMythDatabase(str(tmp_path / "shards"), num_shards=3, partition='region')
+    ids = sharded.insert_myths(stories(9))
+    by_region = {}
+    for myth_id, data in zip(ids, stories(9)):
+        by_region.setdefault(data['region'], set()).add(myth_id % 3)
+    assert all(len(shards) == 1 for shards in by_region.values())
+    assert ShardedMythDatabase(str(tmp_path / "shards"), num_shards=5).partition == 'region'
+
+
+def test_pages_merge_across_shards_newest_first(sharded):
+    ids = sharded.insert_myths(stories(25))
+    pages = [sharded.get_myths_page(10, offset) for offset in (0, 10, 20)]
+    assert [len(page) for page in pages] == [10, 10, 5]
+    assert [m['id'] for page in pages for m in page] == ids[::-1]
+    assert [m['id'] for m in sharded.get_all_myths()] == ids[::-1]
+    assert [m['id'] for m in sharded.get_myths_page(5, 0, region='Region 1')] == [
+        myth_id for myth_id, data in zip(ids, stories(25)) if data['region'] == 'Region 1'][::-1][:5]
+
+
+def test_lookups_by_id_merge_and_search_spans_shards(sharded):
+    ids = sharded.insert_myths(stories(6) + [myth("Rama crossed the ocean to Lanka.")])
+    assert [m['id'] for m in sharded.get_myths_by_ids(ids[:6])] == ids[:6][::-1]
+    assert [m['id'] for m in list(sharded.iter_myths(batch_size=2))] == ids
+    results = ShardedSearchEngine(sharded).search("village")
+    assert {result['id'] for result in results} == set(ids[:6])
+    scores = [result['relevance_score'] for result in results]
+    assert scores == sorted(scores, reverse=True)
@@ -0,0 +1,63 @@
+import os
+
+import pytest
+from myth_database import MythDatabase
+from snapshot import SnapshotExporter
+
+pytest.importorskip("pyarrow")
+from snapshot import load_snapshot  # noqa: E402
+
+
+def myth(i):
+    text = f"Myth {i} of the hills."
+    return {'original_text': text, 'english_text': text, 'summary': text, 'keywords': ['hills'],
+            'language': 'en', 'place': '', 'region': '', 'image_path': ''}
+
+
+def test_full_export_of_emptied_table_clears_old_parts(tmp_path):
+    db = MythDatabase(str(tmp_path / "myths.db"))
+    ids = db.insert_myths([myth(i) for i in range(3)])
+    exporter = SnapshotExporter(db.db_path, str(tmp_path / "snap"))
+    old_part = exporter.export()
+    assert old_part['rows'] == 3
+
+    for myth_id in ids:
+        db.delete_myth(myth_id)
+    # Incremental runs never see deletions
+    assert exporter.export() == {}
+    assert load_snapshot(exporter.snapshot_dir).num_rows == 3
+
+    assert exporter.export(full=True) == {}
+    assert exporter.load_manifest()['parts'] == [] and exporter.load_manifest()['watermark'] == 0
+    assert not os.path.exists(os.path.join(exporter.snapshot_dir, old_part['file']))
+    assert load_snapshot(exporter.snapshot_dir).num_rows == 0
+
+
+def test_incremental_export_appends_new_ids(tmp_path):
+    db = MythDatabase(str(tmp_path / "myths.db"))
+    db.insert_myths([myth(i) for i in range(2)])
+    exporter = SnapshotExporter(db.db_path, str(tmp_path / "snap"))
+    exporter.export()
+    db.insert_myth(myth(2))
+    part = exporter.export()
+    assert (part['rows'], part['min_id'], part['max_id']) == (1, 3, 3)
+    assert load_snapshot(exporter.snapshot_dir, columns=['id']).column('id').to_pylist() == [1, 2, 3]
+
+
+def test_failed_export_leaves_no_temporary_part(tmp_path, monkeypatch):
+    db = MythDatabase(str(tmp_path / "myths.db"))
+    db.insert_myths([myth(i) for i in range(3)])
+    exporter = SnapshotExporter(db.db_path, str(tmp_path / "snap"), batch_size=1)
+
+    def fail_after_first_batch(rows, _calls=[]):
+        _calls.append(rows)
+        if len(_calls) > 1:
+            raise RuntimeError("disk full")
+        return original(rows)
+
+    original = exporter._to_record_batch
+    monkeypatch.setattr(exporter, '_to_record_batch', fail_after_first_batch)
+    with pytest.raises(RuntimeError):
+        exporter.export()
+    assert [name for name in os.listdir(exporter.snapshot_dir) if name.endswith('.tmp')] == []
+    assert exporter.load_manifest()['parts'] == []
@@ -0,0 +1,66 @@
+import pytest
+from myth_database import MythDatabase
+from search_engine import SearchEngine
+from spelling import SpellingIndex, edit_distance
+from text_processor import TextProcessor
+
+
+def myth(text, **fields):
+    data = {'original_text': text, 'english_text': text, 'summary': text, 'keywords': [], 'language': 'en'}
+    data.update(fields)
+    return data
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = MythDatabase(str(tmp_path / "myths.db"))
+    db.insert_myth(myth("Krishna lifted Govardhan hill.", keywords=['Govardhan'], place='Mathura'))
+    db.insert_myth(myth("Krishna danced with the gopis.", keywords=['Krishna']))
+    db.insert_myth(myth("Karna gave away his armour.", place='Anga'))
+    return db
+
+
+@pytest.mark.parametrize("left, right, expected", [
+    ("krishna", "krishna", 0), ("krishna", "krsihna", 1), ("krishna", "krishn", 1), ("govardhan", "gobardan", 2),
+])
+def test_edit_distance_counts_transpositions_as_one(left, right, expected):
+    assert edit_distance(left, right, 2) == expected
+
+
+def test_edit_distance_stops_past_the_limit():
+    assert edit_distance("krishna", "karna", 1) == 2
+    assert edit_distance("krishna", "kri", 2) == 3
+
+
+def test_deletes_are_taken_from_the_prefix_only():
+    index = SpellingIndex(max_edit_distance=1, prefix_length=4)
+    assert index.deletes("krishna") == {'kris', 'ris', 'kis', 'krs', 'kri'}
+
+
+@pytest.mark.parametrize("token, expected", [("krsihna", "krishna"), ("govardan", "govardhan"), ("mathra", "mathura")])
+def test_misspellings_are_corrected_from_the_vocabulary(db, token, expected):
+    assert SpellingIndex.best(db.spelling_suggestions([token])[token]) == expected
+
+
+def test_known_and_distant_words_are_not_corrected(db):
+    suggestions = db.spelling_suggestions(['krishna', 'hanuman'])
+    assert suggestions['krishna'][0] == ('krishna', 0, 5)
+    assert SpellingIndex.best(suggestions['krishna']) is None
+    assert suggestions['hanuman'] == []
+
+
+def test_equally_close_candidates_rank_by_frequency(db):
+    assert db.spelling_suggestions(['krina'])['krina'] == [('krishna', 2, 5), ('karna', 2, 2)]
+
+
+def test_removed_words_leave_the_vocabulary(db):
+    assert SpellingIndex.best(db.spelling_suggestions(['karma'])['karma']) == 'karna'
+    karna = db.search_myths(['karna'])[0]['id']
+    db.delete_myth(karna)
+    assert db.spelling_suggestions(['karma'])['karma'] == []
+
+
+def test_corrected_query_keeps_known_words_and_capitals(db):
+    engine = SearchEngine(db=db, text_processor=TextProcessor())
+    assert engine.correct_query("Krsihna on Govardan hill") == "Krishna on Govardhan hill"
+    assert engine.correct_query("krishna hill") is None
@@ -0,0 +1,49 @@
+import pytest
+from tokenizer import TokenizedMyth, normalize, script_of, stem, tokenize, tokenize_with_offsets
+
+
+def test_normalize_folds_width_and_case():
+    assert normalize("ＲＡＭＡ Straße") == "rama strasse"
+    assert normalize(None) == ''
+
+
+def test_english_stop_words_and_short_words_are_dropped():
+    assert tokenize("The hero Rāma fought bravely near Ayodhya.") == ['hero', 'rāma', 'fought', 'bravely', 'near', 'ayodhya']
+    assert tokenize("The hero", remove_stop_words=False, min_length=1) == ['the', 'hero']
+
+
+def test_hindi_tokens_keep_matras_and_drop_stop_words():
+    assert tokenize("राम ने रावण को हराया।", lang='hi') == ['राम', 'रावण', 'हराया']
+
+
+def test_indic_tokens_are_not_subject_to_the_latin_length_floor():
+    assert tokenize("ராமர் ஒரு வீரர்", lang='ta') == ['ராமர்', 'வீரர்']
+
+
+def test_mixed_script_runs_are_split():
+    assert tokenize("Ramaराम") == ['rama', 'राम']
+    assert [script_of(char) for char in "aरர"] == ['latn', 'deva', 'taml']
+
+
+def test_offsets_point_into_the_original_text():
+    text = "Rāma met Sītā in अयोध्या."
+    spans = tokenize_with_offsets(text)
+    assert spans == [('rāma', 0, 4), ('met', 5, 8), ('sītā', 9, 13), ('अयोध्या', 17, 24)]
+    assert [text[start:end] for _, start, end in spans] == ["Rāma", "met", "Sītā", "अयोध्या"]
+
+
+@pytest.mark.parametrize("token, lang, expected", [
+    ("fighting", 'en', "fight"), ("gods", None, "god"), ("गाँवों", 'hi', "गाँव"), ("is", 'en', "is"),
+])
+def test_stem_strips_one_suffix(token, lang, expected):
+    assert stem(token, lang) == expected
+
+
+def test_tokenized_myth_matches_tokenize():
+    data = {'english_text': "The hero Rama fought Ravana.", 'keywords': ['Rama', 'Lanka'],
+            'original_text': "राम ने रावण को हराया।"}
+    tokens = TokenizedMyth(data)
+    assert tokens.tokens('english_text') == tokenize(data['english_text'])
+    assert tokens.tokens('original_text', lang='hi', use_stemming=True) == tokenize(
+        data['original_text'], lang='hi', use_stemming=True)
+    assert tokens.tokens('keywords') == ['rama', 'lanka']
@@ -0,0 +1,99 @@
+import pytest
+from translator import TranslationCache, Translator, split_sentences
+
+
+class StubTranslator(Translator):
+    """Translator whose model is a function: records every batch sent to it."""
+
+    def __init__(self, cache_path: str, **kwargs):
+        super().__init__("unused-model-dir", cache=TranslationCache(cache_path), **kwargs)
+        self.calls = []
+
+    def _generate(self, sentences, source_lang):
+        self.calls.append((source_lang, list(sentences)))
+        return [f"<{source_lang}>{sentence}" for sentence in sentences]
+
+
+class StubBatch(dict):
+    def to(self, device):
+        return self
+
+
+class StubTokenizer:
+    """Marian-style tokenizer stand-in: the 'token ids' are the sentences themselves."""
+
+    def __call__(self, sentences, **kwargs):
+        return StubBatch(input_ids=list(sentences))
+
+    def batch_decode(self, generated, skip_special_tokens=True):
+        return [f"EN {sentence}" for sentence in generated]
+
+
+class StubModel:
+    def __init__(self):
+        self.batches = []
+
+    def generate(self, input_ids, **kwargs):
+        self.batches.append(list(input_ids))
+        return input_ids
+
+
+@pytest.fixture
+def translator(tmp_path):
+    return StubTranslator(str(tmp_path / "cache.db"))
+
+
+def test_split_sentences_handles_danda():
+    assert split_sentences("राम वन गए। सीता साथ थीं॥ The end.") == ["राम वन गए।", "सीता साथ थीं॥", "The end."]
+
+
+def test_sentences_are_batched_across_documents(translator):
+    texts = ["एक। दो।", "दो। तीन।"]
+    assert translator.translate_batch(texts, "hi") == ["<hi>एक। <hi>दो।", "<hi>दो। <hi>तीन।"]
+    # One model call for both documents, each distinct sentence once
+    assert translator.calls == [("hi", ["एक।", "दो।", "तीन।"])]
+    assert translator.stats['sentences'] == 3 and translator.stats['cached'] == 0
+
+
+def test_cache_hits_are_keyed_by_text_and_source_language(translator, tmp_path):
+    translator.translate_batch(["एक। दो।"], "hi")
+    translator.calls.clear()
+
+    # Same sentences, same language: served from the cache without calling the model
+    assert translator.translate_batch(["दो। एक।"], "hi") == ["<hi>दो। <hi>एक।"]
+    assert translator.calls == []
+    assert translator.stats['cached'] == 2
+
+    # Same text in another language is a different cache key
+    translator.translate_batch(["एक।"], "mr")
+    assert translator.calls == [("mr", ["एक।"])]
+
+    # The cache persists: a new translator on the same file only translates the new sentence
+    fresh = StubTranslator(str(tmp_path / "cache.db"))
+    fresh.translate_batch(["एक। तीन।"], "hi")
+    assert fresh.calls == [("hi", ["तीन।"])]
+    cache = TranslationCache(str(tmp_path / "cache.db"))
+    assert cache.get_many(["एक।", "तीन।"], "hi") == {"एक।": "<hi>एक।", "तीन।": "<hi>तीन।"}
+    assert cache.get_many(["तीन।"], "mr") == {}
+
+
+def test_english_is_passed_through(translator):
+    assert translator.translate_batch(["Already English."], "en") == ["Already English."]
+    assert translator.calls == []
+
+
+def test_throughput_counts_only_generation_time(translator):
+    translator.translate_batch(["एक। दो।"], "hi")
+    translator.translate_batch(["एक। दो।"] * 50, "hi")  # fully cached call
+    assert translator.stats['model_seconds'] <= translator.stats['seconds']
+    assert translator.throughput() == translator.stats['sentences'] / translator.stats['model_seconds']
+
+
+def test_generate_sorts_and_batches_by_length(tmp_path):
+    pytest.importorskip("torch")
+    translator = Translator("unused-model-dir", cache=TranslationCache(str(tmp_path / "cache.db")), batch_size=2)
+    model = StubModel()
+    translator._models[translator._model_dir("hi")] = (StubTokenizer(), model)
+    sentences = ["ccc।", "a।", "bb।"]
+    assert translator.translate_batch([" ".join(sentences)], "hi") == ["EN ccc। EN a। EN bb।"]
+    assert model.batches == [["a।", "bb।"], ["ccc।"]]
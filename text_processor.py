@@ -1,17 +1,36 @@
-import re
-from typing import List
+import os
+from typing import Dict, List, Optional
+from tokenizer import tokenize
+from tracing import traced
 
 class TextProcessor:
-    def __init__(self):
+    def __init__(self, translation_model_path: Optional[str] = None):
         """
         Initialize the TextProcessor with basic text processing capabilities.
+        
+        Args:
+            translation_model_path (Optional[str]): Local MarianMT/NLLB model directory. Defaults to the
+                MYTH_TRANSLATION_MODEL environment variable; without a model, translation falls back to
+                tagging the original text.
+        """
+        self.translation_model_path = translation_model_path or os.environ.get("MYTH_TRANSLATION_MODEL")
+        self._translator = None
+
+    @property
+    def translator(self):
+        """
+        Lazily construct the local translator so transformers/torch load only on first use.
         """
-        pass
+        if self._translator is None and self.translation_model_path:
+            from translator import Translator
+            self._translator = Translator(self.translation_model_path)
+        return self._translator
 
+    @traced()
     def translate_to_english(self, text: str, source_lang: str) -> str:
         """
-        Translate the input text to English. Currently a placeholder that returns the original text
-        with a translation note if not already in English.
+        Translate the input text to English using the local translation model. Without a
+        configured model, returns the original text with a translation note.
         
         Args:
             text (str): The text to translate.
@@ -20,10 +39,27 @@ class TextProcessor:
         Returns:
             str: Translated text (or original text with a note).
         """
+        return self.translate_batch([text], source_lang)[0]
+
+    @traced()
+    def translate_batch(self, texts: List[str], source_lang: str) -> List[str]:
+        """
+        Translate several texts to English in one pass, sharing sentence batches and the cache.
+        
+        Args:
+            texts (List[str]): The texts to translate.
+            source_lang (str): The source language code.
+        
+        Returns:
+            List[str]: Translated texts in input order.
+        """
         if source_lang == "en":
-            return text
-        return f"{text} [Translated from {source_lang}]"
+            return list(texts)
+        if self.translator is None:
+            return [f"{text} [Translated from {source_lang}]" for text in texts]
+        return self.translator.translate_batch(texts, source_lang)
 
+    @traced()
     def create_summary(self, text: str) -> str:
         """
         Create a summary by taking the first two sentences or the first 100 characters.
@@ -42,33 +78,21 @@ class TextProcessor:
         else:
             return text[:100] + "..." if len(text) > 100 else text
 
-    def extract_keywords(self, text: str, num_keywords: int = 5) -> List[str]:
+    @traced()
+    def extract_keywords(self, text: str, num_keywords: int = 5, lang: Optional[str] = None) -> List[str]:
         """
         Extract keywords from the text based on word frequency, filtering out stop words.
         
         Args:
             text (str): The text to extract keywords from.
             num_keywords (int): The number of keywords to return. Default is 5.
+            lang (Optional[str]): Language code selecting the stop-word list. Default uses all lists.
         
         Returns:
             List[str]: A list of extracted keywords.
         """
-        # Clean text and convert to lowercase
-        clean_text = re.sub(r'[^\w\s]', '', text.lower())
-        words = clean_text.split()
-        
-        # Common stop words to filter out
-        stop_words = {
-            'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
-            'of', 'with', 'by', 'is', 'was', 'are', 'were', 'be', 'been', 'have',
-            'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could', 'should',
-            'this', 'that', 'these', 'those', 'i', 'you', 'he', 'she', 'it', 'we',
-            'they', 'me', 'him', 'her', 'us', 'them', 'my', 'your', 'his', 'her',
-            'its', 'our', 'their', 'from', 'up', 'about', 'into', 'over', 'after'
-        }
-        
-        # Filter out stop words and short words
-        filtered_words = [word for word in words if word not in stop_words and len(word) > 2]
+        # Normalize, split and drop stop words/short words with the shared tokenizer
+        filtered_words = tokenize(text, lang=lang)
         
         # Count word frequency
         word_count = {}
@@ -81,6 +105,44 @@ class TextProcessor:
         
         return keywords if keywords else ['story', 'myth', 'tale']
 
+    def complete_myths(self, records: List[Dict]) -> List[Dict]:
+        """
+        Fill in missing English text, summaries and keywords for a batch of myth records.
+        
+        Records are grouped by language so each group is translated in one batch.
+        
+        Args:
+            records (List[Dict]): Myth dictionaries with at least 'original_text'; other fields are kept.
+        
+        Returns:
+            List[Dict]: Complete myth dictionaries ready for MythDatabase.insert_myth, in input order.
+        
+        Raises:
+            ValueError: If a record has no 'original_text'.
+        """
+        completed = []
+        pending = {}
+        for record in records:
+            if not record.get('original_text'):
+                raise ValueError("'original_text' is required")
+            myth = dict(record)
+            myth['language'] = myth.get('language') or 'en'
+            for field in ('place', 'region', 'image_path'):
+                myth[field] = myth.get(field) or ''
+            if not myth.get('english_text'):
+                pending.setdefault(myth['language'], []).append(myth)
+            completed.append(myth)
+        for language, myths in pending.items():
+            translations = self.translate_batch([m['original_text'] for m in myths], language)
+            for myth, translation in zip(myths, translations):
+                myth['english_text'] = translation
+        for myth in completed:
+            if not myth.get('summary'):
+                myth['summary'] = self.create_summary(myth['english_text'])
+            if not myth.get('keywords'):
+                myth['keywords'] = self.extract_keywords(myth['english_text'])
+        return completed
+
 if __name__ == "__main__":
     # Example usage for testing
     tp = TextProcessor()
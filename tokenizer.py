@@ -0,0 +1,249 @@
+import bisect
+import re
+import unicodedata
+from typing import Dict, List, Optional, Tuple
+
+# Indic scripts live in parallel 128-codepoint blocks from U+0900 (Devanagari) to U+0D7F (Malayalam)
+SCRIPT_BLOCKS = [
+    (0x0900, 0x097F, 'deva'), (0x0980, 0x09FF, 'beng'), (0x0A00, 0x0A7F, 'guru'),
+    (0x0A80, 0x0AFF, 'gujr'), (0x0B00, 0x0B7F, 'orya'), (0x0B80, 0x0BFF, 'taml'),
+    (0x0C00, 0x0C7F, 'telu'), (0x0C80, 0x0CFF, 'knda'), (0x0D00, 0x0D7F, 'mlym'),
+]
+SCRIPT_BLOCK_STARTS = [start for start, _, _ in SCRIPT_BLOCKS]
+
+# Word characters plus Indic vowel signs/viramas (category M*, which `\w` does not match) and
+# zero-width (non-)joiners used inside Indic words. Danda punctuation (U+0964/U+0965) is excluded.
+TOKEN_RE = re.compile(r'(?:[^\W_]|[\u0300-\u036f\u0900-\u0963\u0966-\u0d7f\u200c\u200d])+')
+
+STOP_WORDS = {
+    'en': frozenset({
+        'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
+        'of', 'with', 'by', 'is', 'was', 'are', 'were', 'be', 'been', 'have',
+        'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could', 'should',
+        'this', 'that', 'these', 'those', 'i', 'you', 'he', 'she', 'it', 'we',
+        'they', 'me', 'him', 'her', 'us', 'them', 'my', 'your', 'his',
+        'its', 'our', 'their', 'from', 'up', 'about', 'into', 'over', 'after'
+    }),
+    'hi': frozenset({
+        'और', 'का', 'की', 'के', 'को', 'में', 'से', 'पर', 'है', 'हैं', 'था', 'थी', 'थे',
+        'एक', 'यह', 'वह', 'ये', 'वे', 'भी', 'तो', 'ही', 'ने', 'कि', 'जो', 'हो', 'गया', 'गई'
+    }),
+    'mr': frozenset({
+        'आणि', 'हे', 'ही', 'तो', 'ती', 'ते', 'या', 'व', 'की', 'आहे', 'होते', 'होता', 'एक', 'मध्ये'
+    }),
+    'ta': frozenset({
+        'ஒரு', 'மற்றும்', 'அது', 'இது', 'அந்த', 'இந்த', 'என்று', 'உள்ள', 'அவர்', 'அவன்', 'அவள்'
+    }),
+    'te': frozenset({
+        'ఒక', 'మరియు', 'ఆ', 'ఈ', 'అది', 'ఇది', 'అని', 'కూడా', 'లో', 'వారు'
+    }),
+    'bn': frozenset({
+        'এবং', 'একটি', 'এক', 'এই', 'সেই', 'যে', 'করে', 'ছিল', 'থেকে', 'জন্য', 'না'
+    }),
+    'gu': frozenset({
+        'અને', 'એક', 'આ', 'તે', 'છે', 'હતો', 'હતી', 'માં', 'થી', 'પણ'
+    }),
+    'kn': frozenset({
+        'ಒಂದು', 'ಮತ್ತು', 'ಈ', 'ಆ', 'ಅವರು', 'ಇದು', 'ಅದು', 'ಎಂದು'
+    }),
+    'ml': frozenset({
+        'ഒരു', 'ഈ', 'ആ', 'അത്', 'ഇത്', 'എന്ന്', 'അവൻ', 'അവൾ'
+    }),
+    'pa': frozenset({
+        'ਅਤੇ', 'ਇੱਕ', 'ਦਾ', 'ਦੀ', 'ਦੇ', 'ਨੂੰ', 'ਵਿੱਚ', 'ਤੋਂ', 'ਹੈ', 'ਸੀ'
+    }),
+    'or': frozenset({
+        'ଏବଂ', 'ଏକ', 'ଏହି', 'ସେହି', 'ଥିଲା', 'ରେ', 'ପାଇଁ'
+    }),
+}
+
+# Light suffix stripping, longest suffix first; a stem must keep at least two characters
+STEM_SUFFIXES = {
+    'en': ('ingly', 'edly', 'ings', 'ing', 'ies', 'ed', 'es', 's'),
+    'hi': ('ियों', 'ियाँ', 'ाओं', 'ाएं', 'ों', 'ें', 'ीं', 'ाँ', 'ा', 'ी', 'े'),
+    'mr': ('ांना', 'ाचा', 'ाची', 'ाचे', 'ांनी', 'ला', 'ने', 'त'),
+}
+
+
+def normalize(text: Optional[str]) -> str:
+    """
+    Normalize text for indexing and querying: NFKC compatibility folding plus Unicode casefolding.
+
+    NFKC maps nukta and vowel-sign sequences to one canonical form, so text typed with
+    different input methods compares equal; casefold handles non-ASCII scripts that SQL LOWER() skips.
+
+    Args:
+        text (Optional[str]): The text to normalize. None is treated as empty.
+
+    Returns:
+        str: The normalized text.
+    """
+    if not text:
+        return ''
+    return unicodedata.normalize('NFKC', text).casefold()
+
+
+# Word lists are compiled once into the same normal form as indexed text
+STOP_WORDS = {lang: frozenset(normalize(w) for w in words) for lang, words in STOP_WORDS.items()}
+ALL_STOP_WORDS = frozenset().union(*STOP_WORDS.values())
+STEM_SUFFIXES = {lang: tuple(normalize(s) for s in suffixes) for lang, suffixes in STEM_SUFFIXES.items()}
+
+
+def script_of(char: str) -> str:
+    """
+    Return a short script tag for a character ('latn' for anything outside the Indic blocks).
+    """
+    code = ord(char)
+    if code < 0x0900:
+        return 'latn'
+    block = bisect.bisect_right(SCRIPT_BLOCK_STARTS, code) - 1
+    start, end, script = SCRIPT_BLOCKS[block]
+    return script if code <= end else 'latn'
+
+
+def _split_scripts(token: str) -> List[str]:
+    # Break mixed-script runs such as "रामkatha" into one token per script
+    parts = []
+    current = token[0]
+    current_script = script_of(token[0])
+    for char in token[1:]:
+        script = current_script if char in '\u200c\u200d' else script_of(char)
+        if script != current_script:
+            parts.append(current)
+            current, current_script = char, script
+        else:
+            current += char
+    parts.append(current)
+    return parts
+
+
+def stem(token: str, lang: Optional[str] = None) -> str:
+    """
+    Strip a common inflectional suffix from a normalized token.
+
+    Args:
+        token (str): A normalized token.
+        lang (Optional[str]): Language code; inferred from the script when omitted.
+
+    Returns:
+        str: The stemmed token, or the token unchanged when no suffix applies.
+    """
+    if lang is None:
+        lang = 'en' if script_of(token[0]) == 'latn' else 'hi'
+    for suffix in STEM_SUFFIXES.get(lang, ()):
+        if token.endswith(suffix) and len(token) - len(suffix) >= 2:
+            return token[:-len(suffix)]
+    return token
+
+
+def _keep(token: str, stop_words: frozenset, min_length: int) -> bool:
+    # Indic syllables pack several code points, so the length floor applies to Latin only
+    return token not in stop_words and not (len(token) < min_length and script_of(token[0]) == 'latn')
+
+
+def tokenize(text: Optional[str], lang: Optional[str] = None, remove_stop_words: bool = True,
+             min_length: int = 3, use_stemming: bool = False) -> List[str]:
+    """
+    Split text into normalized, script-aware tokens.
+
+    Args:
+        text (Optional[str]): The text to tokenize.
+        lang (Optional[str]): Language code selecting the stop-word list; all lists are used when omitted.
+        remove_stop_words (bool): Drop stop words. Default is True.
+        min_length (int): Minimum token length in code points (Latin tokens only). Default is 3.
+        use_stemming (bool): Apply light suffix stripping. Default is False.
+
+    Returns:
+        List[str]: Tokens in text order.
+    """
+    stop_words = STOP_WORDS.get(lang, ALL_STOP_WORDS) if remove_stop_words else frozenset()
+    tokens = []
+    for match in TOKEN_RE.findall(normalize(text)):
+        for token in _split_scripts(match):
+            if _keep(token, stop_words, min_length):
+                tokens.append(stem(token, lang) if use_stemming else token)
+    return tokens
+
+
+def tokenize_with_offsets(text: Optional[str], lang: Optional[str] = None, remove_stop_words: bool = True,
+                          min_length: int = 3) -> List[Tuple[str, int, int]]:
+    """
+    Tokenize like tokenize(), but keep each token's character span in the original text.
+    
+    Matching runs on the raw text and each match is normalized on its own, so the spans
+    point into the text as stored (for highlighting) while the tokens compare equal to query tokens.
+    
+    Args:
+        text (Optional[str]): The text to tokenize.
+        lang (Optional[str]): Language code selecting the stop-word list; all lists are used when omitted.
+        remove_stop_words (bool): Drop stop words. Default is True.
+        min_length (int): Minimum token length in code points (Latin tokens only). Default is 3.
+    
+    Returns:
+        List[Tuple[str, int, int]]: (normalized token, start, end) in text order.
+    """
+    stop_words = STOP_WORDS.get(lang, ALL_STOP_WORDS) if remove_stop_words else frozenset()
+    tokens = []
+    for match in TOKEN_RE.finditer(text or ''):
+        start = match.start()
+        for part in _split_scripts(match.group()):
+            end = start + len(part)
+            token = normalize(part)
+            if token and _keep(token, stop_words, min_length):
+                tokens.append((token, start, end))
+            start = end
+    return tokens
+
+
+class TokenizedMyth:
+    def __init__(self, myth_data: Dict):
+        """
+        The tokens of one myth's text fields, shared by every index that processes the myth.
+        
+        Each field is tokenized once, unfiltered and with offsets; indexes select their own view
+        (stop words, length floor, stemming) from those tokens with tokens(), so an insert runs
+        the tokenizer over each text once instead of once per index.
+        
+        Args:
+            myth_data (Dict): Myth fields; 'keywords' is a list of strings.
+        """
+        self.myth_data = myth_data
+        self._spans: Dict[str, List[Tuple[str, int, int]]] = {}
+    
+    def text(self, field: str) -> str:
+        """
+        Return a field as text ('keywords' joined with spaces).
+        """
+        value = self.myth_data.get(field) or ''
+        if field == 'keywords' and not isinstance(value, str):
+            return ' '.join(value)
+        return value
+    
+    def tokens(self, field: str, lang: Optional[str] = None, remove_stop_words: bool = True,
+               min_length: int = 3, use_stemming: bool = False, with_offsets: bool = False) -> List:
+        """
+        Tokens of one field, filtered as tokenize() (or tokenize_with_offsets()) would.
+        
+        Args:
+            field (str): 'original_text', 'english_text', 'keywords', 'place', 'region' or 'summary'.
+            lang, remove_stop_words, min_length, use_stemming: As in tokenize().
+            with_offsets (bool): Return (token, start, end) like tokenize_with_offsets(). Default is False.
+        
+        Returns:
+            List: Tokens (or token spans) in text order.
+        """
+        spans = self._spans.get(field)
+        if spans is None:
+            spans = self._spans[field] = tokenize_with_offsets(self.text(field), remove_stop_words=False, min_length=1)
+        stop_words = STOP_WORDS.get(lang, ALL_STOP_WORDS) if remove_stop_words else frozenset()
+        kept = [span for span in spans if _keep(span[0], stop_words, min_length)]
+        if with_offsets:
+            return kept
+        return [stem(token, lang) if use_stemming else token for token, _, _ in kept]
+
+
+if __name__ == "__main__":
+    # Example usage for testing
+    print(tokenize("The hero Rāma fought bravely near Ayodhya."))
+    print(tokenize("राम ने रावण को हराया। गाँवों में उत्सव हुआ।", lang='hi', use_stemming=True))
+    print(tokenize("ராமர் ஒரு வீரர்", lang='ta'))
@@ -0,0 +1,196 @@
+import bisect
+import functools
+import os
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+# Upper bounds in seconds; spans longer than the last bound land in +Inf
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+METRIC_NAME = 'myth_stage_duration_seconds'
+
+_enabled = os.environ.get('MYTH_TRACING', '').lower() in ('1', 'true', 'yes')
+
+
+class Histogram:
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        """
+        Cumulative-bucket latency histogram in the Prometheus layout.
+
+        Args:
+            buckets (tuple): Sorted upper bounds in seconds. Default is DEFAULT_BUCKETS.
+        """
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self.errors = 0
+        self.max = 0.0
+
+    def observe(self, seconds: float, error: bool = False):
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.sum += seconds
+        self.count += 1
+        self.max = max(self.max, seconds)
+        if error:
+            self.errors += 1
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimate a quantile by linear interpolation inside the bucket that contains it,
+        capped at the largest observed value.
+        """
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        lower = 0.0
+        for i, bucket_count in enumerate(self.counts):
+            upper = self.buckets[i] if i < len(self.buckets) else self.buckets[-1]
+            if seen + bucket_count >= target and bucket_count:
+                return min(self.max, lower + (upper - lower) * (target - seen) / bucket_count)
+            seen += bucket_count
+            lower = upper
+        return self.max
+
+
+class Registry:
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        """
+        Thread-safe collection of per-stage histograms.
+        """
+        self.buckets = buckets
+        self._histograms: Dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, stage: str, seconds: float, error: bool = False):
+        with self._lock:
+            histogram = self._histograms.get(stage)
+            if histogram is None:
+                histogram = self._histograms[stage] = Histogram(self.buckets)
+            histogram.observe(seconds, error)
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+
+    def to_json(self) -> Dict[str, Dict]:
+        """
+        Return {stage: {'count', 'errors', 'sum_s', 'mean_ms', 'p50_ms', 'p95_ms', 'p99_ms', 'max_ms'}}.
+        Percentiles are estimated from the buckets.
+        """
+        with self._lock:
+            return {
+                stage: {
+                    'count': h.count,
+                    'errors': h.errors,
+                    'sum_s': round(h.sum, 6),
+                    'mean_ms': round(h.sum / h.count * 1000, 3) if h.count else 0.0,
+                    'p50_ms': round(h.quantile(0.50) * 1000, 3),
+                    'p95_ms': round(h.quantile(0.95) * 1000, 3),
+                    'p99_ms': round(h.quantile(0.99) * 1000, 3),
+                    'max_ms': round(h.max * 1000, 3),
+                }
+                for stage, h in sorted(self._histograms.items())
+            }
+
+    def to_prometheus(self) -> str:
+        """
+        Render all stages in the Prometheus text exposition format.
+        """
+        lines = [
+            f'# HELP {METRIC_NAME} Time spent in each pipeline stage.',
+            f'# TYPE {METRIC_NAME} histogram',
+        ]
+        errors = []
+        with self._lock:
+            for stage, h in sorted(self._histograms.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(list(self.buckets) + ['+Inf'], h.counts):
+                    cumulative += bucket_count
+                    lines.append(f'{METRIC_NAME}_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+                lines.append(f'{METRIC_NAME}_sum{{stage="{stage}"}} {h.sum:.6f}')
+                lines.append(f'{METRIC_NAME}_count{{stage="{stage}"}} {h.count}')
+                errors.append(f'myth_stage_errors_total{{stage="{stage}"}} {h.errors}')
+        lines.append('# HELP myth_stage_errors_total Stage calls that raised an exception.')
+        lines.append('# TYPE myth_stage_errors_total counter')
+        return '\n'.join(lines + errors) + '\n'
+
+
+REGISTRY = Registry()
+
+
+class _Span:
+    __slots__ = ('stage', 'start')
+
+    def __init__(self, stage: str):
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        REGISTRY.observe(self.stage, time.perf_counter() - self.start, error=exc_type is not None)
+        return False
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def enable(on: bool = True):
+    """
+    Turn tracing on or off at runtime (it starts on when MYTH_TRACING is set).
+    """
+    global _enabled
+    _enabled = on
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def span(stage: str):
+    """
+    Time a block as one observation of `stage`: `with span('search_myths'): ...`.
+
+    When tracing is disabled this returns a shared no-op context manager.
+    """
+    return _Span(stage) if _enabled else _NULL_SPAN
+
+
+def traced(stage: Optional[str] = None) -> Callable:
+    """
+    Decorator that times every call of a function as `stage` (default: the function name).
+    """
+    def decorator(fn: Callable) -> Callable:
+        name = stage or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            with _Span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+if __name__ == "__main__":
+    # Example usage: time a few fake stages and print both export formats
+    enable()
+    for delay in (0.002, 0.004, 0.03):
+        with span('example'):
+            time.sleep(delay)
+    print(REGISTRY.to_prometheus())
+    print(REGISTRY.to_json())
@@ -0,0 +1,232 @@
+import hashlib
+import os
+import re
+import sqlite3
+import time
+from typing import List, Dict, Optional, Tuple
+
+# Sentence boundaries for Latin punctuation plus the Devanagari danda (।, ॥)
+SENTENCE_SPLIT_RE = re.compile(r'(?<=[.!?।॥])\s+')
+
+# Marian models are published per language pair; NLLB uses FLORES-200 codes
+NLLB_LANGUAGE_CODES = {
+    'hi': 'hin_Deva', 'ta': 'tam_Taml', 'te': 'tel_Telu', 'bn': 'ben_Beng',
+    'mr': 'mar_Deva', 'gu': 'guj_Gujr', 'kn': 'kan_Knda', 'ml': 'mal_Mlym',
+    'pa': 'pan_Guru', 'or': 'ory_Orya', 'en': 'eng_Latn'
+}
+
+
+def split_sentences(text: str) -> List[str]:
+    """
+    Split text into sentences on Latin and Indic sentence terminators.
+
+    Args:
+        text (str): The text to split.
+
+    Returns:
+        List[str]: Non-empty, stripped sentences in their original order.
+    """
+    return [s.strip() for s in SENTENCE_SPLIT_RE.split(text) if s.strip()]
+
+
+class TranslationCache:
+    def __init__(self, cache_path: str = "data/translation_cache.db"):
+        """
+        Initialize a persistent sentence-level translation cache.
+
+        Args:
+            cache_path (str): Path to the SQLite cache file. Default is 'data/translation_cache.db'.
+        """
+        self.cache_path = cache_path
+        os.makedirs(os.path.dirname(cache_path) or '.', exist_ok=True)
+        conn = sqlite3.connect(self.cache_path)
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS translations (
+                text_hash TEXT NOT NULL,
+                source_lang TEXT NOT NULL,
+                translation TEXT NOT NULL,
+                PRIMARY KEY (text_hash, source_lang)
+            )
+        ''')
+        conn.commit()
+        conn.close()
+
+    @staticmethod
+    def text_hash(text: str) -> str:
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+    def get_many(self, sentences: List[str], source_lang: str) -> Dict[str, str]:
+        """
+        Look up cached translations for a list of sentences.
+
+        Args:
+            sentences (List[str]): Sentences to look up.
+            source_lang (str): The source language code.
+
+        Returns:
+            Dict[str, str]: Mapping from sentence to cached translation for every hit.
+        """
+        hashes = {self.text_hash(s): s for s in sentences}
+        found = {}
+        conn = sqlite3.connect(self.cache_path)
+        keys = list(hashes)
+        # Stay well below SQLite's bound-parameter limit
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            placeholders = ','.join('?' * len(chunk))
+            rows = conn.execute(
+                f'SELECT text_hash, translation FROM translations '
+                f'WHERE source_lang = ? AND text_hash IN ({placeholders})',
+                [source_lang] + chunk
+            ).fetchall()
+            for text_hash, translation in rows:
+                found[hashes[text_hash]] = translation
+        conn.close()
+        return found
+
+    def put_many(self, pairs: List[Tuple[str, str]], source_lang: str):
+        """
+        Store sentence translations in the cache.
+
+        Args:
+            pairs (List[Tuple[str, str]]): (sentence, translation) pairs.
+            source_lang (str): The source language code.
+        """
+        conn = sqlite3.connect(self.cache_path)
+        conn.executemany(
+            'INSERT OR REPLACE INTO translations (text_hash, source_lang, translation) VALUES (?, ?, ?)',
+            [(self.text_hash(s), source_lang, t) for s, t in pairs]
+        )
+        conn.commit()
+        conn.close()
+
+
+class Translator:
+    def __init__(self, model_path: str, cache: Optional[TranslationCache] = None,
+                 batch_size: int = 16, max_length: int = 512, device: str = "cpu"):
+        """
+        Initialize a local seq2seq translator (MarianMT or NLLB) loaded from disk.
+
+        Args:
+            model_path (str): Local directory containing the model and tokenizer.
+                Marian models are expected per source language in '<model_path>/<lang>'
+                when that directory exists; otherwise a single multilingual model is used.
+            cache (Optional[TranslationCache]): Persistent cache. Default creates one under 'data/'.
+            batch_size (int): Number of sentences per forward pass. Default is 16.
+            max_length (int): Maximum generated tokens per sentence. Default is 512.
+            device (str): Torch device to run on. Default is 'cpu'.
+        """
+        self.model_path = model_path
+        self.cache = cache if cache is not None else TranslationCache()
+        self.batch_size = batch_size
+        self.max_length = max_length
+        self.device = device
+        self._models = {}
+        # 'seconds' covers whole calls, cache lookups included; 'model_seconds' only generation
+        self.stats = {'sentences': 0, 'cached': 0, 'seconds': 0.0, 'model_seconds': 0.0}
+
+    def _model_dir(self, source_lang: str) -> str:
+        lang_dir = os.path.join(self.model_path, source_lang)
+        return lang_dir if os.path.isdir(lang_dir) else self.model_path
+
+    def _load(self, source_lang: str):
+        model_dir = self._model_dir(source_lang)
+        if model_dir not in self._models:
+            from transformers import AutoModelForSeq2SeqLM, AutoTokenizer
+            tokenizer = AutoTokenizer.from_pretrained(model_dir, local_files_only=True)
+            model = AutoModelForSeq2SeqLM.from_pretrained(model_dir, local_files_only=True)
+            model.to(self.device)
+            model.eval()
+            self._models[model_dir] = (tokenizer, model)
+        return self._models[model_dir]
+
+    def warmup(self, source_lang: str = "hi"):
+        """
+        Load the model used for `source_lang` ahead of the first translation.
+        """
+        self._load(source_lang)
+
+    def _generate(self, sentences: List[str], source_lang: str) -> List[str]:
+        import torch
+        tokenizer, model = self._load(source_lang)
+        generate_kwargs = {'max_length': self.max_length}
+        # NLLB tokenizers carry language codes; Marian tokenizers do not
+        if hasattr(tokenizer, 'lang_code_to_id') or 'nllb' in type(tokenizer).__name__.lower():
+            tokenizer.src_lang = NLLB_LANGUAGE_CODES.get(source_lang, source_lang)
+            generate_kwargs['forced_bos_token_id'] = tokenizer.convert_tokens_to_ids(NLLB_LANGUAGE_CODES['en'])
+        # Sort by length so each batch pads to a similar size
+        order = sorted(range(len(sentences)), key=lambda i: len(sentences[i]))
+        translated = [''] * len(sentences)
+        for start in range(0, len(order), self.batch_size):
+            idx = order[start:start + self.batch_size]
+            batch = tokenizer([sentences[i] for i in idx], return_tensors='pt',
+                              padding=True, truncation=True).to(self.device)
+            with torch.inference_mode():
+                generated = model.generate(**batch, **generate_kwargs)
+            for i, text in zip(idx, tokenizer.batch_decode(generated, skip_special_tokens=True)):
+                translated[i] = text.strip()
+        return translated
+
+    def translate_batch(self, texts: List[str], source_lang: str) -> List[str]:
+        """
+        Translate several documents to English, batching sentences across documents.
+
+        Args:
+            texts (List[str]): Documents in the source language.
+            source_lang (str): The source language code (e.g., 'hi', 'ta').
+
+        Returns:
+            List[str]: English translations in the same order as `texts`.
+        """
+        if source_lang == "en":
+            return list(texts)
+        doc_sentences = [split_sentences(text) for text in texts]
+        unique = list(dict.fromkeys(s for sentences in doc_sentences for s in sentences))
+
+        start = time.perf_counter()
+        translations = self.cache.get_many(unique, source_lang)
+        missing = [s for s in unique if s not in translations]
+        if missing:
+            generate_start = time.perf_counter()
+            generated = self._generate(missing, source_lang)
+            self.stats['model_seconds'] += time.perf_counter() - generate_start
+            new_pairs = list(zip(missing, generated))
+            self.cache.put_many(new_pairs, source_lang)
+            translations.update(new_pairs)
+        self.stats['sentences'] += len(missing)
+        self.stats['cached'] += len(unique) - len(missing)
+        self.stats['seconds'] += time.perf_counter() - start
+
+        return [' '.join(translations[s] for s in sentences) for sentences in doc_sentences]
+
+    def translate(self, text: str, source_lang: str) -> str:
+        """
+        Translate a single document to English.
+
+        Args:
+            text (str): The text to translate.
+            source_lang (str): The source language code.
+
+        Returns:
+            str: The English translation.
+        """
+        return self.translate_batch([text], source_lang)[0]
+
+    def throughput(self) -> float:
+        """
+        Return model throughput in translated (non-cached) sentences per second of generation.
+        """
+        return self.stats['sentences'] / self.stats['model_seconds'] if self.stats['model_seconds'] else 0.0
+
+
+if __name__ == "__main__":
+    # Example usage: python translator.py <model_dir> <lang> [text...]
+    import sys
+    if len(sys.argv) < 3:
+        print("Usage: python translator.py <model_dir> <source_lang> [text]")
+        sys.exit(1)
+    translator = Translator(sys.argv[1])
+    sample = ' '.join(sys.argv[3:]) or "एक गाँव में एक वीर रहता था। उसने राक्षस से युद्ध किया।"
+    print("Translated:", translator.translate(sample, sys.argv[2]))
+    print(f"Throughput: {translator.throughput():.2f} sentences/sec "
+          f"({translator.stats['sentences']} translated, {translator.stats['cached']} cached)")
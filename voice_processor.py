@@ -1,126 +1,520 @@
-import streamlit as st
-from typing import Optional, Dict
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Callable, Optional, Dict, List, Tuple, Union
+import hashlib
+import queue
 import tempfile
+import threading
+import time
 import os
+from tracing import span
+
+# progress(stage, message): stages are 'loading_model', 'model_loaded', 'detecting_language', 'transcribing' and 'done'
+ProgressCallback = Callable[[str, str], None]
+
+# Main language of each state/region, used as a hint when the speaker's language is not given
+REGION_LANGUAGES = {
+    'tamil nadu': 'ta', 'puducherry': 'ta', 'kerala': 'ml', 'karnataka': 'kn',
+    'andhra pradesh': 'te', 'telangana': 'te', 'west bengal': 'bn', 'tripura': 'bn',
+    'maharashtra': 'mr', 'gujarat': 'gu', 'punjab': 'pa', 'odisha': 'or',
+    'uttar pradesh': 'hi', 'bihar': 'hi', 'madhya pradesh': 'hi', 'rajasthan': 'hi', 'haryana': 'hi',
+    'himachal pradesh': 'hi', 'uttarakhand': 'hi', 'jharkhand': 'hi', 'chhattisgarh': 'hi', 'delhi': 'hi',
+}
+
+# transcribe() would retry a window at a higher temperature past these, or call it silence
+COMPRESSION_RATIO_THRESHOLD = 2.4
+LOGPROB_THRESHOLD = -1.0
+NO_SPEECH_THRESHOLD = 0.6
+
+
+class TranscriptionError(Exception):
+    def __init__(self, message: str, hint: Optional[str] = None):
+        """
+        Raised when audio cannot be transcribed.
+        
+        Args:
+            message (str): What went wrong.
+            hint (Optional[str]): A suggestion for the user, if there is one.
+        """
+        super().__init__(message)
+        self.message = message
+        self.hint = hint
+
 
 class VoiceProcessor:
-    def __init__(self, model_name: str = "tiny"):
+    def __init__(self, model_name: str = "tiny", progress: Optional[ProgressCallback] = None,
+                 language_cache_size: int = 1024):
         """
         Initialize the VoiceProcessor with a specified Whisper model.
         
+        The processor has no UI dependencies, so it can run in worker processes, threads and
+        CLIs; streamlit_voice.StreamlitVoiceProcessor adds the app's banners and spinners.
+        
         Args:
             model_name (str): Whisper model to use ('tiny', 'base', 'small', etc.). Default is 'tiny' for efficiency.
+            progress (Optional[ProgressCallback]): Default progress callback, called as progress(stage, message).
+            language_cache_size (int): Recordings whose detected language is remembered. Default is 1024.
         """
         self.model = None
         self.model_name = model_name
-        st.info(f"🎤 VoiceProcessor initialized. Whisper model '{model_name}' will load when needed.")
-
-    def load_whisper_model(self) -> bool:
+        self.progress = progress
+        self._model_lock = threading.Lock()
+        self.language_cache_size = language_cache_size
+        self._language_cache: 'OrderedDict[str, Dict]' = OrderedDict()  # audio sha256 -> detection
+        self._language_cache_lock = threading.Lock()
+
+    def _report(self, progress: Optional[ProgressCallback], stage: str, message: str):
+        callback = progress or self.progress
+        if callback is not None:
+            callback(stage, message)
+
+    def load_model(self, progress: Optional[ProgressCallback] = None):
         """
-        Load the Whisper model if not already loaded.
+        Import whisper and load the model. Concurrent callers wait for the first load instead
+        of loading twice.
+        
+        Args:
+            progress (Optional[ProgressCallback]): Overrides the default progress callback.
         
         Returns:
-            bool: True if model loaded successfully, False otherwise.
+            The loaded Whisper model.
+        
+        Raises:
+            TranscriptionError: If whisper is not installed or the model cannot be loaded.
         """
-        if self.model is None:
-            try:
-                import whisper
-                with st.spinner(f"Loading Whisper model '{self.model_name}'... This may take a moment."):
-                    self.model = whisper.load_model(self.model_name)
-                st.success(f"✅ Whisper '{self.model_name}' model loaded successfully!")
-                return True
-            except Exception as e:
-                st.error(f"❌ Error loading Whisper model: {str(e)}")
-                st.info("💡 Ensure 'openai-whisper' is installed: `pip install openai-whisper`")
-                st.info("💡 Also, ensure 'ffmpeg' is installed for audio processing.")
-                return False
-        return True
+        with self._model_lock:
+            if self.model is None:
+                self._report(progress, 'loading_model', f"Loading Whisper model '{self.model_name}'")
+                try:
+                    with span('whisper_load'):
+                        import whisper
+                        self.model = whisper.load_model(self.model_name)
+                except ImportError as e:
+                    raise TranscriptionError(f"Whisper is not available: {e}",
+                                             "Install it with `pip install openai-whisper`") from e
+                except Exception as e:
+                    raise TranscriptionError(f"Error loading Whisper model: {e}",
+                                             "Ensure 'ffmpeg' is installed and the model name is valid") from e
+                self._report(progress, 'model_loaded', f"Whisper '{self.model_name}' model loaded")
+        return self.model
+
+    @staticmethod
+    def language_hint(language: Optional[str] = None, region: Optional[str] = None) -> Optional[str]:
+        """
+        The language to decode in without detection: the given one, else the region's main language (if known).
+        """
+        return language or REGION_LANGUAGES.get((region or '').strip().lower())
 
-    def transcribe_audio(self, audio_data: bytes, filename: str = "temp_audio.wav") -> Optional[Dict]:
+    @staticmethod
+    def _audio_key(audio_data: bytes) -> str:
+        return hashlib.sha256(audio_data).hexdigest()
+
+    def cached_language(self, audio_data: bytes) -> Optional[str]:
+        """
+        Return the language previously detected for exactly this audio, if any.
+        """
+        with self._language_cache_lock:
+            detection = self._language_cache.get(self._audio_key(audio_data))
+        return detection['language'] if detection else None
+
+    def _cache_language(self, key: str, language: str, probability: Optional[float]):
+        with self._language_cache_lock:
+            self._language_cache[key] = {'language': language, 'probability': probability}
+            self._language_cache.move_to_end(key)
+            while len(self._language_cache) > self.language_cache_size:
+                self._language_cache.popitem(last=False)
+
+    def detect_language(self, audio_data: bytes, filename: str = "temp_audio.wav", language: Optional[str] = None,
+                        region: Optional[str] = None, progress: Optional[ProgressCallback] = None,
+                        waveform=None) -> Dict:
+        """
+        Identify the spoken language from the first 30 seconds of audio.
+        
+        A language given by the user, or the main language of the given region, is used as is and
+        nothing is run. Otherwise the result for the same audio (by SHA-256) is reused, or Whisper's
+        detect_language runs on the log-mel spectrogram of the first 30-second window only, one
+        encoder pass instead of a transcription.
+        
+        Args:
+            audio_data (bytes): Raw audio data.
+            filename (str): Name of the audio file (used for extension detection). Default is 'temp_audio.wav'.
+            language (Optional[str]): The user's choice; skips detection.
+            region (Optional[str]): Where the myth was recorded; a region in REGION_LANGUAGES skips detection.
+            progress (Optional[ProgressCallback]): Overrides the default progress callback.
+            waveform: Already decoded 16 kHz waveform of `audio_data`, to avoid decoding twice.
+        
+        Returns:
+            Dict: 'language', 'probability' (None unless detected) and 'source' ('user', 'region',
+                'cache' or 'detected').
+        
+        Raises:
+            TranscriptionError: If the model cannot be loaded or the audio cannot be decoded.
+        """
+        if language:
+            return {'language': language, 'probability': None, 'source': 'user'}
+        hinted = self.language_hint(region=region)
+        if hinted:
+            return {'language': hinted, 'probability': None, 'source': 'region'}
+        key = self._audio_key(audio_data)
+        with self._language_cache_lock:
+            cached = self._language_cache.get(key)
+        if cached:
+            return {**cached, 'source': 'cache'}
+
+        model = self.load_model(progress)
+        import whisper
+        self._report(progress, 'detecting_language', "Detecting the spoken language")
+        try:
+            with span('language_id'):
+                if waveform is None:
+                    waveform = self._load_waveform(audio_data, filename)
+                # pad_or_trim keeps one 30-second window; the mel is computed for it alone
+                mel = whisper.log_mel_spectrogram(whisper.pad_or_trim(waveform), model.dims.n_mels).to(model.device)
+                _, probs = model.detect_language(mel)
+        except Exception as e:
+            raise TranscriptionError(f"Error detecting language: {e}",
+                                     "Try a different audio file or choose the spoken language") from e
+        detected = max(probs, key=probs.get)
+        self._cache_language(key, detected, float(probs[detected]))
+        return {'language': detected, 'probability': float(probs[detected]), 'source': 'detected'}
+
+    def transcribe(self, audio_data: bytes, filename: str = "temp_audio.wav",
+                   language: Optional[str] = None, progress: Optional[ProgressCallback] = None,
+                   region: Optional[str] = None) -> Dict:
         """
         Transcribe audio data to text using Whisper.
         
+        The language is settled first (see detect_language) and passed to decoding, so Whisper
+        never detects it again inside the transcription.
+        
         Args:
             audio_data (bytes): Raw audio data (e.g., from file upload).
             filename (str): Name of the audio file (used for extension detection). Default is 'temp_audio.wav'.
+            language (Optional[str]): Language code to decode in; detected automatically when omitted.
+            progress (Optional[ProgressCallback]): Overrides the default progress callback.
+            region (Optional[str]): Region of the recording, used as a language hint when `language` is omitted.
         
         Returns:
-            Optional[Dict]: Dictionary with 'text' (transcribed text) and 'language' (detected language),
-                           or None if transcription fails.
+            Dict: 'text', 'language', 'language_source' (see detect_language), 'segments' (each with
+                'start', 'end' and 'text', in seconds) and 'timings' (seconds spent in 'decode',
+                'language_id' and 'inference').
+        
+        Raises:
+            TranscriptionError: If the audio is empty, cannot be decoded or contains no speech.
         """
-        if not self.load_whisper_model():
-            return None
+        if not audio_data:
+            raise TranscriptionError("Audio data is empty")
+        model = self.load_model(progress)
 
+        timings = {}
+        start = time.perf_counter()
         try:
-            # Create a temporary file to store audio data
-            with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(filename)[1]) as tmp_file:
-                tmp_file.write(audio_data)
-                tmp_file.flush()
-                temp_path = tmp_file.name
-
-            # Verify temporary file
-            if not os.path.exists(temp_path):
-                st.error("❌ Temporary audio file not created")
-                return None
-
-            file_size = os.path.getsize(temp_path)
-            if file_size == 0:
-                st.error("❌ Temporary audio file is empty")
-                os.unlink(temp_path)
-                return None
-
-            st.info(f"📊 Processing audio file (size: {file_size} bytes) at {temp_path}")
+            audio = self._load_waveform(audio_data, filename)
+        except Exception as e:
+            raise TranscriptionError(f"Error decoding audio: {e}",
+                                     "Try a different audio file or check audio format compatibility") from e
+        timings['decode'] = time.perf_counter() - start
 
-            # Transcribe audio using Whisper
-            with st.spinner("🤖 Transcribing audio..."):
-                result = self.model.transcribe(temp_path, language=None)  # Auto-detect language
+        start = time.perf_counter()
+        detection = self.detect_language(audio_data, filename, language, region, progress, waveform=audio)
+        timings['language_id'] = time.perf_counter() - start
 
-            # Clean up temporary file
+        try:
+            self._report(progress, 'transcribing', f"Transcribing {len(audio_data)} bytes of audio")
+            start = time.perf_counter()
+            with span('whisper_inference'):
+                result = model.transcribe(audio, language=detection['language'])
+            timings['inference'] = time.perf_counter() - start
+        except Exception as e:
+            raise TranscriptionError(f"Error transcribing audio: {e}",
+                                     "Try a different audio file or check audio format compatibility") from e
+
+        text = (result or {}).get('text', '').strip()
+        if not text:
+            raise TranscriptionError("No speech detected in audio",
+                                     "Ensure the audio contains clear speech and is in a supported format (WAV, MP3, M4A)")
+        self._report(progress, 'done', "Audio transcribed")
+        return {
+            'text': text,
+            'language': result.get('language') or detection['language'],
+            'language_source': detection['source'],
+            'segments': [{'start': segment['start'], 'end': segment['end'], 'text': segment['text'].strip()}
+                         for segment in result.get('segments', [])],
+            'timings': timings,
+        }
+
+    @staticmethod
+    def _load_waveform(audio_data: bytes, filename: str):
+        """
+        Decode audio bytes to Whisper's 16 kHz mono float waveform (through a temp file for ffmpeg).
+        """
+        import whisper
+        with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(filename)[1]) as tmp_file:
+            tmp_file.write(audio_data)
+            temp_path = tmp_file.name
+        try:
+            return whisper.load_audio(temp_path)
+        finally:
             try:
                 os.unlink(temp_path)
+            except OSError:
+                pass
+
+    def _transcribe_or_error(self, audio_data: bytes, filename: str, language: Optional[str],
+                             progress: Optional[ProgressCallback]) -> Union[Dict, TranscriptionError]:
+        try:
+            return self.transcribe(audio_data, filename, language, progress)
+        except TranscriptionError as e:
+            return e
+
+    @staticmethod
+    def _timestamped_segments(tokenizer, tokens: List[int], duration: float) -> List[Dict]:
+        """
+        Split decoded tokens into segments at Whisper's timestamp tokens (<|0.00|> text <|2.40|>...).
+        """
+        segments = []
+        start = None
+        last_time = 0.0
+        text_tokens = []
+        for token in tokens:
+            if token < tokenizer.timestamp_begin:
+                text_tokens.append(token)
+                continue
+            time_s = last_time = min((token - tokenizer.timestamp_begin) * 0.02, duration)
+            if start is None:
+                start = time_s
+                continue
+            text = tokenizer.decode(text_tokens).strip()
+            if text:
+                segments.append({'start': start, 'end': time_s, 'text': text})
+            start, text_tokens = None, []
+        text = tokenizer.decode(text_tokens).strip()
+        if text:
+            # Text after the last timestamp (or a decode without timestamps) runs to the end of the clip
+            segments.append({'start': start if start is not None else last_time, 'end': duration, 'text': text})
+        return segments
+
+    def transcribe_batch(self, clips: List[Tuple[bytes, str]], language: Optional[str] = None,
+                         progress: Optional[ProgressCallback] = None) -> List[Union[Dict, TranscriptionError]]:
+        """
+        Transcribe several recordings, running the ones of up to 30 seconds through Whisper together.
+        
+        Each short clip is padded to one 30-second window and their log-mel spectrograms are
+        stacked, so the encoder runs once for the whole batch and the decoder advances every clip
+        in the same forward passes. Longer clips, and short ones whose batched decode looks
+        unreliable (where transcribe() would retry at a higher temperature), go through
+        transcribe() one at a time.
+        
+        Without `language`, clips whose language is cached (see detect_language) are batched with
+        it; the others have it detected inside the batch, from the same 30-second windows.
+        
+        Args:
+            clips (List[Tuple[bytes, str]]): (audio_data, filename) pairs.
+            language (Optional[str]): Language code for every clip; detected per clip when omitted.
+            progress (Optional[ProgressCallback]): Overrides the default progress callback.
+        
+        Returns:
+            List[Union[Dict, TranscriptionError]]: Per clip, in input order, the same dictionary
+                transcribe() returns, or the TranscriptionError that clip raised.
+        
+        Raises:
+            TranscriptionError: If the model cannot be loaded.
+        """
+        if language is not None:
+            return self._transcribe_batch(clips, language, progress)
+        groups: Dict[Optional[str], List[int]] = {}
+        for position, (audio_data, _) in enumerate(clips):
+            groups.setdefault(self.cached_language(audio_data) if audio_data else None, []).append(position)
+        results: List[Union[Dict, TranscriptionError, None]] = [None] * len(clips)
+        for group_language, positions in groups.items():
+            group_results = self._transcribe_batch([clips[position] for position in positions], group_language, progress)
+            for position, result in zip(positions, group_results):
+                if isinstance(result, dict) and group_language is not None:
+                    result['language_source'] = 'cache'
+                results[position] = result
+        return results
+
+    def _transcribe_batch(self, clips: List[Tuple[bytes, str]], language: Optional[str],
+                          progress: Optional[ProgressCallback]) -> List[Union[Dict, TranscriptionError]]:
+        model = self.load_model(progress)
+        import torch
+        import whisper
+
+        results: List[Union[Dict, TranscriptionError, None]] = [None] * len(clips)
+        batch = []  # (position, waveform, decode seconds)
+        for position, (audio_data, filename) in enumerate(clips):
+            if not audio_data:
+                results[position] = TranscriptionError("Audio data is empty")
+                continue
+            start = time.perf_counter()
+            try:
+                audio = self._load_waveform(audio_data, filename)
             except Exception as e:
-                st.warning(f"⚠️ Could not delete temporary file: {str(e)}")
-
-            # Process transcription result
-            if result and 'text' in result and result['text'].strip():
-                st.success("✅ Audio transcribed successfully!")
-                return {
-                    'text': result['text'].strip(),
-                    'language': result.get('language', 'unknown')
-                }
+                results[position] = TranscriptionError(f"Error decoding audio: {e}",
+                                                       "Try a different audio file or check audio format compatibility")
+                continue
+            if len(audio) > whisper.audio.N_SAMPLES:
+                results[position] = self._transcribe_or_error(audio_data, filename, language, progress)
             else:
-                st.error("❌ No speech detected in audio")
-                st.info("💡 Ensure the audio contains clear speech and is in a supported format (WAV, MP3, M4A)")
-                return None
+                batch.append((position, audio, time.perf_counter() - start))
 
-        except Exception as e:
-            st.error(f"❌ Error transcribing audio: {str(e)}")
-            st.info("💡 Try using a different audio file or check audio format compatibility")
+        if batch:
+            self._report(progress, 'transcribing', f"Transcribing {len(batch)} clips in one batch")
+            start = time.perf_counter()
             try:
-                if os.path.exists(temp_path):
-                    os.unlink(temp_path)
-            except:
-                pass
+                with span('whisper_batch_inference'):
+                    mel = torch.stack([whisper.log_mel_spectrogram(whisper.pad_or_trim(audio), model.dims.n_mels)
+                                       for _, audio, _ in batch]).to(model.device)
+                    decoded = whisper.decode(model, mel, whisper.DecodingOptions(
+                        language=language, fp16=model.device.type != 'cpu'))
+            except Exception as e:
+                error = TranscriptionError(f"Error transcribing audio: {e}",
+                                           "Try a different audio file or check audio format compatibility")
+                decoded = None
+                for position, _, _ in batch:
+                    results[position] = error
+            # The batch's inference time is shared evenly among its clips
+            inference = (time.perf_counter() - start) / len(batch)
+            for (position, audio, decode), result in zip(batch, decoded or []):
+                if language is None:
+                    # Detected inside the batch from the clip's 30-second window
+                    self._cache_language(self._audio_key(clips[position][0]), result.language,
+                                         (result.language_probs or {}).get(result.language))
+                if result.no_speech_prob > NO_SPEECH_THRESHOLD and result.avg_logprob < LOGPROB_THRESHOLD:
+                    results[position] = TranscriptionError(
+                        "No speech detected in audio",
+                        "Ensure the audio contains clear speech and is in a supported format (WAV, MP3, M4A)")
+                elif result.compression_ratio > COMPRESSION_RATIO_THRESHOLD or result.avg_logprob < LOGPROB_THRESHOLD:
+                    audio_data, filename = clips[position]
+                    results[position] = self._transcribe_or_error(audio_data, filename, result.language, progress)
+                    if isinstance(results[position], dict) and language is None:
+                        results[position]['language_source'] = 'detected'
+                elif not result.text.strip():
+                    results[position] = TranscriptionError(
+                        "No speech detected in audio",
+                        "Ensure the audio contains clear speech and is in a supported format (WAV, MP3, M4A)")
+                else:
+                    tokenizer = whisper.tokenizer.get_tokenizer(
+                        model.is_multilingual, num_languages=model.num_languages,
+                        language=result.language, task='transcribe')
+                    results[position] = {
+                        'text': result.text.strip(),
+                        'language': result.language,
+                        'language_source': 'detected' if language is None else 'user',
+                        'segments': self._timestamped_segments(tokenizer, result.tokens,
+                                                               len(audio) / whisper.audio.SAMPLE_RATE),
+                        'timings': {'decode': decode, 'inference': inference},
+                    }
+        self._report(progress, 'done', f"{len(clips)} clips transcribed")
+        return results
+
+    def transcribe_audio(self, audio_data: bytes, filename: str = "temp_audio.wav") -> Optional[Dict]:
+        """
+        Transcribe audio data, returning None instead of raising on failure.
+        
+        Args:
+            audio_data (bytes): Raw audio data (e.g., from file upload).
+            filename (str): Name of the audio file (used for extension detection). Default is 'temp_audio.wav'.
+        
+        Returns:
+            Optional[Dict]: The result of transcribe(), or None if transcription fails.
+        """
+        try:
+            return self.transcribe(audio_data, filename)
+        except TranscriptionError:
             return None
 
+
+class MicroBatcher:
+    def __init__(self, processor: VoiceProcessor, max_batch_size: int = 8, max_wait_ms: float = 10.0):
+        """
+        Collect transcription requests that arrive close together into VoiceProcessor.transcribe_batch() calls.
+        
+        A worker thread takes the first pending clip, waits up to `max_wait_ms` for more (or until
+        `max_batch_size` are pending) and transcribes them as one batch, so a burst of short clips
+        costs a few batched forward passes instead of one full transcription each. Requests with
+        different languages go into separate batches.
+        
+        Args:
+            processor (VoiceProcessor): The transcriber; its model is loaded by the first batch.
+            max_batch_size (int): Most clips per batch. Default is 8.
+            max_wait_ms (float): How long the first clip of a batch waits for company. Default is 10 ms.
+        """
+        self.processor = processor
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self._queue = queue.Queue()
+        self._worker = None
+        self._worker_lock = threading.Lock()
+
+    def submit(self, audio_data: bytes, filename: str = "temp_audio.wav",
+               language: Optional[str] = None) -> Future:
+        """
+        Queue a clip for the next batch.
+        
+        Returns:
+            Future: Resolves to the transcribe() dictionary, or raises its TranscriptionError.
+        """
+        future = Future()
+        self._queue.put((audio_data, filename, language, future))
+        with self._worker_lock:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name='transcription-batcher', daemon=True)
+                self._worker.start()
+        return future
+
+    def transcribe(self, audio_data: bytes, filename: str = "temp_audio.wav",
+                   language: Optional[str] = None) -> Dict:
+        """
+        Transcribe one clip as part of whatever batch it lands in, blocking until it is done.
+        """
+        return self.submit(audio_data, filename, language).result()
+
+    def _collect(self) -> List[Tuple]:
+        pending = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait_ms / 1000
+        while len(pending) < self.max_batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                pending.append(self._queue.get(timeout=timeout))
+            except queue.Empty:
+                break
+        # Requests cancelled while waiting are dropped
+        return [item for item in pending if item[3].set_running_or_notify_cancel()]
+
+    def _run(self):
+        while True:
+            by_language = {}
+            for item in self._collect():
+                by_language.setdefault(item[2], []).append(item)
+            for language, items in by_language.items():
+                try:
+                    results = self.processor.transcribe_batch([(audio_data, filename)
+                                                               for audio_data, filename, _, _ in items], language)
+                except Exception as e:
+                    results = [e] * len(items)
+                for (_, _, _, future), result in zip(items, results):
+                    if isinstance(result, Exception):
+                        future.set_exception(result)
+                    else:
+                        future.set_result(result)
+
+
 if __name__ == "__main__":
-    # Example usage for testing
+    # Example usage: python voice_processor.py <audio file> [<audio file> ...]
     import sys
-    if 'streamlit' in sys.modules:
-        st.write("Testing VoiceProcessor in Streamlit environment...")
-        vp = VoiceProcessor(model_name="tiny")
-        test_audio_path = input()  # Replace with a valid audio file
-        if test_audio_path and os.path.exists(test_audio_path):
-            with open(test_audio_path, "rb") as f:
-                audio_data = f.read()
-            result = vp.transcribe_audio(audio_data, filename=test_audio_path)
-            if result:
-                st.write("Transcription:", result['text'])
-                st.write("Detected Language:", result['language'])
-            else:
-                st.write("Transcription failed.")
-    else:
-        print("Please run this script within a Streamlit environment for full functionality.")
+    vp = VoiceProcessor(model_name="tiny", progress=lambda stage, message: print(f"[{stage}] {message}"))
+    clips = []
+    for path in sys.argv[1:]:
+        with open(path, "rb") as f:
+            clips.append((f.read(), path))
+    for (_, path), result in zip(clips, vp.transcribe_batch(clips)):
+        if isinstance(result, TranscriptionError):
+            print(f"{path}: transcription failed: {result.message}" + (f" ({result.hint})" if result.hint else ""))
+        else:
+            print(f"{path} [{result['language']}]: {result['text']}")
 
 # Normalize raw PCM audio signal before STT processing
 # Progress [2025-09-17 #1]: Applied code update